@@ -0,0 +1,127 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import os
+import stat
+
+import fixtures
+import mock
+from oslo_utils import timeutils
+
+from zaqarclient import auth
+from zaqarclient.auth import cache
+from zaqarclient.tests import base
+from zaqarclient.transport import request
+
+
+class TestTokenCache(base.TestBase):
+
+    def setUp(self):
+        super(TestTokenCache, self).setUp()
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'tokens')
+        self.cache = cache.TokenCache(self.path)
+        self.key = cache.TokenCache.key('http://keystone:5000/v3',
+                                        'user', 'project')
+
+    def _expires_in(self, seconds):
+        return timeutils.utcnow() + datetime.timedelta(seconds=seconds)
+
+    def test_set_get(self):
+        self.cache.set(self.key, 'token', self._expires_in(3600),
+                       endpoint='http://zaqar:8888')
+
+        entry = cache.TokenCache(self.path).get(self.key)
+        self.assertEqual('token', entry['token'])
+        self.assertEqual('http://zaqar:8888', entry['endpoint'])
+
+    def test_permissions(self):
+        self.cache.set(self.key, 'token', self._expires_in(3600))
+
+        mode = os.stat(os.path.join(self.path, self.key)).st_mode
+        self.assertEqual(0o600, stat.S_IMODE(mode))
+        mode = os.stat(self.path).st_mode
+        self.assertEqual(0o700, stat.S_IMODE(mode))
+
+    def test_expired(self):
+        self.cache.set(self.key, 'token', self._expires_in(30))
+
+        self.assertIsNone(cache.TokenCache(self.path).get(self.key))
+        self.assertFalse(os.path.exists(os.path.join(self.path, self.key)))
+
+    def test_missing(self):
+        self.assertIsNone(self.cache.get(self.key))
+
+    def test_keys(self):
+        other = cache.TokenCache.key('http://keystone:5000/v3',
+                                     'user', 'project', region='RegionTwo')
+        self.assertNotEqual(self.key, other)
+
+        other = cache.TokenCache.key('http://keystone:5000/v3',
+                                     'user', 'project',
+                                     project_domain='other')
+        self.assertNotEqual(self.key, other)
+
+
+class TestKeystoneTokenCache(base.TestBase):
+
+    def setUp(self):
+        super(TestKeystoneTokenCache, self).setUp()
+        self.path = self.useFixture(fixtures.TempDir()).path
+        self.options = {'os_auth_url': 'http://keystone:5000/v3',
+                        'os_username': 'user',
+                        'os_project_name': 'project',
+                        'token_cache': self.path}
+
+        self.session = mock.Mock()
+        self.session.get_token.return_value = 'fake-token'
+        auth_ref = self.session.auth.get_access.return_value
+        auth_ref.expires = (timeutils.utcnow(with_timezone=True) +
+                            datetime.timedelta(hours=1))
+
+    def _authenticate(self):
+        backend = auth.get_backend(options=dict(self.options))
+        with mock.patch.object(backend, '_get_endpoint') as get_endpoint:
+            with mock.patch.object(backend,
+                                   '_get_keystone_session') as get_session:
+                get_endpoint.return_value = 'http://zaqar:8888'
+                get_session.return_value = self.session
+                req = backend.authenticate(1, request.Request())
+                return req, get_session
+
+    def test_cached_across_backends(self):
+        req, get_session = self._authenticate()
+        self.assertEqual(1, get_session.call_count)
+
+        req, get_session = self._authenticate()
+        self.assertFalse(get_session.called)
+        self.assertEqual('fake-token', req.headers['X-Auth-Token'])
+        self.assertEqual('http://zaqar:8888', req.endpoint)
+
+    def test_keyed_by_project_domain(self):
+        self.options['os_project_domain_name'] = 'domain'
+        self._authenticate()
+
+        self.options['os_project_domain_name'] = 'other'
+        req, get_session = self._authenticate()
+        self.assertEqual(1, get_session.call_count)
+
+    def test_invalidate_drops_entry(self):
+        self._authenticate()
+
+        backend = auth.get_backend(options=dict(self.options))
+        backend.authenticate(1, request.Request())
+        self.assertTrue(backend.invalidate())
+
+        req, get_session = self._authenticate()
+        self.assertEqual(1, get_session.call_count)
@@ -13,12 +13,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
 
 import mock
 
 from keystoneauth1 import session
+from oslo_utils import timeutils
 
 from zaqarclient import auth
+from zaqarclient.auth import keystone
 from zaqarclient.tests import base
 from zaqarclient.transport import request
 
@@ -54,3 +57,125 @@ class TestKeystoneAuth(base.TestBase):
         req = self.auth.authenticate(1, req)
         self.assertIn('X-Auth-Token', req.headers)
         self.assertIn(req.headers['X-Auth-Token'], 'test-token')
+
+    def test_session_and_endpoint_are_cached(self):
+        test_endpoint = 'http://example.org:8888'
+        keystone_session = mock.Mock()
+        keystone_session.get_token.return_value = 'fake-token'
+
+        with mock.patch.object(self.auth, '_get_endpoint') as get_endpoint:
+            with mock.patch.object(self.auth,
+                                   '_get_keystone_session') as get_session:
+
+                get_endpoint.return_value = test_endpoint
+                get_session.return_value = keystone_session
+
+                for _ in range(3):
+                    req = self.auth.authenticate(1, request.Request())
+                    self.assertEqual(test_endpoint, req.endpoint)
+                    self.assertEqual('fake-token',
+                                     req.headers['X-Auth-Token'])
+
+                self.assertEqual(1, get_session.call_count)
+                self.assertEqual(1, get_endpoint.call_count)
+
+    def test_invalidate(self):
+        keystone_session = mock.Mock()
+        keystone_session.get_token.return_value = 'fake-token'
+        keystone_session.invalidate.return_value = True
+
+        with mock.patch.object(self.auth, '_get_endpoint'):
+            with mock.patch.object(self.auth,
+                                   '_get_keystone_session') as get_session:
+                get_session.return_value = keystone_session
+                self.auth.authenticate(1, request.Request())
+
+        self.assertTrue(self.auth.invalidate())
+        keystone_session.invalidate.assert_called_once_with()
+
+    @mock.patch('keystoneauth1.session.Session.get_token',
+                return_value='fake-token')
+    def test_reset_after_fork(self, get_token):
+        test_endpoint = 'http://example.org:8888'
+        keystone_session = session.Session(auth=mock.Mock())
+
+        with mock.patch.object(self.auth, '_get_endpoint') as get_endpoint:
+            with mock.patch.object(self.auth,
+                                   '_get_keystone_session') as get_session:
+                get_endpoint.return_value = test_endpoint
+                get_session.return_value = keystone_session
+
+                self.auth.authenticate(1, request.Request())
+                self.auth.reset_after_fork()
+                req = self.auth.authenticate(1, request.Request())
+
+                self.assertEqual(1, get_session.call_count)
+                self.assertEqual(1, get_endpoint.call_count)
+
+        self.assertEqual(test_endpoint, req.endpoint)
+        self.assertEqual('fake-token', req.headers['X-Auth-Token'])
+
+        # NOTE: Same credentials, new connections.
+        self.assertIsNot(keystone_session, self.auth._ks_session)
+        self.assertIsNot(keystone_session.session,
+                         self.auth._ks_session.session)
+        self.assertIs(keystone_session.auth, self.auth._ks_session.auth)
+
+    def test_invalidate_with_token(self):
+        self.auth.conf.update({"auth_token": "test-token"})
+        req = request.Request(endpoint='http://example.org:8888')
+        self.auth.authenticate(1, req)
+        self.assertFalse(self.auth.invalidate())
+
+
+class TestTokenRefresher(base.TestBase):
+
+    def setUp(self):
+        super(TestTokenRefresher, self).setUp()
+        self.session = mock.Mock()
+        self.auth_ref = self.session.auth.get_access.return_value
+        self.on_refresh = mock.Mock()
+        self.refresher = keystone.TokenRefresher(self.session,
+                                                 self.on_refresh,
+                                                 margin=60)
+
+    def _expires_in(self, seconds):
+        now = timeutils.utcnow(with_timezone=True)
+        self.auth_ref.expires = now + datetime.timedelta(seconds=seconds)
+
+    def test_next_delay(self):
+        self._expires_in(3600)
+        delay = self.refresher._next_delay()
+        self.assertTrue(3530 < delay <= 3540)
+
+    def test_refresh_swaps_token(self):
+        new_ref = self.session.auth.get_auth_ref.return_value
+        new_ref.auth_token = 'new-token'
+
+        self.refresher.refresh()
+
+        self.assertFalse(self.session.invalidate.called)
+        self.assertIs(new_ref, self.session.auth.auth_ref)
+        self.on_refresh.assert_called_once_with('new-token')
+
+    def test_backend_uses_refreshed_token(self):
+        backend = auth.get_backend(options={'token_refresh': True})
+        self.session.get_token.return_value = 'old-token'
+        self._expires_in(3600)
+
+        with mock.patch.object(keystone.TokenRefresher, 'start') as start:
+            req = request.Request(endpoint='http://example.org:8888',
+                                  session=self.session)
+            req = backend.authenticate(1, req)
+            self.assertEqual('old-token', req.headers['X-Auth-Token'])
+            start.assert_called_once_with()
+
+        backend._refresher._on_refresh('new-token')
+        req = request.Request(endpoint='http://example.org:8888',
+                              session=self.session)
+        req = backend.authenticate(1, req)
+        self.assertEqual('new-token', req.headers['X-Auth-Token'])
+        self.assertEqual(1, self.session.get_token.call_count)
+
+        backend.cleanup()
+        self.assertIsNone(backend._refresher)
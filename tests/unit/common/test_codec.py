@@ -0,0 +1,74 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+
+import ddt
+import mock
+import testtools
+
+from zaqarclient.common import codec
+from zaqarclient.tests import base
+from zaqarclient.transport import response
+
+
+@ddt.ddt
+class TestCodec(base.TestBase):
+
+    def test_default(self):
+        self.assertEqual('json', codec.get_codec().name)
+
+    def test_auto(self):
+        self.assertIs(codec._CODECS[0], codec.get_codec('auto'))
+
+    def test_stdlib(self):
+        self.assertIsInstance(codec.get_codec('json'), codec.JSONCodec)
+        self.assertEqual('json', codec.get_codec('json').name)
+
+    @ddt.data('orjson', 'ujson')
+    def test_fallback(self, name):
+        with mock.patch.object(codec, '_CODECS', [codec.JSONCodec()]):
+            self.assertEqual('json', codec.get_codec(name).name)
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, codec.get_codec, 'yaml')
+        self.assertRaises(ValueError, codec.get_frame_codec, 'yaml')
+
+    def test_frame_codec(self):
+        json_codec = codec.JSONCodec()
+        self.assertIs(json_codec, codec.get_frame_codec(None, json_codec))
+        self.assertIs(json_codec, codec.get_frame_codec('json', json_codec))
+        with mock.patch.object(codec, 'msgpack', None):
+            self.assertIs(json_codec,
+                          codec.get_frame_codec('msgpack', json_codec))
+
+    @testtools.skipUnless(codec.msgpack, 'msgpack is not installed')
+    def test_msgpack_round_trip(self):
+        cdc = codec.get_frame_codec('msgpack')
+        self.assertTrue(cdc.binary)
+        data = {'messages': [{'body': u'h\xe9llo', 'ttl': 60}]}
+        self.assertEqual(data, cdc.loads(cdc.dumps(data)))
+
+    def test_round_trip(self):
+        data = {'messages': [{'body': u'h\xe9llo', 'ttl': 60}]}
+        for cdc in codec._CODECS:
+            content = cdc.dumps(data)
+            self.assertEqual(data, json.loads(content))
+            self.assertEqual(data, cdc.loads(content))
+            self.assertEqual(data, cdc.loads(content.encode('utf-8')))
+
+    def test_response_deserialized(self):
+        resp = response.Response(None, None, deserialized={'a': 1})
+        self.assertEqual({'a': 1}, resp.deserialized_content)
+        self.assertEqual({'a': 1}, json.loads(resp.content))
@@ -0,0 +1,53 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from zaqarclient.common import executor
+from zaqarclient.tests import base
+
+
+class TestBoundedExecutor(base.TestBase):
+
+    def setUp(self):
+        super(TestBoundedExecutor, self).setUp()
+        self.executor = executor.BoundedExecutor(max_workers=2,
+                                                 max_in_flight=2)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_submit(self):
+        future = self.executor.submit(lambda x: x * 2, 21)
+        self.assertEqual(42, future.result())
+
+    def test_max_in_flight(self):
+        event = threading.Event()
+        futures = [self.executor.submit(event.wait) for i in range(2)]
+
+        # NOTE: Both slots are taken, nothing
+        # else can be submitted until a call completes.
+        self.assertFalse(self.executor._semaphore.acquire(False))
+
+        event.set()
+        for future in futures:
+            future.result()
+        self.assertTrue(self.executor._semaphore.acquire())
+
+    def test_slot_released_on_error(self):
+        def fail():
+            raise ValueError()
+
+        for i in range(3):
+            future = self.executor.submit(fail)
+            self.assertRaises(ValueError, future.result)
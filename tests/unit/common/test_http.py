@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import json
+import threading
 
 import mock
 
@@ -36,3 +37,80 @@ class TestCommonHttp(base.TestBase):
                 request_method.return_value = True
                 getattr(self.client, method)("url", data=data)
                 request_method.assert_called_with('url', data=json.dumps(data))
+
+    def test_pool_options(self):
+        client = http.Client(pool_connections=3, pool_maxsize=30,
+                             pool_block=True)
+        adapter = client.session.get_adapter('https://example.org')
+        self.assertIs(client.adapter, adapter)
+        self.assertEqual(30, adapter._pool_maxsize)
+        self.assertTrue(adapter._pool_block)
+
+    def test_default_timeout(self):
+        client = http.Client(connect_timeout=1, read_timeout=5)
+        with mock.patch.object(client.session, 'request',
+                               autospec=True) as request_method:
+            client.request('GET', 'url')
+            request_method.assert_called_with('GET', 'url', timeout=(1, 5))
+
+            client.request('GET', 'url', timeout=9)
+            request_method.assert_called_with('GET', 'url', timeout=9)
+
+    def test_no_timeout(self):
+        with mock.patch.object(self.client.session, 'request',
+                               autospec=True) as request_method:
+            self.client.request('GET', 'url')
+            request_method.assert_called_with('GET', 'url')
+
+    @mock.patch('time.time')
+    def test_keepalive_timeout(self, time_mock):
+        client = http.Client(keepalive_timeout=10)
+        with mock.patch.object(client.session, 'request', autospec=True):
+            with mock.patch.object(client.adapter, 'close') as close:
+                time_mock.return_value = 100
+                client.request('GET', 'url')
+                time_mock.return_value = 105
+                client.request('GET', 'url')
+                self.assertFalse(close.called)
+
+                time_mock.return_value = 120
+                client.request('GET', 'url')
+                close.assert_called_once_with()
+
+    def _session_in_thread(self, client):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(
+            client.session))
+        thread.start()
+        thread.join()
+        return sessions[0]
+
+    def test_shared_session(self):
+        self.assertIs(self.client.session,
+                      self._session_in_thread(self.client))
+
+    def test_thread_safe(self):
+        client = http.Client(pool_maxsize=30, thread_safe=True)
+        session = client.session
+        self.assertIs(session, client.session)
+
+        other = self._session_in_thread(client)
+        self.assertIsNot(session, other)
+        self.assertEqual(30, other.get_adapter('http://a')._pool_maxsize)
+
+        with mock.patch.object(session, 'close') as close:
+            with mock.patch.object(other, 'close') as other_close:
+                client.close()
+                close.assert_called_once_with()
+                other_close.assert_called_once_with()
+
+    def test_thread_sessions_released(self):
+        client = http.Client(thread_safe=True)
+        first = self._session_in_thread(client)
+        self.assertEqual(1, len(client._states))
+
+        with mock.patch.object(first, 'close') as close:
+            second = self._session_in_thread(client)
+            close.assert_called_once_with()
+        self.assertEqual([second], [state.session
+                                    for state in client._states])
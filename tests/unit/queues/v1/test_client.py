@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+
 import mock
 
 import ddt
@@ -20,6 +22,7 @@ import ddt
 from zaqarclient.queues import client
 from zaqarclient.queues.v1 import core
 from zaqarclient.tests import base
+from zaqarclient.transport import deadline
 from zaqarclient.transport import errors
 
 VERSIONS = [1, 1.1]
@@ -53,3 +56,134 @@ class TestClient(base.TestBase):
         with mock.patch.object(core, 'health', autospec=True) as core_health:
             core_health.side_effect = raise_error
             self.assertFalse(cli.health())
+
+    @ddt.data(*VERSIONS)
+    def test_transport_is_cached(self, version):
+        cli = client.Client('http://example.com',
+                            version, {"auth_opts": {'backend': 'noauth'}})
+        req, trans = cli._request_and_transport()
+        req, trans2 = cli._request_and_transport()
+        self.assertIs(trans, trans2)
+
+    @ddt.data(*VERSIONS)
+    def test_close(self, version):
+        with client.Client('http://example.com', version,
+                           {"auth_opts": {'backend': 'noauth'}}) as cli:
+            req, trans = cli._request_and_transport()
+            with mock.patch.object(trans, 'cleanup') as cleanup:
+                cli.close()
+                cleanup.assert_called_once_with()
+
+            req, trans2 = cli._request_and_transport()
+            self.assertIsNot(trans, trans2)
+
+    @ddt.data(*VERSIONS)
+    def test_transport_executor(self, version):
+        cli = client.Client('http://example.com', version,
+                            {"auth_opts": {'backend': 'noauth'},
+                             "max_workers": 2})
+        req, trans = cli._request_and_transport()
+        self.assertIs(cli.executor, trans.executor)
+
+        executor = cli.executor
+        cli.close()
+        self.assertRaises(RuntimeError, executor.submit, lambda: None)
+
+    @ddt.data(*VERSIONS)
+    def test_submit_keeps_deadline(self, version):
+        cli = client.Client('http://example.com', version,
+                            {"auth_opts": {'backend': 'noauth'}})
+        self.addCleanup(cli.close)
+
+        with deadline.scope(5) as dl:
+            future = cli.submit(deadline.current)
+        self.assertIs(dl, future.result())
+
+    @ddt.data(*VERSIONS)
+    def test_transport_shared_by_threads(self, version):
+        cli = client.Client('http://example.com', version,
+                            {"auth_opts": {'backend': 'noauth'},
+                             "thread_safe": True})
+        transports = []
+
+        def get_transport():
+            transports.append(cli._request_and_transport()[1])
+
+        threads = [threading.Thread(target=get_transport) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, len(set(map(id, transports))))
+        self.assertTrue(transports[0].client.thread_safe)
+
+    @ddt.data(*VERSIONS)
+    def test_fork(self, version):
+        cli = client.Client('http://example.com', version,
+                            {"auth_opts": {'backend': 'noauth'}})
+        req, trans = cli._request_and_transport()
+        executor = cli.executor
+        backend = cli.auth_backend
+
+        with mock.patch('os.getpid', return_value=cli._pid + 1):
+            with mock.patch.object(trans, 'cleanup') as cleanup:
+                with mock.patch.object(backend,
+                                       'reset_after_fork') as reset:
+                    req, trans2 = cli._request_and_transport()
+                    reset.assert_called_once_with()
+                # NOTE: The parent's connections
+                # must be left untouched.
+                self.assertFalse(cleanup.called)
+
+            self.assertIsNot(trans, trans2)
+            self.assertIsNot(executor, cli.executor)
+            self.assertIs(backend, cli.auth_backend)
+        executor.shutdown()
+
+    @ddt.data(*VERSIONS)
+    def test_multiple_urls(self, version):
+        urls = ['http://zaqar-1:8888', 'http://zaqar-2:8888']
+        cli = client.Client(urls, version,
+                            {"auth_opts": {'backend': 'noauth'},
+                             "lb_probe_interval": 0})
+        self.assertEqual(urls[0], cli.api_url)
+
+        req, trans = cli._request_and_transport()
+        self.assertIs(cli.balancer, trans.balancer)
+        with cli.balancer.track(req.endpoint):
+            req2, trans2 = cli._request_and_transport()
+        self.assertEqual(set(urls), set([req.endpoint, req2.endpoint]))
+        self.assertIs(trans, trans2)
+
+    @ddt.data(*VERSIONS)
+    def test_fork_resets_balancer(self, version):
+        urls = ['http://zaqar-1:8888', 'http://zaqar-2:8888']
+        cli = client.Client(urls, version,
+                            {"auth_opts": {'backend': 'noauth'},
+                             "lb_probe_interval": 0})
+        cli._request_and_transport()
+
+        with mock.patch('os.getpid', return_value=cli._pid + 1):
+            with mock.patch.object(cli.balancer,
+                                   'reset_after_fork') as reset:
+                cli._request_and_transport()
+                reset.assert_called_once_with()
+
+    @ddt.data(*VERSIONS)
+    def test_prober(self, version):
+        urls = ['http://zaqar-1:8888', 'http://zaqar-2:8888']
+        cli = client.Client(urls, version,
+                            {"auth_opts": {'backend': 'noauth'}})
+        with mock.patch('zaqarclient.transport.balancer.'
+                        'HealthProber.start') as start:
+            cli._request_and_transport()
+            cli._request_and_transport()
+            start.assert_called_once_with()
+
+        with mock.patch.object(core, 'health') as health:
+            health.side_effect = errors.ServiceUnavailableError()
+            cli._prober.probe()
+        self.assertEqual([], cli.balancer.healthy)
+        cli.close()
+        self.assertIsNone(cli._prober)
@@ -13,9 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent import futures
 import json
 import mock
 
+from zaqarclient import errors as zaqar_errors
 from zaqarclient.queues.v1 import core
 from zaqarclient.tests import base
 from zaqarclient.tests.transport import dummy
@@ -69,6 +71,41 @@ class TestV1Core(base.TestBase):
             self.assertIn('queue_name', req.params)
             self.assertFalse(ret)
 
+    def test_queue_get_callback(self):
+        self.transport.executor = futures.ThreadPoolExecutor(1)
+        self.addCleanup(self.transport.executor.shutdown)
+        callback = mock.Mock()
+
+        with mock.patch.object(self.transport, 'send',
+                               autospec=True) as send_method:
+            send_method.return_value = response.Response(None, '{"a": 1}')
+
+            req = request.Request()
+            future = core.queue_get(self.transport, req, 'test',
+                                    callback=callback)
+            self.assertEqual({'a': 1}, future.result())
+            callback.assert_called_once_with({'a': 1})
+
+    def test_queue_delete_callback_positional(self):
+        self.transport.executor = futures.ThreadPoolExecutor(1)
+        self.addCleanup(self.transport.executor.shutdown)
+        callback = mock.Mock()
+
+        with mock.patch.object(self.transport, 'send',
+                               autospec=True) as send_method:
+            send_method.side_effect = errors.ServiceUnavailableError
+
+            req = request.Request()
+            future = core.queue_delete(self.transport, req, 'test', callback)
+            self.assertRaises(errors.ServiceUnavailableError, future.result)
+            error = callback.call_args[0][0]
+            self.assertIsInstance(error, errors.ServiceUnavailableError)
+
+    def test_callback_without_executor(self):
+        req = request.Request()
+        self.assertRaises(zaqar_errors.ZaqarError, core.queue_get,
+                          self.transport, req, 'test', callback=mock.Mock())
+
     def test_get_queue_metadata(self):
         with mock.patch.object(self.transport, 'send',
                                autospec=True) as send_method:
@@ -85,7 +122,7 @@ class TestV1Core(base.TestBase):
             send_method.return_value = response.Response(None, None)
 
             req = request.Request()
-            core.queue_exists(self.transport, req, update_data, 'test')
+            core.queue_set_metadata(self.transport, req, 'test', update_data)
             self.assertIn('queue_name', req.params)
 
     def test_queue_get_stats(self):
@@ -0,0 +1,173 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import asyncio
+import json
+import threading
+
+import mock
+
+from zaqarclient.common import codec
+from zaqarclient.queues.v2 import async_client
+from zaqarclient.tests import base
+from zaqarclient.transport import async_http
+from zaqarclient.transport import response
+
+
+class FakeTransport(object):
+
+    def __init__(self):
+        self.codec = codec.get_codec()
+        self.sent = []
+        self.responses = []
+        self.closed = False
+
+    async def send(self, request):
+        self.sent.append(request)
+        return self.responses.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestAsyncClient(base.TestBase):
+
+    def setUp(self):
+        super(TestAsyncClient, self).setUp()
+        self.client = async_client.AsyncClient('http://example.com',
+                                               conf=self.conf)
+        self.transport = FakeTransport()
+        self.client._transport = self.transport
+        self.queue = self.client.queue('jobs')
+
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def _run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def _respond(self, *bodies):
+        self.transport.responses = [
+            response.Response(None, body and json.dumps(body))
+            for body in bodies]
+
+    def _sent(self, index=-1):
+        return self.transport.sent[index]
+
+    def test_transport_namespace(self):
+        cli = async_client.AsyncClient('http://example.com', conf=self.conf)
+        req, trans = self._run(cli._request_and_transport())
+        self.assertIsInstance(trans, async_http.AsyncHttpTransport)
+
+    def test_prepare_request_off_loop(self):
+        threads = []
+        prepare = async_client.request.prepare_request
+
+        def prepare_request(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return prepare(*args, **kwargs)
+
+        self._respond(None)
+        with mock.patch.object(async_client.request, 'prepare_request',
+                               side_effect=prepare_request):
+            self._run(self.queue.delete())
+
+        self.assertEqual(1, len(threads))
+        self.assertIsNot(threading.current_thread(), threads[0])
+
+    def test_post(self):
+        self._respond({'resources': ['/v2/queues/jobs/messages/1']})
+        res = self._run(self.queue.post({'ttl': 60, 'body': 'hi'}))
+
+        self.assertEqual(['/v2/queues/jobs/messages/1'], res['resources'])
+        req = self._sent()
+        self.assertEqual('message_post', req.operation)
+        self.assertEqual('jobs', req.params['queue_name'])
+        self.assertEqual({'messages': [{'ttl': 60, 'body': 'hi'}]},
+                         json.loads(req.content))
+
+    def test_messages_stream(self):
+        first = {'links': [{'rel': 'next',
+                            'href': '/v2/queues/jobs/messages?marker=1'}],
+                 'messages': [{'href': '/v2/queues/jobs/messages/1',
+                               'ttl': 60, 'age': 1, 'body': 1}]}
+        second = {'links': [],
+                  'messages': [{'href': '/v2/queues/jobs/messages/2',
+                                'ttl': 60, 'age': 1, 'body': 2}]}
+        self._respond(first, second)
+
+        async def collect():
+            return [msg async for msg in self.queue.messages().stream()]
+
+        msgs = self._run(collect())
+        self.assertEqual(['1', '2'], [msg.id for msg in msgs])
+        self.assertEqual('/v2/queues/jobs/messages?marker=1',
+                         self._sent().ref)
+
+    def test_messages_no_stream(self):
+        self._respond({'links': [{'rel': 'next', 'href': 'next'}],
+                       'messages': [{'href': '/v2/queues/jobs/messages/1',
+                                     'ttl': 60, 'age': 1, 'body': 1}]})
+
+        async def collect():
+            return [msg async for msg in self.queue.messages()]
+
+        self.assertEqual(1, len(self._run(collect())))
+        self.assertEqual(1, len(self.transport.sent))
+
+    def test_claim(self):
+        href = '/v2/queues/jobs/messages/1?claim_id=c1'
+        self._respond({'messages': [{'href': href, 'ttl': 60,
+                                     'age': 1, 'body': 1}]},
+                      None, None)
+
+        claim = self._run(self.queue.claim(ttl=60, grace=30, limit=5))
+        self.assertEqual('c1', claim.id)
+        self.assertEqual(['1'], [msg.id for msg in claim])
+        req = self._sent()
+        self.assertEqual(5, req.params['limit'])
+        self.assertEqual({'ttl': 60, 'grace': 30}, json.loads(req.content))
+
+        self._run(claim.update(ttl=120))
+        self.assertEqual(120, claim.ttl)
+        self.assertEqual('c1', self._sent().params['claim_id'])
+
+        self._run(claim.delete())
+        self.assertEqual('claim_delete', self._sent().operation)
+
+    def test_empty_claim(self):
+        self._respond(None)
+        claim = self._run(self.queue.claim(ttl=60, grace=30))
+        self.assertIsNone(claim.id)
+        self.assertEqual([], list(claim))
+
+    def test_delete_messages(self):
+        self._respond(None)
+        self._run(self.queue.delete_messages('1', '2'))
+
+        req = self._sent()
+        self.assertEqual('message_delete_many', req.operation)
+        self.assertEqual({'1', '2'}, req.params['ids'])
+
+    def test_close(self):
+        self._run(self.client.close())
+        self.assertTrue(self.transport.closed)
+        self.assertIsNone(self.client._transport)
+
+
+class TestAsyncHttpTransport(base.TestBase):
+
+    def test_params(self):
+        params = async_http.AsyncHttpTransport._params(
+            {'echo': True, 'ids': ('1', '2'), 'limit': 10, 'marker': None})
+        self.assertEqual({'echo': 'true', 'ids': '1,2', 'limit': 10},
+                         params)
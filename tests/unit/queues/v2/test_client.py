@@ -53,3 +53,13 @@ class TestClient(base.QueuesTestBase):
                                autospec=True) as send_method:
             send_method.side_effect = raise_error
             self.assertFalse(self.client.ping())
+
+    @ddt.data(*VERSIONS)
+    def test_probe(self, version):
+        with mock.patch.object(self.transport, 'send',
+                               autospec=True) as send_method:
+            send_method.return_value = None
+            self.assertTrue(self.client._probe('http://zaqar-2:8888'))
+            req = send_method.call_args[0][0]
+            self.assertEqual('http://zaqar-2:8888', req.endpoint)
+            self.assertEqual('ping', req.operation)
@@ -0,0 +1,91 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import requests
+
+from zaqarclient.tests import base
+from zaqarclient.transport import balancer
+
+ENDPOINTS = ['http://zaqar-1:8888', 'http://zaqar-2:8888',
+             'http://zaqar-3:8888']
+
+
+class TestBalancer(base.TestBase):
+
+    def setUp(self):
+        super(TestBalancer, self).setUp()
+        self.balancer = balancer.Balancer(ENDPOINTS)
+
+    def test_unknown_strategy(self):
+        self.assertRaises(ValueError, balancer.Balancer, ENDPOINTS,
+                          strategy='round_robin')
+
+    def test_least_outstanding(self):
+        with self.balancer.track(ENDPOINTS[0]):
+            with self.balancer.track(ENDPOINTS[1]):
+                self.assertEqual(ENDPOINTS[2], self.balancer.choose())
+        self.assertEqual(0, self.balancer._outstanding[ENDPOINTS[0]])
+
+    def test_power_of_two(self):
+        lb = balancer.Balancer(ENDPOINTS, strategy=balancer.POWER_OF_TWO)
+        with lb.track(ENDPOINTS[0]):
+            with lb.track(ENDPOINTS[0]):
+                for i in range(10):
+                    self.assertNotEqual(ENDPOINTS[0], lb.choose())
+
+    def test_evicted_on_connection_error(self):
+        def fail():
+            with self.balancer.track(ENDPOINTS[0]):
+                raise requests.exceptions.ConnectionError()
+
+        self.assertRaises(requests.exceptions.ConnectionError, fail)
+        self.assertEqual(ENDPOINTS[1:], self.balancer.healthy)
+        for i in range(10):
+            self.assertNotEqual(ENDPOINTS[0], self.balancer.choose())
+
+        self.balancer.mark_up(ENDPOINTS[0])
+        self.assertEqual(ENDPOINTS, self.balancer.healthy)
+
+    def test_all_down(self):
+        for endpoint in ENDPOINTS:
+            self.balancer.mark_down(endpoint)
+        self.assertIn(self.balancer.choose(), ENDPOINTS)
+
+    def test_reset_after_fork(self):
+        # NOTE: The parent's threads had requests in flight.
+        self.balancer._outstanding[ENDPOINTS[1]] = 2
+        self.balancer.mark_down(ENDPOINTS[0])
+
+        self.balancer.reset_after_fork()
+        self.assertEqual(0, self.balancer._outstanding[ENDPOINTS[1]])
+        self.assertEqual(ENDPOINTS[1:], self.balancer.healthy)
+
+    def test_unknown_endpoint(self):
+        with self.balancer.track('http://keystone-catalog:8888'):
+            pass
+        self.balancer.mark_down('http://keystone-catalog:8888')
+        self.assertEqual(ENDPOINTS, self.balancer.healthy)
+
+
+class TestHealthProber(base.TestBase):
+
+    def test_probe(self):
+        lb = balancer.Balancer(ENDPOINTS)
+        lb.mark_down(ENDPOINTS[0])
+        check = mock.Mock(side_effect=[True, False, Exception()])
+
+        balancer.HealthProber(lb, check).probe()
+        self.assertEqual([ENDPOINTS[0]], lb.healthy)
@@ -0,0 +1,98 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from zaqarclient import errors
+from zaqarclient.tests import base
+from zaqarclient.transport import breaker
+from zaqarclient.transport import errors as transport_errors
+
+
+class TestCircuitBreaker(base.TestBase):
+
+    def setUp(self):
+        super(TestCircuitBreaker, self).setUp()
+        now = mock.patch.object(breaker, '_now', return_value=100.0)
+        self.now = now.start()
+        self.addCleanup(now.stop)
+
+        self.breaker = breaker.CircuitBreaker('http://example.org',
+                                              failure_threshold=2,
+                                              reset_timeout=10)
+        self.failing = mock.Mock(
+            side_effect=transport_errors.ServiceUnavailableError())
+
+    def _fail(self, times):
+        for i in range(times):
+            self.assertRaises(transport_errors.ServiceUnavailableError,
+                              self.breaker.call, self.failing)
+
+    def test_opens(self):
+        self._fail(2)
+        self.assertEqual(breaker.OPEN, self.breaker.state)
+
+        ex = self.assertRaises(errors.CircuitOpenError,
+                               self.breaker.call, self.failing)
+        self.assertEqual(10, ex.retry_after)
+        self.assertEqual(2, self.failing.call_count)
+
+    def test_success_resets_failures(self):
+        self._fail(1)
+        self.breaker.call(mock.Mock())
+        self._fail(1)
+        self.assertEqual(breaker.CLOSED, self.breaker.state)
+
+    def test_client_errors_are_not_failures(self):
+        func = mock.Mock(side_effect=transport_errors.ResourceNotFound())
+        for i in range(3):
+            self.assertRaises(transport_errors.ResourceNotFound,
+                              self.breaker.call, func)
+        self.assertEqual(breaker.CLOSED, self.breaker.state)
+
+    def test_half_open(self):
+        self._fail(2)
+        self.now.return_value = 111.0
+
+        self.breaker.before_request()
+        self.assertEqual(breaker.HALF_OPEN, self.breaker.state)
+
+        # NOTE: Only one request is let through.
+        self.assertRaises(errors.CircuitOpenError,
+                          self.breaker.before_request)
+
+        self.breaker.success()
+        self.assertEqual(breaker.CLOSED, self.breaker.state)
+
+    def test_half_open_failure(self):
+        self._fail(2)
+        self.now.return_value = 111.0
+        self._fail(1)
+        self.assertEqual(breaker.OPEN, self.breaker.state)
+        self.assertRaises(errors.CircuitOpenError,
+                          self.breaker.call, self.failing)
+
+
+class TestCircuitBreakers(base.TestBase):
+
+    def test_from_options(self):
+        self.assertIsNone(breaker.CircuitBreakers.from_options({}))
+
+        breakers = breaker.CircuitBreakers.from_options(
+            {'breaker_failure_threshold': 3})
+        one = breakers.get('http://example.org/v2/queues')
+        self.assertEqual(3, one.failure_threshold)
+        self.assertIs(one, breakers.get('http://example.org/v2/health'))
+        self.assertIsNot(one, breakers.get('http://example.com/v2/health'))
@@ -0,0 +1,91 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from zaqarclient import errors
+from zaqarclient.queues.v1 import iterator
+from zaqarclient.tests import base
+from zaqarclient.transport import deadline
+
+
+class TestDeadline(base.TestBase):
+
+    def setUp(self):
+        super(TestDeadline, self).setUp()
+        self.now = 100.0
+        now = mock.patch.object(deadline, '_now', lambda: self.now)
+        now.start()
+        self.addCleanup(now.stop)
+
+    def test_remaining(self):
+        dl = deadline.Deadline(5)
+        self.assertEqual(5, dl.remaining())
+        self.now += 2
+        self.assertEqual(3, dl.remaining())
+        self.assertFalse(dl.expired())
+        self.now += 4
+        self.assertEqual(0, dl.remaining())
+        self.assertTrue(dl.expired())
+        self.assertRaises(errors.DeadlineExceeded, dl.check)
+
+    def test_timeout(self):
+        dl = deadline.Deadline(5)
+        self.assertEqual((5, 5), dl.timeout())
+        self.assertEqual((2, 5), dl.timeout((2, None)))
+        self.assertEqual((3, 3), dl.timeout(3))
+        self.assertEqual((5, 5), dl.timeout((10, 10)))
+
+    def test_scope(self):
+        self.assertIsNone(deadline.current())
+        with deadline.scope(5) as outer:
+            self.assertIs(outer, deadline.current())
+
+            # NOTE: Nested scopes can't extend the deadline.
+            with deadline.scope(10) as inner:
+                self.assertIs(outer, inner)
+
+            with deadline.scope(1) as inner:
+                self.assertIsNot(outer, inner)
+                self.assertIs(inner, deadline.current())
+
+            self.assertIs(outer, deadline.current())
+        self.assertIsNone(deadline.current())
+
+    def test_bind(self):
+        fn = mock.Mock(side_effect=lambda: deadline.current())
+        self.assertIs(fn, deadline.bind(fn))
+
+        with deadline.scope(5) as dl:
+            bound = deadline.bind(fn)
+        self.assertIs(dl, bound())
+        self.assertIsNone(deadline.current())
+
+    def test_iterator_keeps_deadline(self):
+        client = mock.Mock()
+        seen = []
+        client.follow.side_effect = lambda ref: (
+            seen.append(deadline.current()) or
+            {'messages': [], 'links': []})
+
+        listing = {'messages': [{'href': '/m/1'}],
+                   'links': [{'rel': 'next', 'href': '/m?marker=1'}]}
+        with deadline.scope(5) as dl:
+            messages = iterator._Iterator(client, listing, 'messages',
+                                          lambda x: x)
+
+        # NOTE: Consumed after the scope was exited.
+        self.assertEqual([{'href': '/m/1'}], list(messages.stream()))
+        self.assertEqual([dl], seen)
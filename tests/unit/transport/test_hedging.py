@@ -0,0 +1,78 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from zaqarclient.tests import base
+from zaqarclient.transport import errors
+from zaqarclient.transport import hedging
+
+
+class TestHedger(base.TestBase):
+
+    def setUp(self):
+        super(TestHedger, self).setUp()
+        self.hedger = hedging.Hedger(percentile=50, delay=0.01,
+                                     min_samples=3)
+        self.addCleanup(self.hedger.shutdown)
+
+        # NOTE: Holds the slow call until the test ends.
+        self.event = threading.Event()
+        self.addCleanup(self.event.set)
+
+    def slow(self):
+        self.event.wait()
+        return 'slow'
+
+    def test_from_options(self):
+        self.assertIsNone(hedging.Hedger.from_options({}))
+        hedger = hedging.Hedger.from_options({'hedge_percentile': 99})
+        self.assertEqual(99, hedger.percentile)
+
+    def test_delay(self):
+        self.assertEqual(0.01, self.hedger.delay)
+        for latency in (0.3, 0.1, 0.2):
+            self.hedger.record(latency)
+        self.assertEqual(0.2, self.hedger.delay)
+
+    def test_fast_primary(self):
+        self.assertEqual('fast', self.hedger.call(lambda: 'fast',
+                                                  self.slow))
+        self.assertEqual(0, self.hedger.hedged)
+
+    def test_slow_primary(self):
+        self.assertEqual('fast', self.hedger.call(self.slow,
+                                                  lambda: 'fast'))
+        self.assertEqual(1, self.hedger.hedged)
+        self.assertEqual(1, self.hedger.hedges_won)
+
+    def test_failed_hedge(self):
+        def fail():
+            raise errors.ServiceUnavailableError()
+
+        def primary():
+            self.event.wait(0.1)
+            return 'slow'
+
+        self.assertEqual('slow', self.hedger.call(primary, fail))
+        self.assertEqual(0, self.hedger.hedges_won)
+
+    def test_both_fail(self):
+        def fail():
+            self.event.wait(0.05)
+            raise errors.ServiceUnavailableError()
+
+        self.assertRaises(errors.ServiceUnavailableError,
+                          self.hedger.call, fail, fail)
@@ -13,12 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+
 import mock
 import requests as prequest
 from requests.packages.urllib3 import response
 
+from zaqarclient import errors as zaqar_errors
 from zaqarclient.tests import base
 from zaqarclient.tests.transport import api
+from zaqarclient.transport import balancer
+from zaqarclient.transport import deadline
+from zaqarclient.transport import errors
 from zaqarclient.transport import http
 from zaqarclient.transport import request
 
@@ -116,3 +122,267 @@ class TestHttpTransport(base.TestBase):
                 resp.status_code = response_code
                 request_method.return_value = resp
                 self.assertRaises(exception, lambda: self.transport.send(req))
+
+    def test_connection_pool_options(self):
+        self.config(pool_maxsize=42, read_timeout=3)
+        transport = http.HttpTransport(self.conf)
+        self.assertEqual(42, transport.client.adapter._pool_maxsize)
+        self.assertEqual((None, 3), transport.client.timeout)
+
+    @mock.patch.object(prequest.packages.urllib3.response.HTTPResponse,
+                       'stream')
+    def test_reauthenticate_on_unauthorized(self, mock_stream):
+        req = request.Request('http://example.org/',
+                              operation='test_operation',
+                              params={'name': 'Test'})
+        req._api = self.api
+        req.auth_backend = mock.Mock()
+        req.auth_backend.invalidate.return_value = True
+        req.auth_backend.authenticate.side_effect = lambda api, r: r
+
+        with mock.patch.object(self.transport.client, 'request',
+                               autospec=True) as request_method:
+            unauthorized = prequest.Response()
+            unauthorized.raw = response.HTTPResponse()
+            unauthorized.status_code = 401
+            ok = prequest.Response()
+            ok.raw = response.HTTPResponse()
+            ok.status_code = 200
+            request_method.side_effect = [unauthorized, ok]
+
+            resp = self.transport.send(req)
+            self.assertEqual(200, resp.status_code)
+            self.assertEqual(2, request_method.call_count)
+            req.auth_backend.authenticate.assert_called_once_with(self.api,
+                                                                  req)
+
+    @mock.patch.object(prequest.packages.urllib3.response.HTTPResponse,
+                       'stream')
+    def test_unauthorized_without_fresh_credentials(self, mock_stream):
+        req = request.Request('http://example.org/',
+                              operation='test_operation',
+                              params={'name': 'Test'})
+        req._api = self.api
+        req.auth_backend = mock.Mock()
+        req.auth_backend.invalidate.return_value = False
+
+        with mock.patch.object(self.transport.client, 'request',
+                               autospec=True) as request_method:
+            unauthorized = prequest.Response()
+            unauthorized.raw = response.HTTPResponse()
+            unauthorized.status_code = 401
+            request_method.return_value = unauthorized
+
+            self.assertRaises(errors.UnauthorizedError,
+                              self.transport.send, req)
+            self.assertEqual(1, request_method.call_count)
+
+    def _response(self, status_code, headers=None):
+        resp = prequest.Response()
+        resp.raw = response.HTTPResponse()
+        resp.status_code = status_code
+        resp.headers.update(headers or {})
+        return resp
+
+    @mock.patch.object(prequest.packages.urllib3.response.HTTPResponse,
+                       'stream')
+    def test_success_text_not_decoded(self, mock_stream):
+        req = request.Request('http://example.org/',
+                              operation='test_operation',
+                              params={'name': 'Test'})
+
+        with mock.patch.object(self.transport.client, 'request',
+                               autospec=True) as request_method:
+            request_method.return_value = self._response(200)
+            with mock.patch.object(prequest.Response, 'text',
+                                   new_callable=mock.PropertyMock) as text:
+                self.transport.send(req)
+                self.assertFalse(text.called)
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(prequest.packages.urllib3.response.HTTPResponse,
+                       'stream')
+    def test_retry_server_errors(self, mock_stream, sleep):
+        self.config(retry_attempts=3)
+        self.transport = http.HttpTransport(self.conf)
+        req = request.Request('http://example.org/',
+                              operation='test_operation',
+                              params={'name': 'Test'})
+
+        with mock.patch.object(self.transport.client, 'request',
+                               autospec=True) as request_method:
+            request_method.side_effect = [
+                self._response(503, {'Retry-After': '2'}),
+                self._response(500),
+                self._response(200)]
+
+            resp = self.transport.send(req)
+            self.assertEqual(200, resp.status_code)
+            self.assertEqual(3, request_method.call_count)
+
+        self.assertEqual(2, sleep.call_args_list[0][0][0])
+        metrics = self.transport.retry_policy.metrics
+        self.assertEqual(1, metrics['requests'])
+        self.assertEqual(2, metrics['retries'])
+        self.assertEqual(1, metrics['retries.ServiceUnavailableError'])
+
+    @mock.patch.object(prequest.packages.urllib3.response.HTTPResponse,
+                       'stream')
+    def test_post_is_not_retried(self, mock_stream):
+        self.config(retry_attempts=3)
+        self.transport = http.HttpTransport(self.conf)
+        req = request.Request('http://example.org/',
+                              operation='message_post',
+                              params={'queue_name': 'Test'},
+                              api=1)
+
+        with mock.patch.object(self.transport.client, 'request',
+                               autospec=True) as request_method:
+            request_method.return_value = self._response(503)
+
+            self.assertRaises(errors.ServiceUnavailableError,
+                              self.transport.send, req)
+            self.assertEqual(1, request_method.call_count)
+
+    def test_retry_after(self):
+        self.assertEqual(120, self.transport._retry_after(
+            {'Retry-After': '120'}))
+        self.assertEqual(0, self.transport._retry_after(
+            {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}))
+        self.assertIsNone(self.transport._retry_after({}))
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(prequest.packages.urllib3.response.HTTPResponse,
+                       'stream')
+    def test_throttled(self, mock_stream, sleep):
+        self.config(queue_rate_limit=100, retry_attempts=3)
+        transport = http.HttpTransport(self.conf)
+        req = request.Request('http://example.org/',
+                              operation='message_post',
+                              params={'queue_name': 'Test'},
+                              api=1)
+
+        with mock.patch.object(transport.client, 'request',
+                               autospec=True) as request_method:
+            request_method.side_effect = [
+                self._response(429, {'Retry-After': '1'}),
+                self._response(201)]
+
+            # NOTE: Throttled requests were not
+            # processed, it's safe to post them again.
+            resp = transport.send(req)
+            self.assertEqual(201, resp.status_code)
+            self.assertEqual(2, request_method.call_count)
+
+        bucket = transport.rate_limiter._buckets('Test')[0]
+        self.assertTrue(bucket.rate < 100)
+
+    @mock.patch.object(prequest.packages.urllib3.response.HTTPResponse,
+                       'stream')
+    def test_circuit_breaker(self, mock_stream):
+        self.config(breaker_failure_threshold=2, retry_attempts=1)
+        transport = http.HttpTransport(self.conf)
+
+        def send():
+            req = request.Request('http://example.org/',
+                                  operation='test_operation',
+                                  params={'name': 'Test'})
+            req._api = self.api
+            return transport.send(req)
+
+        with mock.patch.object(transport.client, 'request',
+                               autospec=True) as request_method:
+            request_method.return_value = self._response(503)
+
+            for i in range(2):
+                self.assertRaises(errors.ServiceUnavailableError, send)
+            self.assertRaises(zaqar_errors.CircuitOpenError, send)
+            self.assertEqual(2, request_method.call_count)
+
+    @mock.patch.object(prequest.packages.urllib3.response.HTTPResponse,
+                       'stream')
+    def test_hedged_read(self, mock_stream):
+        self.config(hedge_percentile=95, hedge_delay=0.01)
+        transport = http.HttpTransport(self.conf)
+        self.addCleanup(transport.cleanup)
+        transport.balancer = balancer.Balancer(['http://zaqar-1',
+                                                'http://zaqar-2'])
+        req = request.Request('http://zaqar-1',
+                              operation='message_list',
+                              params={'queue_name': 'Test'},
+                              api=2)
+
+        event = threading.Event()
+        self.addCleanup(event.set)
+
+        def send(method, url, **kwargs):
+            # NOTE: The first instance is stuck.
+            if url.startswith('http://zaqar-1'):
+                event.wait()
+            return self._response(200)
+
+        with mock.patch.object(transport.client, 'request',
+                               side_effect=send) as request_method:
+            resp = transport.send(req)
+            self.assertEqual(200, resp.status_code)
+            self.assertEqual(2, request_method.call_count)
+            urls = [c[1]['url'] for c in request_method.call_args_list]
+            self.assertEqual(['http://zaqar-1/v2/queues/Test/messages',
+                              'http://zaqar-2/v2/queues/Test/messages'],
+                             urls)
+
+    def test_unsafe_operation_not_hedged(self):
+        self.config(hedge_percentile=95)
+        transport = http.HttpTransport(self.conf)
+        req = request.Request('http://example.org',
+                              operation='message_post',
+                              params={'queue_name': 'Test'},
+                              api=2)
+        self.assertFalse(transport._is_safe(req))
+        req.operation = 'claim_get'
+        self.assertTrue(transport._is_safe(req))
+
+    @mock.patch.object(prequest.packages.urllib3.response.HTTPResponse,
+                       'stream')
+    def test_deadline_caps_timeout(self, mock_stream):
+        self.config(read_timeout=30)
+        transport = http.HttpTransport(self.conf)
+        req = request.Request('http://example.org/',
+                              operation='test_operation',
+                              params={'name': 'Test'})
+        req.deadline = deadline.Deadline(5)
+
+        with mock.patch.object(transport.client, 'request',
+                               return_value=self._response(200)) as method:
+            transport.send(req)
+            connect, read = method.call_args[1]['timeout']
+            self.assertTrue(0 < connect <= 5)
+            self.assertTrue(0 < read <= 5)
+
+    def test_deadline_exceeded(self):
+        req = request.Request('http://example.org/',
+                              operation='test_operation',
+                              params={'name': 'Test'})
+        req.deadline = deadline.Deadline(0)
+
+        with mock.patch.object(self.transport.client,
+                               'request') as request_method:
+            self.assertRaises(zaqar_errors.DeadlineExceeded,
+                              self.transport.send, req)
+            self.assertFalse(request_method.called)
+
+    def test_deadline_exceeded_while_waiting(self):
+        req = request.Request('http://example.org/',
+                              operation='test_operation',
+                              params={'name': 'Test'})
+        req.deadline = deadline.Deadline(5)
+
+        def timeout(*args, **kwargs):
+            req.deadline.expires_at = 0
+            raise prequest.exceptions.ReadTimeout()
+
+        with mock.patch.object(self.transport.client, 'request',
+                               side_effect=timeout) as request_method:
+            self.assertRaises(zaqar_errors.DeadlineExceeded,
+                              self.transport.send, req)
+            self.assertEqual(1, request_method.call_count)
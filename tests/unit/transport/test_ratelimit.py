@@ -0,0 +1,101 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from zaqarclient import errors
+from zaqarclient.tests import base
+from zaqarclient.transport import deadline
+from zaqarclient.transport import ratelimit
+
+
+class TestTokenBucket(base.TestBase):
+
+    def setUp(self):
+        super(TestTokenBucket, self).setUp()
+        now = mock.patch.object(ratelimit, '_now', return_value=100.0)
+        self.now = now.start()
+        self.addCleanup(now.stop)
+
+    def test_burst(self):
+        bucket = ratelimit.TokenBucket(10, burst=2)
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(0.1, bucket.reserve())
+
+        self.now.return_value = 101.0
+        self.assertEqual(0, bucket.reserve())
+
+    def test_throttled(self):
+        bucket = ratelimit.TokenBucket(10, burst=1)
+        bucket.throttled(retry_after=2)
+        self.assertEqual(5, bucket.rate)
+        self.assertAlmostEqual(2.2, bucket.reserve())
+
+        for i in range(20):
+            bucket.succeeded()
+        self.assertEqual(10, bucket.rate)
+
+    def test_minimum_rate(self):
+        bucket = ratelimit.TokenBucket(10)
+        for i in range(10):
+            bucket.throttled()
+        self.assertEqual(0.5, bucket.rate)
+
+
+class TestRateLimiter(base.TestBase):
+
+    def test_from_options(self):
+        self.assertIsNone(ratelimit.RateLimiter.from_options({}))
+        limiter = ratelimit.RateLimiter.from_options({'rate_limit': 5})
+        self.assertEqual(1, len(limiter._buckets('my_queue')))
+
+    def test_queue_buckets(self):
+        limiter = ratelimit.RateLimiter(rate=100, queue_rate=10,
+                                        queue_rates={'slow': 1})
+        self.assertEqual(1, len(limiter._buckets(None)))
+
+        buckets = limiter._buckets('fast')
+        self.assertEqual(2, len(buckets))
+        self.assertEqual(10, buckets[1].rate)
+        self.assertIs(buckets[1], limiter._buckets('fast')[1])
+        self.assertEqual(1, limiter._buckets('slow')[1].rate)
+
+    @mock.patch('time.sleep')
+    def test_acquire(self, sleep):
+        limiter = ratelimit.RateLimiter(queue_rate=1)
+        limiter.acquire('my_queue')
+        self.assertFalse(sleep.called)
+
+        limiter.acquire('my_queue')
+        self.assertTrue(sleep.called)
+
+        sleep.reset_mock()
+        limiter.acquire('other_queue')
+        self.assertFalse(sleep.called)
+
+    @mock.patch('time.sleep')
+    def test_acquire_within_deadline(self, sleep):
+        limiter = ratelimit.RateLimiter(queue_rate=1)
+        limiter.acquire('my_queue')
+
+        dl = deadline.Deadline(0.01)
+        self.assertRaises(errors.DeadlineExceeded, limiter.acquire,
+                          'my_queue', dl)
+        self.assertFalse(sleep.called)
+
+        # NOTE: The token of the failed call was given back.
+        limiter.acquire('my_queue', deadline.Deadline(5))
+        self.assertTrue(0 < sleep.call_args[0][0] <= 1)
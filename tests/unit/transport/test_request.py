@@ -16,9 +16,15 @@
 
 import json
 
+import mock
+from stevedore import driver
+
+from zaqarclient import errors
 from zaqarclient.queues.v1 import api as api_v1
 from zaqarclient.queues.v2 import api as api_v2
 from zaqarclient.tests import base
+from zaqarclient import transport
+from zaqarclient.transport import http
 from zaqarclient.transport import request
 
 
@@ -68,3 +74,34 @@ class TestRequest(base.TestBase):
         api_version = 2.0
         req = request.prepare_request(auth_opts, api=api_version)
         self.assertIsInstance(req.api, api_v2.V2)
+
+    def test_api_driver_is_cached(self):
+        transport.invalidate_drivers()
+        self.addCleanup(transport.invalidate_drivers)
+
+        with mock.patch.object(driver, 'DriverManager',
+                               wraps=driver.DriverManager) as manager:
+            for _ in range(3):
+                req = request.Request(api=2)
+                self.assertIsInstance(req.api, api_v2.V2)
+            self.assertEqual(1, manager.call_count)
+
+            transport.invalidate_drivers()
+            self.assertIsInstance(request.Request(api=2).api, api_v2.V2)
+            self.assertEqual(2, manager.call_count)
+
+    def test_transport_driver_is_cached(self):
+        transport.invalidate_drivers()
+        self.addCleanup(transport.invalidate_drivers)
+
+        with mock.patch.object(driver, 'DriverManager',
+                               wraps=driver.DriverManager) as manager:
+            trans = transport.get_transport('http', 2, self.conf)
+            trans2 = transport.get_transport('http', 2, self.conf)
+            self.assertIsInstance(trans, http.HttpTransport)
+            self.assertIsNot(trans, trans2)
+            self.assertEqual(1, manager.call_count)
+
+    def test_unknown_driver(self):
+        self.assertRaises(errors.DriverLoadFailure,
+                          transport.get_transport, 'zmq', 42)
@@ -0,0 +1,52 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+
+import mock
+
+from zaqarclient.common import codec
+from zaqarclient.tests import base
+from zaqarclient.transport import response
+
+
+class TestResponse(base.TestBase):
+
+    def test_bytes_content(self):
+        body = {'messages': [{'body': u'h\xe9llo'}]}
+        raw = json.dumps(body).encode('utf-8')
+        resp = response.Response(None, raw)
+        self.assertIs(raw, resp.raw)
+        self.assertEqual(body, resp.deserialized_content)
+        self.assertEqual(json.dumps(body), resp.content)
+
+    def test_deserialized_from_bytes(self):
+        cdc = mock.Mock(wraps=codec.JSONCodec())
+        raw = b'{"a": 1}'
+        resp = response.Response(None, raw, codec=cdc)
+        self.assertEqual({'a': 1}, resp.deserialized_content)
+        cdc.loads.assert_called_once_with(raw)
+        # NOTE: Not decoded until asked to.
+        self.assertIsNone(resp._content)
+
+    def test_text_content(self):
+        resp = response.Response(None, '{"a": 1}')
+        self.assertEqual('{"a": 1}', resp.content)
+        self.assertEqual(b'{"a": 1}', resp.raw)
+        self.assertEqual({'a': 1}, resp.deserialized_content)
+
+    def test_empty_content(self):
+        resp = response.Response(None, b'')
+        self.assertIsNone(resp.deserialized_content)
+        self.assertEqual('', resp.content)
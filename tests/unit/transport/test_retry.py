@@ -0,0 +1,107 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import requests
+
+from zaqarclient.tests import base
+from zaqarclient.transport import errors
+from zaqarclient.transport import retry
+
+
+class TestRetryPolicy(base.TestBase):
+
+    def setUp(self):
+        super(TestRetryPolicy, self).setUp()
+        self.policy = retry.RetryPolicy(attempts=3, base_delay=1,
+                                        max_delay=5)
+        sleep = mock.patch('time.sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def test_success(self):
+        func = mock.Mock(return_value='ok')
+        self.assertEqual('ok', self.policy.call('GET', func, 1, a=2))
+        func.assert_called_once_with(1, a=2)
+        self.assertFalse(self.sleep.called)
+
+    def test_retries_idempotent(self):
+        func = mock.Mock(side_effect=[errors.InternalServerError(),
+                                      requests.exceptions.ReadTimeout(),
+                                      'ok'])
+        self.assertEqual('ok', self.policy.call('DELETE', func))
+        self.assertEqual(3, func.call_count)
+        for call in self.sleep.call_args_list:
+            self.assertTrue(1 <= call[0][0] <= 5)
+
+    def test_gives_up(self):
+        func = mock.Mock(side_effect=errors.ServiceUnavailableError())
+        self.assertRaises(errors.ServiceUnavailableError,
+                          self.policy.call, 'GET', func)
+        self.assertEqual(3, func.call_count)
+        self.assertEqual(1, self.policy.metrics['failures'])
+
+    def test_no_retry_past_deadline(self):
+        func = mock.Mock(side_effect=errors.ServiceUnavailableError())
+        dl = mock.Mock()
+        dl.remaining.return_value = 0.5
+        self.assertRaises(errors.ServiceUnavailableError,
+                          self.policy.call, 'GET', func, deadline=dl)
+        self.assertEqual(1, func.call_count)
+        self.assertFalse(self.sleep.called)
+        self.assertEqual(1, self.policy.metrics['deadline_exceeded'])
+
+    def test_non_retriable_error(self):
+        func = mock.Mock(side_effect=errors.ResourceNotFound())
+        self.assertRaises(errors.ResourceNotFound,
+                          self.policy.call, 'GET', func)
+        self.assertEqual(1, func.call_count)
+
+    def test_non_idempotent(self):
+        func = mock.Mock(side_effect=requests.exceptions.ReadTimeout())
+        self.assertRaises(requests.exceptions.ReadTimeout,
+                          self.policy.call, 'POST', func)
+        self.assertEqual(1, func.call_count)
+
+    def test_non_idempotent_not_sent(self):
+        func = mock.Mock(side_effect=[requests.exceptions.ConnectTimeout(),
+                                      'ok'])
+        self.assertEqual('ok', self.policy.call('POST', func))
+
+    def test_retry_after(self):
+        error = errors.ServiceUnavailableError()
+        error.retry_after = 4
+        func = mock.Mock(side_effect=[error, 'ok'])
+        self.policy.call('GET', func)
+        self.sleep.assert_called_once_with(4)
+
+    def test_budget(self):
+        self.policy.budget = retry.RetryBudget(ratio=0.5, burst=1)
+        func = mock.Mock(side_effect=errors.ServiceUnavailableError())
+
+        # NOTE: The bucket holds a single retry.
+        self.assertRaises(errors.ServiceUnavailableError,
+                          self.policy.call, 'GET', func)
+        self.assertEqual(2, func.call_count)
+        self.assertEqual(1, self.policy.metrics['budget_exhausted'])
+
+        # NOTE: Two requests earn a new one.
+        func = mock.Mock(side_effect=[errors.ServiceUnavailableError(),
+                                      errors.ServiceUnavailableError(),
+                                      'ok'])
+        self.assertRaises(errors.ServiceUnavailableError,
+                          self.policy.call, 'GET', func)
+        self.assertEqual('ok', self.policy.call('GET', func))
+        self.assertEqual(3, func.call_count)
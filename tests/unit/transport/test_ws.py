@@ -11,9 +11,20 @@
 # under the License.
 
 import json
+import threading
+
+import fixtures
 import mock
+from six.moves import queue
+import testtools
 
+from zaqarclient.common import codec
+from zaqarclient import errors
+from zaqarclient.queues.v2 import client
 from zaqarclient.tests import base
+from zaqarclient.tests.transport import fake_ws
+from zaqarclient.transport import deadline
+from zaqarclient.transport import errors as transport_errors
 from zaqarclient.transport import request
 from zaqarclient.transport import ws
 
@@ -33,46 +44,519 @@ class TestWsTransport(base.TestBase):
         self.options = {'auth_opts': auth_opts}
         self.endpoint = 'ws://127.0.0.1:9000'
 
-    @mock.patch.object(ws.WebsocketTransport, "_create_connection")
-    def test_make_client(self, ws_create_connection):
-        ws_create_connection.return_value.recv.return_value = json.dumps({
-            "headers": {
-                "status": 200
-            }
-        })
-
+    def _transport(self, handler=None):
+        self.socket = fake_ws.FakeWebsocket(handler)
         transport = ws.WebsocketTransport(self.options)
+        create = mock.patch.object(transport, '_create_connection',
+                                   return_value=self.socket)
+        self.create_connection = create.start()
+        self.addCleanup(create.stop)
+        self.addCleanup(transport.cleanup)
+        return transport
+
+    def test_make_client(self):
+        transport = self._transport()
         req = request.Request(self.endpoint)
         transport.send(req)
-        ws_create_connection.assert_called_with("ws://127.0.0.1:9000")
+        self.create_connection.assert_called_with("ws://127.0.0.1:9000")
 
-    @mock.patch.object(ws.WebsocketTransport, "recv")
-    @mock.patch.object(ws.WebsocketTransport, "_create_connection")
-    def test_recv(self, ws_create_connection, recv_mock):
+        auth = self.socket.sent[0]
+        self.assertEqual('authenticate', auth['action'])
+        self.assertEqual('FAKE_TOKEN', auth['headers']['X-Auth-Token'])
 
-        send_ack = {
-            "headers": {
-                "status": 200
-            }
-        }
+    def test_recv(self):
+        transport = self._transport()
+        req = request.Request(self.endpoint)
+        transport.send(req)
 
-        recv_mock.side_effect = [send_ack, send_ack, send_ack, {
-            "body": {
-                "payload": "foo"
-            }
-        }, send_ack]
+        self.socket.push({"body": {"payload": "foo"}})
+        data = transport.recv(timeout=5)
+        self.assertEqual(data['body']['payload'], 'foo')
 
-        transport = ws.WebsocketTransport(self.options)
-        req = request.Request(self.endpoint)
+    def test_content_spliced(self):
+        def handler(msg):
+            return {"headers": {"status": 200},
+                    "body": {"queue_name": "foo"}}
+
+        transport = self._transport(handler)
+        body = {'queue_name': 'foo', 'metadata': {'a': [1, 2]}}
+        req = request.Request(self.endpoint, 'queue_create',
+                              content=json.dumps(body))
+        resp = transport.send(req)
+
+        frame = self.socket.sent[-1]
+        self.assertEqual('queue_create', frame['action'])
+        self.assertEqual(body, frame['body'])
+        self.assertEqual({'queue_name': 'foo'}, resp.deserialized_content)
+
+    def test_bytes_content_spliced(self):
+        transport = self._transport()
+        req = request.Request(self.endpoint, 'message_post',
+                              content=b'{"messages": [{"body": 1}]}')
         transport.send(req)
+        self.assertEqual({'messages': [{'body': 1}]},
+                         self.socket.sent[-1]['body'])
+
+    def test_concurrent_requests(self):
+        held = []
+        both_sent = threading.Event()
+
+        def handler(msg):
+            if msg['action'] == 'authenticate':
+                return {'headers': {'status': 200}}
+
+            # NOTE: Reply once both requests are
+            # in flight, in the reverse order.
+            held.append(msg)
+            if len(held) == 2:
+                both_sent.set()
+                for held_msg in reversed(held):
+                    self.socket.push({
+                        'request': held_msg,
+                        'headers': {'status': 200},
+                        'body': {'action': held_msg['action']}})
+            return None
+
+        transport = self._transport(handler)
+        results = {}
+
+        def send(action):
+            req = request.Request(self.endpoint, action)
+            results[action] = transport.send(req).deserialized_content
+
+        threads = [threading.Thread(target=send, args=(action,))
+                   for action in ('queue_get', 'queue_get_stats')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertTrue(both_sent.is_set())
+        self.assertEqual({'queue_get': {'action': 'queue_get'},
+                          'queue_get_stats': {'action': 'queue_get_stats'}},
+                         results)
+        self.assertEqual(1, self.create_connection.call_count)
+
+    def test_error_reply(self):
+        def handler(msg):
+            if msg['action'] == 'authenticate':
+                return {'headers': {'status': 200}}
+            return {'headers': {'status': 404},
+                    'body': {'error': 'Queue not found'}}
+
+        transport = self._transport(handler)
+        req = request.Request(self.endpoint, 'queue_get')
+        self.assertRaises(transport_errors.ResourceNotFound,
+                          transport.send, req)
+
+    def test_connection_lost(self):
+        def handler(msg):
+            if msg['action'] == 'authenticate':
+                return {'headers': {'status': 200}}
+            self.socket.close()
+
+        transport = self._transport(handler)
+        req = request.Request(self.endpoint, 'queue_get')
+        self.assertRaises(IOError, transport.send, req)
+        self.assertRaises(queue.Empty, transport.recv, 0.1)
+
+    def test_deadline(self):
+        def handler(msg):
+            if msg['action'] == 'authenticate':
+                return {'headers': {'status': 200}}
+
+        transport = self._transport(handler)
+        transport.send(request.Request(self.endpoint, 'authenticate'))
+
+        req = request.Request(self.endpoint, 'queue_get')
+        req.deadline = deadline.Deadline(0.01)
+        self.assertRaises(errors.DeadlineExceeded, transport.send, req)
+
+        # NOTE: The late reply isn't mistaken for a notification.
+        self.socket.push({'request': self.socket.sent[-1],
+                          'headers': {'status': 200}})
+        self.assertRaises(queue.Empty, transport.recv, 0.1)
+
+    def _sent_body(self, operation, params=None, content=None, api=2):
+        transport = self._transport()
+        req = request.Request(self.endpoint, operation, params=params,
+                              content=content, api=api)
+        transport.send(req)
+        msg = self.socket.sent[-1]
+        return msg['action'], msg.get('body')
+
+    def test_params_in_body(self):
+        action, body = self._sent_body(
+            'message_list', {'queue_name': 'q', 'limit': 5,
+                             'marker': None, 'echo': True})
+        self.assertEqual('message_list', action)
+        self.assertEqual({'queue_name': 'q', 'limit': 5, 'echo': True},
+                         body)
+
+    def test_renamed_params(self):
+        action, body = self._sent_body(
+            'message_delete_many', {'queue_name': 'q', 'ids': ['1', '2']})
+        self.assertEqual({'queue_name': 'q', 'message_ids': ['1', '2']},
+                         body)
+
+    def test_params_merged_with_content(self):
+        action, body = self._sent_body('claim_create',
+                                       {'queue_name': 'q', 'limit': 2},
+                                       json.dumps({'ttl': 60, 'grace': 30}))
+        self.assertEqual({'queue_name': 'q', 'limit': 2,
+                          'ttl': 60, 'grace': 30}, body)
+
+        action, body = self._sent_body('claim_update',
+                                       {'queue_name': 'q', 'claim_id': 'c'},
+                                       '{ }')
+        self.assertEqual({'queue_name': 'q', 'claim_id': 'c'}, body)
+
+    def test_content_fields(self):
+        action, body = self._sent_body('queue_create', {'queue_name': 'q'},
+                                       json.dumps({'a': 1}))
+        self.assertEqual({'queue_name': 'q', 'metadata': {'a': 1}}, body)
+
+        messages = [{'ttl': 60, 'body': 1}]
+        action, body = self._sent_body('message_post', {'queue_name': 'q'},
+                                       json.dumps(messages).encode('utf-8'),
+                                       api=1)
+        self.assertEqual({'queue_name': 'q', 'messages': messages}, body)
+
+    def test_params_kept(self):
+        action, body = self._sent_body(
+            'subscription_list', {'queue_name': 'q', 'limit': 1,
+                                  'marker': None})
+        self.assertEqual({'queue_name': 'q', 'limit': 1}, body)
+
+    def _client(self, handler):
+        socket = fake_ws.FakeWebsocket(handler)
+        self.useFixture(fixtures.MockPatchObject(
+            ws.WebsocketTransport, '_create_connection',
+            return_value=socket))
+
+        options = {'auth_opts': {'backend': 'noauth',
+                                 'options': {'os_auth_token': 'TOKEN',
+                                             'os_project_id': 'admin'}}}
+        cli = client.Client(self.endpoint, version=2, conf=options)
+        self.addCleanup(cli.close)
+        return cli, socket
+
+    def test_client(self):
+        def handler(msg):
+            body = None
+            if msg['action'] == 'message_list':
+                body = {'messages': [{'id': '1', 'body': 'hi', 'ttl': 60,
+                                      'age': 1}],
+                        'links': []}
+            return {'headers': {'status': 200}, 'body': body}
+
+        cli, socket = self._client(handler)
+        queue = cli.queue('q', auto_create=False)
+        msgs = list(queue.messages())
+        self.assertEqual(['hi'], [m.body for m in msgs])
+
+        msg = socket.sent[-1]
+        self.assertEqual('message_list', msg['action'])
+        self.assertEqual('q', msg['body']['queue_name'])
+
+    def test_client_node_actions(self):
+        cli, socket = self._client(None)
+        self.assertTrue(cli.ping())
+        cli.health()
+        cli.homedoc()
+        self.assertEqual(['ping_node', 'check_node_health', 'get_home_doc'],
+                         socket.actions()[-3:])
+
+    def test_client_pop(self):
+        def handler(msg):
+            body = None
+            if msg['action'] == 'message_delete_many':
+                body = {'messages': [{'id': '1', 'body': 'hi', 'ttl': 60,
+                                      'age': 1}]}
+            return {'headers': {'status': 200}, 'body': body}
+
+        cli, socket = self._client(handler)
+        queue = cli.queue('q', auto_create=False)
+        msgs = list(queue.pop(count=2))
+        self.assertEqual(['hi'], [m.body for m in msgs])
+
+        msg = socket.sent[-1]
+        self.assertEqual('message_delete_many', msg['action'])
+        self.assertEqual({'queue_name': 'q', 'pop': 2}, msg['body'])
+
+    def test_client_delete_messages(self):
+        def handler(msg):
+            return {'headers': {'status': 204}, 'body': None}
+
+        cli, socket = self._client(handler)
+        queue = cli.queue('q', auto_create=False)
+        queue.delete_messages('1', '2')
+
+        msg = socket.sent[-1]
+        self.assertEqual('message_delete_many', msg['action'])
+        self.assertEqual('q', msg['body']['queue_name'])
+        self.assertEqual(['1', '2'], sorted(msg['body']['message_ids']))
+
+
+class ListenerTestBase(base.TestBase):
+
+    def setUp(self):
+        super(ListenerTestBase, self).setUp()
+        self.endpoint = 'ws://127.0.0.1:9000'
+        self.sockets = []
+        create = mock.patch.object(ws.WebsocketTransport,
+                                   '_create_connection',
+                                   side_effect=self._connect)
+        self.create_connection = create.start()
+        self.addCleanup(create.stop)
+
+        options = {'auth_opts': {'backend': 'noauth',
+                                 'options': {'os_auth_token': 'TOKEN',
+                                             'os_project_id': 'admin'}}}
+        self.client = client.Client(self.endpoint, version=2, conf=options)
+        self.addCleanup(self.client.close)
+
+    def _handler(self, msg):
+        body = None
+        if msg['action'] == 'subscription_create':
+            body = {'subscription_id': 'sub-%d' % len(self.sockets)}
+        return {'headers': {'status': 201}, 'body': body}
+
+    def _connect(self, endpoint):
+        self.sockets.append(fake_ws.FakeWebsocket(self._handler))
+        return self.sockets[-1]
+
+    def _notify(self, queue_name, body):
+        self.sockets[-1].push({'queue_name': queue_name,
+                               'Message_Type': 'Notification',
+                               'body': body})
+
+    def _wait_for(self, predicate, timeout=5):
+        event = threading.Event()
+        for _ in range(int(timeout * 100)):
+            if predicate():
+                return True
+            event.wait(0.01)
+        return False
+
+
+class TestWsListener(ListenerTestBase):
+
+    def test_listen(self):
+        listener = self.client.queue('q', auto_create=False).listen(ttl=60)
+        self.assertEqual('sub-1', listener.subscription_id)
+
+        msg = self.sockets[-1].sent[-1]
+        self.assertEqual('subscription_create', msg['action'])
+        self.assertEqual({'queue_name': 'q', 'ttl': 60}, msg['body'])
+
+        self._notify('other', 'ignored')
+        self._notify('q', 'hello')
+        self.assertEqual('hello', listener.get(timeout=5)['body'])
+
+        trans = self.client._get_transport(
+            self.client._request_and_transport()[0])
+        self.assertEqual('ignored', trans.recv(timeout=5)['body'])
+
+    def test_close(self):
+        with self.client.subscribe_ws('q') as listener:
+            pass
+
+        msg = self.sockets[-1].sent[-1]
+        self.assertEqual('subscription_delete', msg['action'])
+        self.assertEqual({'queue_name': 'q', 'subscription_id': 'sub-1'},
+                         msg['body'])
+        self.assertEqual([], list(listener))
+
+    def test_resubscribe_after_reconnect(self):
+        listener = self.client.subscribe_ws('q')
+        self.sockets[-1].close()
+
+        self.assertTrue(self._wait_for(lambda: len(self.sockets) == 2 and
+                                       len(self.sockets[-1].sent) == 2))
+        self.assertEqual(['authenticate', 'subscription_create'],
+                         self.sockets[-1].actions())
+        self.assertEqual('sub-2', listener.subscription_id)
+
+        self._notify('q', 'again')
+        self.assertEqual('again', listener.get(timeout=5)['body'])
+
+    def test_cleanup_stops_listeners(self):
+        listener = self.client.subscribe_ws('q')
+        self.client.close()
+        self.assertRaises(StopIteration, next, listener)
+
+    def test_http_transport_not_supported(self):
+        cli = client.Client('http://example.org', version=2,
+                            conf={'auth_opts': {'backend': 'noauth'}})
+        self.addCleanup(cli.close)
+        self.assertRaises(errors.InvalidOperation, cli.subscribe_ws, 'q')
+
+
+class TestWsReconnect(base.TestBase):
+
+    def setUp(self):
+        super(TestWsReconnect, self).setUp()
+        self.endpoint = 'ws://127.0.0.1:9000'
+        self.options = {'auth_opts': {'options': {'os_auth_token': 'TOKEN',
+                                                  'os_project_id': 'admin'}},
+                        'ws_reconnect_attempts': 3,
+                        'ws_reconnect_delay': 0.1,
+                        'ws_reconnect_max_delay': 1}
+        self.sockets = []
+        self.drop = set()
+
+        sleep = mock.patch('time.sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+        self.transport = ws.WebsocketTransport(self.options)
+        self.addCleanup(self.transport.cleanup)
+        create = mock.patch.object(self.transport, '_create_connection',
+                                   side_effect=self._connect)
+        self.create_connection = create.start()
+        self.addCleanup(create.stop)
+
+    def _connect(self, endpoint):
+        socket = fake_ws.FakeWebsocket(
+            lambda msg: self._handler(socket, msg))
+        self.sockets.append(socket)
+        return socket
+
+    def _handler(self, socket, msg):
+        # NOTE: The first socket drops the
+        # requests listed in `drop`.
+        if socket is self.sockets[0] and msg['action'] in self.drop:
+            socket.close()
+            return None
+        return {'headers': {'status': 200}, 'body': {'ok': True}}
+
+    def _request(self, operation):
+        return request.Request(self.endpoint, operation,
+                               params={'queue_name': 'q'},
+                               headers={'X-Auth-Token': 'TOKEN'},
+                               api=2)
+
+    def test_idempotent_request_resent(self):
+        self.drop.add('queue_get_stats')
+        resp = self.transport.send(self._request('queue_get_stats'))
+
+        self.assertEqual({'ok': True}, resp.deserialized_content)
+        self.assertEqual(2, len(self.sockets))
+        self.assertEqual(['authenticate', 'queue_get_stats'],
+                         self.sockets[1].actions())
+
+    def test_non_idempotent_request_fails_fast(self):
+        self.drop.add('message_post')
+        self.assertRaises(IOError, self.transport.send,
+                          self._request('message_post'))
+        self.assertEqual(['authenticate', 'message_post'],
+                         self.sockets[0].actions())
+
+        # NOTE: The next request reconnects.
+        self.transport.send(self._request('queue_get'))
+        self.assertEqual(['authenticate', 'queue_get'],
+                         self.sockets[1].actions())
+
+    def test_encoding_error_keeps_connection(self):
+        self.transport.send(self._request('queue_get'))
+
+        req = self._request('queue_get_stats')
+        req.params['unknown'] = object()
+        self.assertRaises(TypeError, self.transport.send, req)
+
+        self.transport.send(self._request('queue_get'))
+        self.assertEqual(1, len(self.sockets))
+        self.assertEqual(['authenticate', 'queue_get', 'queue_get'],
+                         self.sockets[0].actions())
+
+    def test_backoff(self):
+        self.transport.send(self._request('queue_get'))
+        self.sockets[0].close()
+
+        self.create_connection.side_effect = [IOError('refused'),
+                                              IOError('refused'),
+                                              fake_ws.FakeWebsocket()]
+        self.transport.send(self._request('queue_get'))
+
+        self.assertEqual(2, self.sleep.call_count)
+        for call in self.sleep.call_args_list:
+            self.assertTrue(0.1 <= call[0][0] <= 1)
+
+    def test_gives_up(self):
+        self.transport.send(self._request('queue_get'))
+        self.sockets[0].close()
+
+        self.create_connection.side_effect = IOError('refused')
+        self.assertRaises(IOError, self.transport.send,
+                          self._request('queue_get'))
+        self.assertEqual(4, self.create_connection.call_count)
+
+    def test_token_refreshed(self):
+        backend = mock.Mock()
+
+        def authenticate(api_version, req):
+            req.headers['X-Auth-Token'] = 'FRESH'
+            return req
+
+        backend.authenticate.side_effect = authenticate
+        req = self._request('queue_get')
+        req.auth_backend = backend
+        self.transport.send(req)
+
+        self.drop.add('queue_get_stats')
+        req = self._request('queue_get_stats')
+        self.transport.send(req)
+
+        auth = self.sockets[1].sent[0]
+        self.assertEqual('FRESH', auth['headers']['X-Auth-Token'])
+        resent = self.sockets[1].sent[1]
+        self.assertEqual('FRESH', resent['headers']['X-Auth-Token'])
+
+
+@testtools.skipUnless(codec.msgpack, 'msgpack is not installed')
+class TestWsMsgPack(base.TestBase):
+
+    def setUp(self):
+        super(TestWsMsgPack, self).setUp()
+        self.endpoint = 'ws://127.0.0.1:9000'
+        options = {'auth_opts': {'options': {'os_auth_token': 'TOKEN'}},
+                   'ws_codec': 'msgpack'}
+
+        def handler(msg):
+            return {'headers': {'status': 200},
+                    'body': {'queue_name': 'q'}}
+
+        self.socket = fake_ws.FakeWebsocket(handler)
+        self.socket.send = mock.Mock(side_effect=self.socket.send)
+        self.transport = ws.WebsocketTransport(options)
+        self.addCleanup(self.transport.cleanup)
+        create = mock.patch.object(self.transport, '_create_connection',
+                                   return_value=self.socket)
+        create.start()
+        self.addCleanup(create.stop)
+
+    def test_binary_frames(self):
+        req = request.Request(self.endpoint, 'queue_create',
+                              params={'queue_name': 'q'},
+                              content=json.dumps({'a': 1}), api=2)
+        resp = self.transport.send(req)
+
+        self.assertFalse(self.socket.send.called)
+        msg = self.socket.sent[-1]
+        self.assertEqual('queue_create', msg['action'])
+        self.assertEqual({'queue_name': 'q', 'metadata': {'a': 1}},
+                         msg['body'])
+        self.assertEqual({'queue_name': 'q'}, resp.deserialized_content)
 
-        count = 0
+    def test_json_frames_received(self):
+        self.transport.send(request.Request(self.endpoint, 'authenticate'))
+        self.socket.push({'body': {'payload': 'foo'}})
+        self.assertEqual({'payload': 'foo'},
+                         self.transport.recv(timeout=5)['body'])
 
-        while True:
-            count += 1
-            data = transport.recv()
-            if 'body' in data:
-                self.assertEqual(data['body']['payload'], 'foo')
-                break
-            if count >= 4:
-                self.fail('Failed to receive expected message.')
+    def test_fallback_to_json(self):
+        with mock.patch.object(codec, 'msgpack', None):
+            transport = ws.WebsocketTransport(
+                {'auth_opts': {'options': {}}, 'ws_codec': 'msgpack'})
+        self.assertFalse(transport._frame_codec.binary)
@@ -0,0 +1,38 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+# NOTE: Python 3 only, this module is excluded from the
+# py27 test runs.
+
+import asyncio
+
+from tests.unit.transport import test_ws
+
+
+class TestWsListenerAsync(test_ws.ListenerTestBase):
+
+    def test_async_iteration(self):
+        listener = self.client.subscribe_ws('q')
+        self._notify('q', 'one')
+        self._notify('q', 'two')
+
+        async def consume():
+            bodies = []
+            async for notification in listener:
+                bodies.append(notification['body'])
+                if len(bodies) == 2:
+                    listener.close()
+            return bodies
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.assertEqual(['one', 'two'], loop.run_until_complete(consume()))
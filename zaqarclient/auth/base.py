@@ -40,6 +40,28 @@ class AuthBackend(object):
         :returns: The modified request spec.
         """
 
+    def invalidate(self):
+        """Invalidates the cached authentication state.
+
+        Called when the server rejects the credentials sent
+        along with a request.
+
+        :returns: True if new credentials may be obtained by
+            authenticating again, False otherwise.
+        """
+        return False
+
+    def cleanup(self):
+        """Releases the resources held by this backend."""
+
+    def reset_after_fork(self):
+        """Drops the state that can't be shared with a parent process.
+
+        Called in a child process before its first request. The
+        cached credentials should be kept, the connections and
+        threads inherited from the parent should not be used.
+        """
+
 
 class NoAuth(AuthBackend):
     """No Auth Plugin."""
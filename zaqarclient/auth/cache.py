@@ -0,0 +1,121 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import os
+import tempfile
+
+from oslo_log import log as logging
+from oslo_utils import timeutils
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join('~', '.cache', 'zaqarclient', 'tokens')
+
+
+class TokenCache(object):
+    """Disk cache for tokens and messaging endpoints
+
+    Entries are stored as one JSON file per identity, readable
+    by the owner only, and are ignored once the token they hold
+    is about to expire.
+
+    :param path: Directory where the entries are stored.
+        Default: ~/.cache/zaqarclient/tokens
+    :type path: `six.string_types`
+    :param margin: Seconds before expiration at which an
+        entry is considered stale.
+    :type margin: int
+    """
+
+    def __init__(self, path=None, margin=60):
+        self.path = os.path.expanduser(path or DEFAULT_PATH)
+        self.margin = margin
+
+        # NOTE: Entries already read or written by this
+        # instance, so that only the first lookup touches the disk.
+        self._entries = {}
+
+    @staticmethod
+    def key(auth_url, user, project, region=None, domain=None,
+            project_domain=None):
+        """Returns the cache key for the given identity."""
+        ident = json.dumps([auth_url, user, project, region, domain,
+                            project_domain])
+        return hashlib.sha256(ident.encode('utf-8')).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, key)
+
+    def _read(self, key):
+        try:
+            with open(self._file(key)) as f:
+                entry = json.load(f)
+            expires_at = timeutils.normalize_time(
+                timeutils.parse_isotime(entry['expires_at']))
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+        return entry, expires_at
+
+    def get(self, key):
+        """Returns the entry stored under `key`
+
+        :returns: A dict with the `token`, its `expires_at` date and
+            the `endpoint`, if known. None if there's no valid entry.
+        """
+        cached = self._entries.get(key) or self._read(key)
+        if cached is None:
+            return None
+
+        entry, expires_at = cached
+        if timeutils.is_soon(expires_at, self.margin):
+            self.delete(key)
+            return None
+
+        self._entries[key] = cached
+        return entry
+
+    def set(self, key, token, expires_at, endpoint=None):
+        """Stores a token, and its endpoint, under `key`
+
+        :param expires_at: Token's expiration date. Naive
+            dates are assumed to be UTC.
+        :type expires_at: `datetime.datetime`
+        """
+        entry = {'token': token,
+                 'expires_at': expires_at.isoformat(),
+                 'endpoint': endpoint}
+        self._entries[key] = (entry, timeutils.normalize_time(expires_at))
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path, 0o700)
+
+            # NOTE: mkstemp creates the file with 0600
+            # permissions, the rename makes the update atomic.
+            fd, tmp = tempfile.mkstemp(dir=self.path)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.rename(tmp, self._file(key))
+        except (IOError, OSError) as ex:
+            LOG.warning('Unable to write the token cache: %s', ex)
+
+    def delete(self, key):
+        """Removes the entry stored under `key`, if any."""
+        self._entries.pop(key, None)
+        try:
+            os.remove(self._file(key))
+        except OSError:
+            pass
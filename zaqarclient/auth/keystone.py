@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+
 import six.moves.urllib.parse as urlparse
 
 from keystoneauth1 import discover
@@ -20,10 +22,77 @@ from keystoneauth1 import exceptions as ka_exc
 from keystoneauth1.identity import v2 as v2_auth
 from keystoneauth1.identity import v3 as v3_auth
 from keystoneauth1 import session
+from oslo_log import log as logging
+from oslo_utils import timeutils
 
 from zaqarclient.auth import base
+from zaqarclient.auth import cache
 from zaqarclient import errors
 
+LOG = logging.getLogger(__name__)
+
+
+class TokenRefresher(object):
+    """Renews a keystone token before it expires
+
+    The refresher runs in a daemon thread. It sleeps until
+    the token is `margin` seconds away from its expiration,
+    gets a new one and hands it over to `on_refresh`.
+
+    :param ks_session: The keystone session holding the token.
+    :type ks_session: `keystoneauth1.session.Session`
+    :param on_refresh: Callable called with every new token.
+    :type on_refresh: Callable object.
+    :param margin: Seconds before expiration to renew the token.
+    :type margin: int
+    """
+
+    # NOTE: Minimum number of seconds between two
+    # attempts, so failures or short-lived tokens don't make
+    # the refresher hammer keystone.
+    min_interval = 10
+
+    def __init__(self, ks_session, on_refresh, margin=120):
+        self._session = ks_session
+        self._on_refresh = on_refresh
+        self._margin = margin
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        name='zaqarclient-token-refresher')
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _next_delay(self):
+        auth_ref = self._session.auth.get_access(self._session)
+        now = timeutils.utcnow(with_timezone=True)
+        return (auth_ref.expires - now).total_seconds() - self._margin
+
+    def refresh(self):
+        plugin = self._session.auth
+
+        # NOTE: Fetch the new token without invalidating
+        # the current one, requests keep using it until it's swapped.
+        auth_ref = plugin.get_auth_ref(self._session)
+        plugin.auth_ref = auth_ref
+        self._on_refresh(auth_ref.auth_token)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                delay = self._next_delay()
+                if delay <= 0:
+                    self.refresh()
+                    delay = self._next_delay()
+            except Exception:
+                LOG.exception('Failed to refresh the keystone token.')
+                delay = self.min_interval
+            self._stop.wait(max(delay, self.min_interval))
+
 
 # NOTE(flaper87): Some of the code below
 # was brought to you by the very unique
@@ -42,9 +111,36 @@ class KeystoneAuth(base.AuthBackend):
             - os_region_name
             - os_service_type
             - os_endpoint_type
+            - token_refresh: Renew the token in the background
+              before it expires. Default: False
+            - token_refresh_margin: Seconds before expiration to
+              renew the token. Default: 120
+            - token_cache: Cache tokens and endpoints on disk, either
+              True or the cache directory. Default: False. The
+              `openstack messaging` commands authenticate through
+              osc and don't use it.
     :type conf: `dict`
+
+    The keystone session, and therefore the token, as well as the
+    messaging endpoint are cached by the backend instance. The token
+    is renewed when it is about to expire or when `invalidate` is
+    called.
     """
 
+    def __init__(self, conf):
+        super(KeystoneAuth, self).__init__(conf)
+        self._ks_session = None
+        self._token_session = None
+        self._token = None
+        self._endpoint = None
+        self._refresher = None
+        self._token_cache = None
+        self._cache_key = None
+
+        # NOTE: Requests sharing this backend may be
+        # authenticated from several threads at once.
+        self._lock = threading.RLock()
+
     def _get_keystone_session(self, **kwargs):
         cacert = kwargs.pop('cacert', None)
         cert = kwargs.pop('cert', None)
@@ -194,12 +290,14 @@ class KeystoneAuth(base.AuthBackend):
             for k in keys:
                 ks_kwargs.update({k: get_options(k)})
 
-            ks_session = (request.session or
-                          self._get_keystone_session(**ks_kwargs))
-            if not token:
-                token = ks_session.get_token()
-            if not request.endpoint:
-                request.endpoint = self._get_endpoint(ks_session, **ks_kwargs)
+            cached = self._cache_get(ks_kwargs)
+            if cached:
+                token = token or cached['token']
+                request.endpoint = request.endpoint or cached['endpoint']
+
+        if not token or not request.endpoint:
+            with self._lock:
+                token = self._authenticate(request, token, ks_kwargs)
 
         # NOTE(flaper87): Update the request spec
         # with the final token.
@@ -209,3 +307,126 @@ class KeystoneAuth(base.AuthBackend):
         request.verify = not get_options('insecure')
         request.cert = get_options('cacert')
         return request
+
+    def _authenticate(self, request, token, ks_kwargs):
+        ks_session = request.session
+        if ks_session is None:
+            if self._ks_session is None:
+                self._ks_session = self._get_keystone_session(**ks_kwargs)
+            ks_session = self._ks_session
+
+        if not token:
+            token = self._get_token(ks_session)
+        if not request.endpoint:
+            if self._endpoint is None:
+                self._endpoint = self._get_endpoint(ks_session, **ks_kwargs)
+            request.endpoint = self._endpoint
+
+        if self._token_session is ks_session:
+            self._cache_set(ks_kwargs, ks_session, token, request.endpoint)
+        return token
+
+    def _get_cache(self, ks_kwargs):
+        path = self.conf.get('token_cache')
+        if not path:
+            return None, None
+
+        if self._token_cache is None:
+            self._token_cache = cache.TokenCache(None if path is True
+                                                 else path)
+            self._cache_key = cache.TokenCache.key(
+                ks_kwargs['auth_url'],
+                ks_kwargs['username'],
+                ks_kwargs['project_id'] or ks_kwargs['project_name'],
+                region=ks_kwargs['region_name'],
+                domain=(ks_kwargs['user_domain_id'] or
+                        ks_kwargs['user_domain_name']),
+                project_domain=(ks_kwargs['project_domain_id'] or
+                                ks_kwargs['project_domain_name']))
+        return self._token_cache, self._cache_key
+
+    def _cache_get(self, ks_kwargs):
+        token_cache, key = self._get_cache(ks_kwargs)
+        if token_cache is None:
+            return None
+        return token_cache.get(key)
+
+    def _cache_set(self, ks_kwargs, ks_session, token, endpoint):
+        token_cache, key = self._get_cache(ks_kwargs)
+        if token_cache is None:
+            return
+        auth_ref = ks_session.auth.get_access(ks_session)
+        token_cache.set(key, token, auth_ref.expires, endpoint=endpoint)
+
+    def _get_token(self, ks_session):
+        # NOTE: When the refresher is running, the
+        # token is swapped by it before it expires.
+        token = self._token
+        if token is not None and self._token_session is ks_session:
+            # NOTE: The refresher thread is gone
+            # in a forked process, start a new one.
+            self._start_refresher(ks_session)
+            return token
+
+        # NOTE: The session's auth plugin caches
+        # the token until it is about to expire.
+        token = ks_session.get_token()
+        self._token_session = ks_session
+
+        if self.conf.get('token_refresh'):
+            self._token = token
+            self._start_refresher(ks_session)
+        return token
+
+    def _start_refresher(self, ks_session):
+        if self._refresher is None:
+            margin = self.conf.get('token_refresh_margin', 120)
+            self._refresher = TokenRefresher(ks_session,
+                                             self._set_token,
+                                             margin=margin)
+            self._refresher.start()
+
+    def _set_token(self, token):
+        self._token = token
+
+    def invalidate(self):
+        """Drops the cached token, if it was issued by keystone.
+
+        Tokens passed explicitly in the conf can't be renewed.
+        """
+        with self._lock:
+            if self._token_cache is not None:
+                self._token_cache.delete(self._cache_key)
+
+            if self._token_session is None:
+                return self._token_cache is not None
+            self._token = None
+            return self._token_session.invalidate()
+
+    def reset_after_fork(self):
+        """Drops the connections and threads inherited on fork
+
+        The token and the endpoint are kept. The keystone session is
+        rebuilt around the same auth plugin, which holds the token,
+        so that it doesn't reuse the parent's sockets.
+        """
+        self._lock = threading.RLock()
+
+        # NOTE: Threads don't survive a fork, the
+        # refresher is started again on the next request.
+        self._refresher = None
+
+        old = self._ks_session
+        if old is not None:
+            self._ks_session = session.Session(auth=old.auth,
+                                               verify=old.verify,
+                                               cert=old.cert)
+            if self._token_session is old:
+                self._token_session = self._ks_session
+
+    def cleanup(self):
+        """Stops the token refresher, if any."""
+        if self._refresher is not None:
+            self._refresher.stop()
+            self._refresher = None
+            self._token = None
@@ -0,0 +1,167 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+JSON codecs used to serialize requests and deserialize responses.
+
+The codec is picked with the `json_codec` option: `json` - the
+default -, `orjson`, `ujson` or `auto`, which uses the fastest one
+installed. Unavailable codecs fall back to the stdlib's.
+
+`orjson` and `ujson` are opt-in, they reject some payloads the
+stdlib's `json` accepts, i.e. dicts with non string keys.
+
+The websocket transport may use MessagePack instead, see
+`get_frame_codec`.
+"""
+
+import json
+
+from oslo_log import log as logging
+from oslo_utils import importutils
+import six
+
+LOG = logging.getLogger(__name__)
+
+msgpack = importutils.try_import('msgpack')
+orjson = importutils.try_import('orjson')
+ujson = importutils.try_import('ujson')
+
+AUTO = 'auto'
+
+
+class JSONCodec(object):
+    """The stdlib's `json`"""
+
+    name = 'json'
+
+    # NOTE: Whether it serializes to binary
+    # rather than text.
+    binary = False
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+    def loads(self, data):
+        if isinstance(data, six.binary_type):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+class UJSONCodec(JSONCodec):
+
+    name = 'ujson'
+
+    def dumps(self, obj):
+        return ujson.dumps(obj)
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+class ORJSONCodec(JSONCodec):
+
+    name = 'orjson'
+
+    def dumps(self, obj):
+        # NOTE: orjson returns bytes, the
+        # content of requests is expected to be text.
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class MsgPackCodec(object):
+    """MessagePack, for binary websocket frames"""
+
+    name = 'msgpack'
+    binary = True
+
+    def dumps(self, obj):
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def loads(self, data):
+        return msgpack.unpackb(data, raw=False)
+
+
+def join(parts):
+    """Concatenates serialized JSON, as bytes if any part is
+
+    :param parts: Text and bytes to concatenate.
+    :type parts: `list`
+    """
+    if any(isinstance(part, six.binary_type) for part in parts):
+        return b''.join(part if isinstance(part, six.binary_type)
+                        else part.encode('utf-8') for part in parts)
+    return u''.join(parts)
+
+
+def _available():
+    codecs = []
+    if orjson is not None:
+        codecs.append(ORJSONCodec())
+    if ujson is not None:
+        codecs.append(UJSONCodec())
+    codecs.append(JSONCodec())
+    return codecs
+
+
+_CODECS = _available()
+
+
+def get_codec(name=None):
+    """Returns the codec called `name`
+
+    :param name: `json`, `orjson`, `ujson` or `auto`. Default: `json`
+    :type name: `six.text_type`
+    """
+    if name is None:
+        return _CODECS[-1]
+
+    if name == AUTO:
+        return _CODECS[0]
+
+    for codec in _CODECS:
+        if codec.name == name:
+            return codec
+
+    if name not in (ORJSONCodec.name, UJSONCodec.name):
+        raise ValueError('Unknown JSON codec: %s' % name)
+
+    LOG.warning('%s is not installed, falling back to json.', name)
+    return _CODECS[-1]
+
+
+def get_frame_codec(name=None, json_codec=None):
+    """Returns the codec of the websocket frames
+
+    :param name: `msgpack` or `json`. Default: `json`
+    :type name: `six.text_type`
+    :param json_codec: The JSON codec to use, and to fall
+        back to if msgpack isn't installed.
+    :type json_codec: `JSONCodec`
+    """
+    json_codec = json_codec or get_codec()
+    if name in (None, JSONCodec.name):
+        return json_codec
+
+    if name != MsgPackCodec.name:
+        raise ValueError('Unknown websocket codec: %s' % name)
+
+    if msgpack is None:
+        LOG.warning('msgpack is not installed, falling back to json.')
+        return json_codec
+    return MsgPackCodec()
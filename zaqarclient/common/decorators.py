@@ -14,9 +14,13 @@
 # limitations under the License.
 
 import functools
+import inspect
 
 from zaqarclient import errors
 
+# NOTE: getargspec is gone in recent Python 3 versions.
+_getargspec = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
+
 
 def version(min_version, max_version=None):
     min_version = float(min_version)
@@ -65,3 +69,44 @@ def lazy_property(write=False, delete=True):
                         fdel=delete and deleter,
                         doc=fn.__doc__)
     return wrapper
+
+
+def _run_callback(callback, future):
+    if future.cancelled():
+        return
+    error = future.exception()
+    callback(error if error is not None else future.result())
+
+
+def asynchronous(func):
+    """Honours the `callback` argument of a lower level API call
+
+    If a callback is given, the call is submitted to the
+    transport's executor and a `concurrent.futures.Future` is
+    returned instead of the result. The callback is called
+    with the result of the call or with the raised exception.
+
+    The decorated function must take the transport as its
+    first argument and have a `callback` argument.
+    """
+    position = _getargspec(func).args.index('callback')
+
+    @functools.wraps(func)
+    def wrapper(transport, *args, **kwargs):
+        callback = kwargs.pop('callback', None)
+        if len(args) >= position:
+            args = list(args)
+            callback = args.pop(position - 1)
+
+        if callback is None:
+            return func(transport, *args, **kwargs)
+
+        executor = getattr(transport, 'executor', None)
+        if executor is None:
+            raise errors.ZaqarError('An executor is required to send '
+                                    'requests asynchronously.')
+
+        future = executor.submit(func, transport, *args, **kwargs)
+        future.add_done_callback(functools.partial(_run_callback, callback))
+        return future
+    return wrapper
@@ -0,0 +1,60 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent import futures
+import threading
+
+
+class BoundedExecutor(object):
+    """Thread pool limiting the number of in-flight calls
+
+    `submit` blocks once `max_in_flight` calls are either
+    running or waiting for a worker, which keeps a fast
+    producer from queueing an unbounded amount of work.
+
+    :param max_workers: Number of threads in the pool.
+    :type max_workers: int
+    :param max_in_flight: Maximum number of pending calls.
+        Defaults to `max_workers`.
+    :type max_in_flight: int
+    """
+
+    def __init__(self, max_workers=10, max_in_flight=None):
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight or max_workers
+
+        self._executor = futures.ThreadPoolExecutor(max_workers)
+        self._semaphore = threading.BoundedSemaphore(self.max_in_flight)
+
+    def _release(self, future):
+        self._semaphore.release()
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedules `fn(*args, **kwargs)`
+
+        :returns: The future of the call.
+        :rtype: `concurrent.futures.Future`
+        """
+        self._semaphore.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -14,17 +14,123 @@
 # limitations under the License.
 
 import json
+import threading
+import time
 
 import requests
+from requests import adapters
 
+# NOTE: These are the options, read from the client's
+# conf, that tune the connection pool of the session.
+OPTIONS = ('pool_connections', 'pool_maxsize', 'pool_block',
+           'connect_timeout', 'read_timeout', 'keepalive_timeout',
+           'thread_safe')
 
-class Client(object):
 
-    def __init__(self, *args, **kwargs):
-        self.session = requests.session(*args, **kwargs)
+class Client(object):
+    """Thin wrapper around a `requests` session
+
+    :param pool_connections: Number of connection pools to cache,
+        one per host.
+    :type pool_connections: int
+    :param pool_maxsize: Maximum number of connections to keep
+        open per host.
+    :type pool_maxsize: int
+    :param pool_block: Whether to block waiting for a free connection
+        when the pool is full instead of opening a throwaway one.
+    :type pool_block: bool
+    :param connect_timeout: Seconds to wait for the connection to be
+        established. Default: wait forever.
+    :type connect_timeout: float
+    :param read_timeout: Seconds to wait for the server to send data.
+        Default: wait forever.
+    :type read_timeout: float
+    :param keepalive_timeout: Seconds a pooled connection may stay idle
+        before being dropped instead of reused. Default: no limit.
+    :type keepalive_timeout: float
+    :param thread_safe: Give every thread its own session and
+        connection pool. `requests` sessions are not safe to share
+        between threads. Default: False
+    :type thread_safe: bool
+    """
+
+    def __init__(self, pool_connections=adapters.DEFAULT_POOLSIZE,
+                 pool_maxsize=adapters.DEFAULT_POOLSIZE, pool_block=False,
+                 connect_timeout=None, read_timeout=None,
+                 keepalive_timeout=None, thread_safe=False):
+        self._pool_kwargs = dict(pool_connections=pool_connections,
+                                 pool_maxsize=pool_maxsize,
+                                 pool_block=pool_block)
+
+        self.timeout = None
+        if connect_timeout is not None or read_timeout is not None:
+            self.timeout = (connect_timeout, read_timeout)
+
+        self.keepalive_timeout = keepalive_timeout
+        self.thread_safe = thread_safe
+
+        # NOTE: Keeps track of all the sessions
+        # created, so that `close` can reach the ones owned
+        # by other threads. The ones of the threads that are
+        # gone are closed and forgotten when a new one is created.
+        self._lock = threading.Lock()
+        self._states = []
+        self._local = threading.local()
+        self._shared = None if thread_safe else self._new_state()
+
+    def _new_state(self, thread=None):
+        state = _SessionState(self._pool_kwargs, thread)
+        with self._lock:
+            dead = [old for old in self._states if not old.alive]
+            self._states = [old for old in self._states if old.alive]
+            self._states.append(state)
+
+        for old in dead:
+            old.session.close()
+        return state
+
+    @property
+    def _state(self):
+        if self._shared is not None:
+            return self._shared
+
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = self._local.state = self._new_state(
+                threading.current_thread())
+        return state
+
+    @property
+    def session(self):
+        return self._state.session
+
+    @property
+    def adapter(self):
+        return self._state.adapter
+
+    def _expire_idle(self):
+        state = self._state
+        now = time.time()
+        if (self.keepalive_timeout is not None and
+                state.last_used is not None and
+                now - state.last_used > self.keepalive_timeout):
+            # NOTE: The server has most likely dropped
+            # the idle connections already, don't reuse them.
+            state.adapter.close()
+        state.last_used = now
+
+    def close(self):
+        """Closes the sessions and their pooled connections."""
+        with self._lock:
+            states = list(self._states)
+        for state in states:
+            state.session.close()
 
     def request(self, *args, **kwargs):
         """Raw request."""
+        self._expire_idle()
+        if self.timeout is not None:
+            kwargs.setdefault('timeout', self.timeout)
         return self.session.request(*args, **kwargs)
 
     def get(self, *args, **kwargs):
@@ -64,3 +170,25 @@ class Client(object):
         if "data" in kwargs:
             kwargs['data'] = json.dumps(kwargs["data"])
         return self.session.patch(*args, **kwargs)
+
+
+class _SessionState(object):
+    """A `requests` session and the adapter pooling its connections
+
+    :param pool_kwargs: The options of the adapter.
+    :type pool_kwargs: `dict`
+    :param thread: The thread owning the session, if any.
+    :type thread: `threading.Thread`
+    """
+
+    def __init__(self, pool_kwargs, thread=None):
+        self.session = requests.session()
+        self.adapter = adapters.HTTPAdapter(**pool_kwargs)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self.last_used = None
+        self.thread = thread
+
+    @property
+    def alive(self):
+        return self.thread is None or self.thread.is_alive()
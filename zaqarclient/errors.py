@@ -14,7 +14,8 @@
 
 from zaqarclient._i18n import _  # noqa
 
-__all__ = ['ZaqarError', 'DriverLoadFailure', 'InvalidOperation']
+__all__ = ['ZaqarError', 'DriverLoadFailure', 'InvalidOperation',
+           'CircuitOpenError', 'DeadlineExceeded']
 
 
 class ZaqarError(Exception):
@@ -38,3 +39,23 @@ class InvalidOperation(ZaqarError):
 
 class UnsupportedVersion(ZaqarError):
     """Raised if there is no endpoint which supports the requested version."""
+
+
+class CircuitOpenError(ZaqarError):
+    """Raised when requests to an endpoint are failing fast.
+
+    The endpoint failed too many times in a row, no request will
+    be sent to it for the next `retry_after` seconds.
+    """
+
+    def __init__(self, endpoint, retry_after):
+        msg = (_('Endpoint %(endpoint)s is unavailable, requests are '
+                 'failing fast for the next %(retry_after).1f seconds') %
+               {'endpoint': endpoint, 'retry_after': retry_after})
+        super(CircuitOpenError, self).__init__(msg)
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(ZaqarError):
+    """Raised when a call didn't complete before its deadline."""
@@ -82,6 +82,7 @@ class V1(api.Api):
         'queue_get_stats': {
             'ref': 'queues/{queue_name}/stats',
             'method': 'GET',
+            'safe': True,
             'required': ['queue_name'],
             'properties': {
                 'queue_name': {'type': 'string'}
@@ -91,6 +92,7 @@ class V1(api.Api):
         'message_list': {
             'ref': 'queues/{queue_name}/messages',
             'method': 'GET',
+            'safe': True,
             'required': ['queue_name'],
             'properties': {
                 'queue_name': {'type': 'string'},
@@ -114,6 +116,7 @@ class V1(api.Api):
         'message_get': {
             'ref': 'queues/{queue_name}/messages/{message_id}',
             'method': 'GET',
+            'safe': True,
             'required': ['queue_name', 'message_id'],
             'properties': {
                 'queue_name': {'type': 'string'},
@@ -243,6 +246,7 @@ class V1(api.Api):
         'claim_get': {
             'ref': 'queues/{queue_name}/claims/{claim_id}',
             'method': 'GET',
+            'safe': True,
             'required': ['queue_name', 'claim_id'],
             'properties': {
                 'queue_name': {'type': 'string'},
@@ -93,6 +93,13 @@ class Claim(object):
         req, trans = self._queue.client._request_and_transport()
         core.claim_delete(trans, req, self._queue._name, self.id)
 
+    def delete_async(self):
+        """Deletes the claim without blocking
+
+        :rtype: `concurrent.futures.Future`
+        """
+        return self._queue.client.submit(self.delete)
+
     def update(self, ttl=None, grace=None):
         req, trans = self._queue.client._request_and_transport()
         kwargs = {}
@@ -108,3 +115,12 @@ class Claim(object):
         if grace is not None:
             self._grace = grace
         return res
+
+    def update_async(self, ttl=None, grace=None):
+        """Updates the claim without blocking
+
+        See `update`.
+
+        :rtype: `concurrent.futures.Future`
+        """
+        return self._queue.client.submit(self.update, ttl=ttl, grace=grace)
@@ -13,14 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import threading
+
 from oslo_utils import uuidutils
+from six.moves.urllib import parse
+
+from zaqarclient import auth
 from zaqarclient.common import decorators
+from zaqarclient.common import executor
 from zaqarclient.queues.v1 import core
 from zaqarclient.queues.v1 import flavor
 from zaqarclient.queues.v1 import iterator
 from zaqarclient.queues.v1 import pool
 from zaqarclient.queues.v1 import queues
 from zaqarclient import transport
+from zaqarclient.transport import balancer
+from zaqarclient.transport import deadline
 from zaqarclient.transport import errors
 from zaqarclient.transport import request
 
@@ -28,8 +37,9 @@ from zaqarclient.transport import request
 class Client(object):
     """Client base class
 
-    :param url: Zaqar's instance base url.
-    :type url: `six.text_type`
+    :param url: Zaqar's instance base url or a list of urls
+        of Zaqar's instances to spread the requests across.
+    :type url: `six.text_type` or `list`
     :param version: API Version pointing to.
     :type version: `int`
     :param options: Extra options:
@@ -38,9 +48,88 @@ class Client(object):
         - auth_opts: Authentication options:
             - backend
             - options
+        - pool_connections, pool_maxsize, pool_block: Tune
+        the HTTP connection pool.
+        - connect_timeout, read_timeout: HTTP timeouts, in seconds.
+        - keepalive_timeout: Seconds an idle HTTP connection
+        is kept for reuse.
+        - max_workers: Number of threads used to run the
+        asynchronous calls. Default: 10
+        - max_in_flight: Maximum number of asynchronous calls
+        pending at once. Default: max_workers
+        - thread_safe: Give each thread its own HTTP session and
+        connection pool, so the client can be shared by several
+        threads. Default: False
+        - retry_attempts: Attempts for idempotent requests. Requests
+        aren't retried unless it's set. Default: 1
+        - retry_attempts_non_idempotent: Attempts for POST and PATCH
+        requests that may have reached the server. Default: 1
+        - retry_base_delay, retry_max_delay: Bounds of the delay
+        between attempts, in seconds. Default: 0.1, 10
+        - retry_budget_ratio, retry_budget_burst: Retries allowed per
+        request and maximum burst of retries. Default: 0.2, 10
+        - rate_limit, rate_limit_burst: Requests per second allowed
+        for the client and burst size. Default: no limit
+        - queue_rate_limit: Requests per second allowed for each
+        queue. Default: no limit
+        - queue_rate_limits: Requests per second allowed for the
+        given queues, i.e: {'my_queue': 10}.
+        - breaker_failure_threshold: Consecutive failures after which
+        requests to an endpoint fail fast. Default: disabled
+        - breaker_reset_timeout: Seconds requests fail fast before
+        the endpoint is tried again. Default: 30
+        - breaker_half_open_requests: Requests sent to try the
+        endpoint again. Default: 1
+        - lb_strategy: How the instance is chosen when several urls
+        are given: least_outstanding or power_of_two.
+        Default: least_outstanding
+        - lb_probe_interval: Seconds between two health checks of
+        the instances. 0 disables them. Default: 10
+        - hedge_percentile: Enables hedging of the reads flagged as
+        safe in the API schema. A duplicate of a read is sent, to
+        another instance if possible, once it's slower than this
+        percentile of the observed latencies. Default: disabled
+        - hedge_delay: Seconds to wait for before hedging while
+        the latencies are unknown. Default: 0.1
+        - hedge_max_workers: Threads sending hedged reads. Default: 10
+        - json_codec: JSON library serializing requests and
+        deserializing responses: json, orjson, ujson or auto, the
+        fastest one installed. Default: json
+        - ws_reconnect_attempts, ws_reconnect_delay and
+        ws_reconnect_max_delay: How websocket connections are
+        opened again once lost. See
+        `zaqarclient.transport.ws.WebsocketTransport`.
+        - ws_codec: Format of the websocket frames: json or
+        msgpack, if installed. Default: json
     :param session: keystone session. But it's just place holder, we wont'
         support it in v1.
     :type options: `dict`
+
+    Transports - and the connections they hold - are cached by the
+    client and live as long as it does. Call `close` when the client
+    is not needed anymore or use it as a context manager::
+
+        with client.Client(url, version=2) as cli:
+            cli.queue('my_queue').post({'body': 'hello', 'ttl': 60})
+
+    A client created before forking can be used by the child
+    processes. Each of them opens its own connections but reuses
+    the token and the endpoint already obtained by the parent.
+
+    Methods suffixed with `_async` return a
+    `concurrent.futures.Future` and run in a thread pool owned
+    by the client::
+
+        queue = cli.queue('my_queue')
+        posts = [queue.post_async(msg) for msg in msgs]
+        futures.wait(posts)
+
+    The time spent by the calls made within a
+    `zaqarclient.transport.deadline.scope`, retries and page
+    fetches included, is bounded by its deadline::
+
+        with deadline.scope(5):
+            msgs = list(queue.messages().stream())
     """
 
     queues_module = queues
@@ -49,32 +138,150 @@ class Client(object):
         self.conf = conf or {}
 
         self.api_url = url
+        self.balancer = None
+        if isinstance(url, (list, tuple)):
+            self.api_url = url[0]
+            self.balancer = balancer.Balancer(
+                url, strategy=self.conf.get('lb_strategy',
+                                            balancer.LEAST_OUTSTANDING))
         self.api_version = version
         self.auth_opts = self.conf.get('auth_opts', {})
         self.client_uuid = self.conf.get('client_uuid',
                                          uuidutils.generate_uuid(dashed=False))
         self.session = session
 
+        self._auth_backend = None
+        self._executor = None
+        self._prober = None
+
+        # NOTE: Guards the lazily created state below,
+        # the client may be shared by several threads.
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+
+        # NOTE: Transports are keyed by the endpoint's
+        # scheme and the API version. The options are the same for
+        # all of them since they come from this client's conf.
+        self._transports = {}
+
     def _get_transport(self, request):
         """Gets a transport and caches its instance
 
         This method gets a transport instance based on
         the request's endpoint and caches that for later
         use. The transport instance is invalidated whenever
-        a session expires.
+        the client is closed.
 
         :param request: The request to use to load the
             transport instance.
         :type request: :class:`zaqarclient.transport.request.Request`
         """
 
-        trans = transport.get_transport_for(request,
-                                            options=self.conf)
-        return (trans or self.transport)
+        key = (parse.urlparse(request.endpoint).scheme, self.api_version)
+        trans = self._transports.get(key)
+        if trans is None:
+            with self._lock:
+                trans = self._transports.get(key)
+                if trans is None:
+                    trans = transport.get_transport_for(request,
+                                                        options=self.conf)
+                    trans.executor = self.executor
+                    trans.balancer = self.balancer
+                    self._transports[key] = trans
+        return trans
+
+    @property
+    def executor(self):
+        """The executor running the asynchronous calls
+
+        It's shared by all the transports of this client and
+        created on first use.
+        """
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = executor.BoundedExecutor(
+                        self.conf.get('max_workers', 10),
+                        self.conf.get('max_in_flight'))
+        return self._executor
+
+    def submit(self, fn, *args, **kwargs):
+        """Runs `fn(*args, **kwargs)` in this client's executor
+
+        It blocks while `max_in_flight` calls are pending. The
+        call keeps the deadline of the current scope.
+
+        :returns: The future of the call.
+        :rtype: `concurrent.futures.Future`
+        """
+        return self.executor.submit(deadline.bind(fn), *args, **kwargs)
+
+    @property
+    def auth_backend(self):
+        """The auth backend used to authenticate requests
+
+        It's loaded once so that the authentication state
+        - keystone session, token, endpoint - is reused.
+        """
+        if self._auth_backend is None:
+            with self._lock:
+                if self._auth_backend is None:
+                    self._auth_backend = auth.get_backend(**self.auth_opts)
+        return self._auth_backend
+
+    def _check_fork(self):
+        """Resets the client if it was inherited by a forked process
+
+        The connections, and the threads, of the parent process
+        must not be used by the child. They're dropped without
+        being closed, closing them would affect the parent. The
+        auth backend keeps its token and endpoint, the balancer the
+        endpoints known to be down.
+        """
+        pid = os.getpid()
+        if pid == self._pid:
+            return
+
+        self._pid = pid
+        self._lock = threading.RLock()
+        self._transports = {}
+        self._executor = None
+        self._prober = None
+        if self.balancer is not None:
+            self.balancer.reset_after_fork()
+        if self._auth_backend is not None:
+            self._auth_backend.reset_after_fork()
+
+    def _start_prober(self):
+        interval = self.conf.get('lb_probe_interval', 10)
+        if self.balancer is None or not interval or self._prober:
+            return
+
+        with self._lock:
+            if self._prober is None:
+                self._prober = balancer.HealthProber(self.balancer,
+                                                     self._probe,
+                                                     interval)
+                self._prober.start()
+
+    def _probe(self, endpoint):
+        """Checks whether the instance at `endpoint` is healthy"""
+        req, trans = self._request_and_transport(endpoint)
+        try:
+            core.health(trans, req)
+            return True
+        except errors.ServiceUnavailableError:
+            return False
+
+    def _request_and_transport(self, endpoint=None):
+        self._check_fork()
+        if endpoint is None and self.balancer is not None:
+            self._start_prober()
+            endpoint = self.balancer.choose()
 
-    def _request_and_transport(self):
         req = request.prepare_request(self.auth_opts,
-                                      endpoint=self.api_url,
+                                      auth_backend=self.auth_backend,
+                                      endpoint=endpoint or self.api_url,
                                       api=self.api_version,
                                       session=self.session)
 
@@ -91,6 +298,37 @@ class Client(object):
         return transport.get_transport_for(self.api_url,
                                            self.api_version)
 
+    def close(self):
+        """Closes the transports cached by this client.
+
+        The client can still be used afterwards, new
+        transports will be created on demand.
+        """
+        with self._lock:
+            transports, self._transports = self._transports, {}
+            pool, self._executor = self._executor, None
+            prober, self._prober = self._prober, None
+
+        if prober is not None:
+            prober.stop()
+
+        for trans in transports.values():
+            trans.cleanup()
+
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+        if self._auth_backend is not None:
+            self._auth_backend.cleanup()
+
+    def __enter__(self):
+        """Return self to allow usage as a context manager"""
+        return self
+
+    def __exit__(self, *exc):
+        """Call close when exiting the context manager"""
+        self.close()
+
     def queue(self, ref, **kwargs):
         """Returns a queue instance
 
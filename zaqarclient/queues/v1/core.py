@@ -27,7 +27,7 @@ Functions present in this module assume that:
     request.
 """
 
-import json
+from zaqarclient.common import decorators
 import zaqarclient.transport.errors as errors
 
 
@@ -44,8 +44,9 @@ def _common_queue_ops(operation, transport, request, name, callback=None):
     :param name: Queue reference name.
     :type name: `six.text_type`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
     request.operation = operation
@@ -54,6 +55,7 @@ def _common_queue_ops(operation, transport, request, name, callback=None):
     return resp.deserialized_content
 
 
+@decorators.asynchronous
 def queue_create(transport, request, name,
                  metadata=None, callback=None):
     """Creates a queue
@@ -67,19 +69,21 @@ def queue_create(transport, request, name,
     :param metadata: Queue's metadata object. (>=v1.1)
     :type metadata: `dict`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
     request.operation = 'queue_create'
     request.params['queue_name'] = name
-    request.content = metadata and json.dumps(metadata)
+    request.content = metadata and transport.codec.dumps(metadata)
 
     resp = transport.send(request)
     return resp.deserialized_content
 
 
+@decorators.asynchronous
 def queue_update(transport, request, name, metadata, callback=None):
     """Updates a queue's metadata using PATCH. API v1.1+ only
 
@@ -92,19 +96,21 @@ def queue_update(transport, request, name, metadata, callback=None):
     :param metadata: Queue's metadata object. (>=v1.1)
     :type metadata: `dict`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
     request.operation = 'queue_update'
     request.params['queue_name'] = name
-    request.content = json.dumps(metadata)
+    request.content = transport.codec.dumps(metadata)
 
     resp = transport.send(request)
     return resp.deserialized_content
 
 
+@decorators.asynchronous
 def queue_exists(transport, request, name, callback=None):
     """Checks if the queue exists."""
     try:
@@ -115,24 +121,27 @@ def queue_exists(transport, request, name, callback=None):
         return False
 
 
+@decorators.asynchronous
 def queue_get(transport, request, name, callback=None):
     """Retrieve a queue."""
     return _common_queue_ops('queue_get', transport,
                              request, name, callback=callback)
 
 
+@decorators.asynchronous
 def queue_get_metadata(transport, request, name, callback=None):
     """Gets queue metadata."""
     return _common_queue_ops('queue_get_metadata', transport,
                              request, name, callback=callback)
 
 
+@decorators.asynchronous
 def queue_set_metadata(transport, request, name, metadata, callback=None):
     """Sets queue metadata."""
 
     request.operation = 'queue_set_metadata'
     request.params['queue_name'] = name
-    request.content = json.dumps(metadata)
+    request.content = transport.codec.dumps(metadata)
 
     transport.send(request)
 
@@ -142,12 +151,14 @@ def queue_get_stats(transport, request, name):
                              request, name)
 
 
+@decorators.asynchronous
 def queue_delete(transport, request, name, callback=None):
     """Deletes queue."""
     return _common_queue_ops('queue_delete', transport,
                              request, name, callback=callback)
 
 
+@decorators.asynchronous
 def queue_list(transport, request, callback=None, **kwargs):
     """Gets a list of queues
 
@@ -156,8 +167,9 @@ def queue_list(transport, request, callback=None, **kwargs):
     :param request: Request instance ready to be sent.
     :type request: `transport.request.Request`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     :param kwargs: Optional arguments for this operation.
         - marker: Where to start getting queues from.
@@ -176,6 +188,7 @@ def queue_list(transport, request, callback=None, **kwargs):
     return resp.deserialized_content
 
 
+@decorators.asynchronous
 def message_list(transport, request, queue_name, callback=None, **kwargs):
     """Gets a list of messages in queue `queue_name`
 
@@ -186,8 +199,9 @@ def message_list(transport, request, queue_name, callback=None, **kwargs):
     :param queue_name: Queue reference name.
     :type queue_name: `six.text_type`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     :param kwargs: Optional arguments for this operation.
         - marker: Where to start getting messages from.
@@ -218,6 +232,7 @@ def message_list(transport, request, queue_name, callback=None, **kwargs):
     return resp.deserialized_content
 
 
+@decorators.asynchronous
 def message_post(transport, request, queue_name, messages, callback=None):
     """Post messages to `queue_name`
 
@@ -230,19 +245,48 @@ def message_post(transport, request, queue_name, messages, callback=None):
     :param messages: One or more messages to post.
     :param messages: `list`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
     request.operation = 'message_post'
     request.params['queue_name'] = queue_name
-    request.content = json.dumps(messages)
+    request.content = transport.codec.dumps(messages)
 
     resp = transport.send(request)
     return resp.deserialized_content
 
 
+@decorators.asynchronous
+def message_post_raw(transport, request, queue_name, content, callback=None):
+    """Post messages, already serialized, to `queue_name`
+
+    :param transport: Transport instance to use
+    :type transport: `transport.base.Transport`
+    :param request: Request instance ready to be sent.
+    :type request: `transport.request.Request`
+    :param queue_name: Queue reference name.
+    :type queue_name: `six.text_type`
+    :param content: The request body, as JSON. It's sent as is.
+    :type content: `six.binary_type` or `six.text_type`
+    :param callback: Optional callable to use as callback.
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
+    :type callback: Callable object.
+    """
+
+    request.operation = 'message_post'
+    request.params['queue_name'] = queue_name
+    request.content = content
+
+    resp = transport.send(request)
+    return resp.deserialized_content
+
+
+@decorators.asynchronous
 def message_get(transport, request, queue_name, message_id, callback=None):
     """Gets one message from the queue by id
 
@@ -255,8 +299,9 @@ def message_get(transport, request, queue_name, message_id, callback=None):
     :param message_id: Message reference.
     :param message_id: `six.text_type`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
@@ -268,6 +313,7 @@ def message_get(transport, request, queue_name, message_id, callback=None):
     return resp.deserialized_content
 
 
+@decorators.asynchronous
 def message_get_many(transport, request, queue_name, messages, callback=None):
     """Gets many messages by id
 
@@ -280,8 +326,9 @@ def message_get_many(transport, request, queue_name, messages, callback=None):
     :param messages: Messages references.
     :param messages: list of `six.text_type`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
@@ -293,6 +340,7 @@ def message_get_many(transport, request, queue_name, messages, callback=None):
     return resp.deserialized_content
 
 
+@decorators.asynchronous
 def message_delete(transport, request, queue_name, message_id,
                    claim_id=None, callback=None):
     """Deletes messages from `queue_name`
@@ -306,8 +354,9 @@ def message_delete(transport, request, queue_name, message_id,
     :param message_id: Message reference.
     :param message_id: `six.text_type`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
@@ -320,6 +369,7 @@ def message_delete(transport, request, queue_name, message_id,
     transport.send(request)
 
 
+@decorators.asynchronous
 def message_delete_many(transport, request, queue_name,
                         ids, callback=None):
     """Deletes `ids` messages from `queue_name`
@@ -333,8 +383,9 @@ def message_delete_many(transport, request, queue_name,
     :param ids: Ids of the messages to delete
     :type ids: List of `six.text_type`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
@@ -344,6 +395,7 @@ def message_delete_many(transport, request, queue_name,
     transport.send(request)
 
 
+@decorators.asynchronous
 def message_pop(transport, request, queue_name,
                 count, callback=None):
     """Pops out `count` messages from `queue_name`
@@ -357,8 +409,9 @@ def message_pop(transport, request, queue_name,
     :param count: Number of messages to pop.
     :type count: int
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
@@ -385,7 +438,7 @@ def claim_create(transport, request, queue_name, **kwargs):
     if 'limit' in kwargs:
         request.params['limit'] = kwargs.pop('limit')
 
-    request.content = json.dumps(kwargs)
+    request.content = transport.codec.dumps(kwargs)
 
     resp = transport.send(request)
     return resp.deserialized_content
@@ -420,7 +473,7 @@ def claim_update(transport, request, queue_name, claim_id, **kwargs):
     request.operation = 'claim_update'
     request.params['queue_name'] = queue_name
     request.params['claim_id'] = claim_id
-    request.content = json.dumps(kwargs)
+    request.content = transport.codec.dumps(kwargs)
 
     resp = transport.send(request)
     return resp.deserialized_content
@@ -441,6 +494,7 @@ def claim_delete(transport, request, queue_name, claim_id):
     transport.send(request)
 
 
+@decorators.asynchronous
 def pool_get(transport, request, pool_name, callback=None):
     """Gets pool data
 
@@ -476,7 +530,7 @@ def pool_create(transport, request, pool_name, pool_data):
 
     request.operation = 'pool_create'
     request.params['pool_name'] = pool_name
-    request.content = json.dumps(pool_data)
+    request.content = transport.codec.dumps(pool_data)
     transport.send(request)
 
 
@@ -495,7 +549,7 @@ def pool_update(transport, request, pool_name, pool_data):
 
     request.operation = 'pool_update'
     request.params['pool_name'] = pool_name
-    request.content = json.dumps(pool_data)
+    request.content = transport.codec.dumps(pool_data)
 
     resp = transport.send(request)
     return resp.deserialized_content
@@ -555,10 +609,11 @@ def flavor_create(transport, request, name, flavor_data):
 
     request.operation = 'flavor_create'
     request.params['flavor_name'] = name
-    request.content = json.dumps(flavor_data)
+    request.content = transport.codec.dumps(flavor_data)
     transport.send(request)
 
 
+@decorators.asynchronous
 def flavor_get(transport, request, flavor_name, callback=None):
     """Gets flavor data
 
@@ -593,7 +648,7 @@ def flavor_update(transport, request, flavor_name, flavor_data):
 
     request.operation = 'flavor_update'
     request.params['flavor_name'] = flavor_name
-    request.content = json.dumps(flavor_data)
+    request.content = transport.codec.dumps(flavor_data)
 
     resp = transport.send(request)
     return resp.deserialized_content
@@ -638,6 +693,7 @@ def flavor_delete(transport, request, name):
     transport.send(request)
 
 
+@decorators.asynchronous
 def health(transport, request, callback=None):
     """Check the health of web head for load balancing
 
@@ -646,8 +702,9 @@ def health(transport, request, callback=None):
     :param request: Request instance ready to be sent.
     :type request: `transport.request.Request`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
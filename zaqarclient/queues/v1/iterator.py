@@ -14,6 +14,9 @@
 # limitations under the License.
 
 
+from zaqarclient.transport import deadline
+
+
 class _Iterator(object):
     """Base Iterator
 
@@ -32,6 +35,9 @@ class _Iterator(object):
     The iterator raises a StopIteration exception if the server
     doesn't return more objects after a `next-page` call.
 
+    Pages are fetched within the deadline scope the iterator
+    was created in, if any, even if it's consumed outside it.
+
     :param client: The client instance used by the queue
     :type client: `v1.Client`
     :param listing_response: Response returned by the listing call
@@ -45,6 +51,7 @@ class _Iterator(object):
         self._links = []
         self._stream = False
         self._listing_response = listing_response
+        self._deadline = deadline.current()
 
         # NOTE(flaper87): Simple hack to
         # re-use the iterator for get_many_messages
@@ -76,13 +83,20 @@ class _Iterator(object):
         self._stream = enabled
         return self
 
+    def _follow(self, ref):
+        if self._deadline is None:
+            return self._client.follow(ref)
+
+        with deadline.scope(deadline=self._deadline):
+            return self._client.follow(ref)
+
     def _next_page(self):
         for link in self._links:
             if link['rel'] == 'next':
                 # NOTE(flaper87): We already have the
                 # ref for the next set of messages, lets
                 # just follow it.
-                iterables = self._client.follow(link['href'])
+                iterables = self._follow(link['href'])
 
                 # NOTE(flaper87): Since we're using
                 # `.follow`, the empty result will
@@ -14,8 +14,10 @@
 # limitations under the License.
 
 import re
+import threading
 
 from zaqarclient._i18n import _  # noqa
+from zaqarclient.common import codec
 from zaqarclient import errors
 from zaqarclient.queues.v1 import claim as claim_api
 from zaqarclient.queues.v1 import core
@@ -64,6 +66,10 @@ class Queue(object):
         self._metadata = metadata
         self._href = href
 
+        # NOTE: Guards the cached metadata, queues
+        # may be shared by several threads.
+        self._lock = threading.Lock()
+
         # NOTE(flwang): If force_create is True, then even though auto_create
         # is not True, the queue should be created anyway.
         if auto_create or force_create:
@@ -118,25 +124,28 @@ class Queue(object):
         """
         req, trans = self.client._request_and_transport()
 
-        # NOTE(jeffrey4l): Ensure that metadata is cleared when the new_meta
-        # is an empty dict.
-        if new_meta is not None:
-            if self.client.api_version == 1.1:
-                raise RuntimeError("V1.1 doesn't support to set the queue's "
-                                   "metadata. Please use V1.0 or V2.")
-            core.queue_set_metadata(trans, req, self._name, new_meta)
-            self._metadata = new_meta
-
-        # TODO(flaper87): Cache with timeout
-        if self._metadata and not force_reload:
+        with self._lock:
+            # NOTE(jeffrey4l): Ensure that metadata is cleared when the
+            # new_meta is an empty dict.
+            if new_meta is not None:
+                if self.client.api_version == 1.1:
+                    raise RuntimeError("V1.1 doesn't support to set the "
+                                       "queue's metadata. Please use V1.0 "
+                                       "or V2.")
+                core.queue_set_metadata(trans, req, self._name, new_meta)
+                self._metadata = new_meta
+
+            # TODO(flaper87): Cache with timeout
+            if self._metadata and not force_reload:
+                return self._metadata
+
+            if self.client.api_version >= 1.1:
+                self._metadata = core.queue_get(trans, req, self._name)
+            else:
+                self._metadata = core.queue_get_metadata(trans, req,
+                                                         self._name)
             return self._metadata
 
-        if self.client.api_version >= 1.1:
-            self._metadata = core.queue_get(trans, req, self._name)
-        else:
-            self._metadata = core.queue_get_metadata(trans, req, self._name)
-        return self._metadata
-
     @property
     def stats(self):
         req, trans = self.client._request_and_transport()
@@ -169,6 +178,52 @@ class Queue(object):
         return core.message_post(trans, req,
                                  self._name, messages)
 
+    def post_raw(self, messages, ttl=None):
+        """Posts messages already serialized as JSON
+
+        The request body is stitched together from the given
+        JSON without parsing it, which saves relays and proxies
+        a decode and an encode of each message.
+
+        :param messages: Either the messages, serialized as a JSON
+            array, or a list of message bodies, each serialized.
+        :type messages: `six.binary_type`, `six.text_type` or `list`
+        :param ttl: TTL of the messages, when bodies are given.
+            Required by the v1 API.
+        :type ttl: int
+
+        :returns: A dict with the result of this operation.
+        :rtype: `dict`
+        """
+        if isinstance(messages, (list, tuple)):
+            prefix = '{"body": '
+            if ttl is not None:
+                prefix = '{"ttl": %d, "body": ' % ttl
+
+            parts = ['[']
+            for body in messages:
+                if len(parts) > 1:
+                    parts.append(', ')
+                parts.extend([prefix, body, '}'])
+            parts.append(']')
+            messages = codec.join(parts)
+
+        if self.client.api_version >= 1.1:
+            messages = codec.join(['{"messages": ', messages, '}'])
+
+        req, trans = self.client._request_and_transport()
+        return core.message_post_raw(trans, req, self._name, messages)
+
+    def post_async(self, messages):
+        """Posts one or more messages without blocking
+
+        See `post`.
+
+        :returns: The future of the post.
+        :rtype: `concurrent.futures.Future`
+        """
+        return self.client.submit(self.post, messages)
+
     def message(self, message_id):
         """Gets a message by id
 
@@ -236,6 +291,15 @@ class Queue(object):
         return core.message_delete_many(trans, req, self._name,
                                         set(messages))
 
+    def delete_messages_async(self, *messages):
+        """Deletes a set of messages without blocking
+
+        See `delete_messages`.
+
+        :rtype: `concurrent.futures.Future`
+        """
+        return self.client.submit(self.delete_messages, *messages)
+
     def pop(self, count=1):
         """Pop `count` messages from the server
 
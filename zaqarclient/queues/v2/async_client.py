@@ -0,0 +1,385 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+asyncio flavour of the v2 `Client`. It requires Python 3.5+ and aiohttp
+and uses the transports registered in the `zaqarclient.transport.async`
+namespace, so no thread is held while a request is in flight::
+
+    from zaqarclient.queues.v2 import async_client
+
+    async with async_client.AsyncClient(url, conf=conf) as cli:
+        queue = cli.queue('jobs')
+        await queue.post({'body': {'event': 'created'}, 'ttl': 300})
+
+        claim = await queue.claim(ttl=60, grace=60, limit=10)
+        for msg in claim:
+            ...
+        await queue.delete_messages(*[msg.id for msg in claim])
+
+        async for msg in queue.messages(echo=True).stream():
+            ...
+"""
+
+import asyncio
+import functools
+
+from oslo_utils import uuidutils
+
+from zaqarclient._i18n import _  # noqa
+from zaqarclient import auth
+from zaqarclient.queues.v1 import queues as queues_v1
+from zaqarclient.queues.v2 import message
+from zaqarclient import transport
+from zaqarclient.transport import request
+
+NAMESPACE = 'zaqarclient.transport.async'
+
+
+class AsyncClient(object):
+    """asyncio client for the v2 API
+
+    :param url: Zaqar's instance base url.
+    :type url: `six.text_type`
+    :param version: API Version pointing to. Only 2 is supported.
+    :type version: `int`
+    :param conf: Extra options, the same the blocking
+        `zaqarclient.queues.v2.client.Client` takes.
+    :type conf: `dict`
+    :param session: keystone session.
+    """
+
+    def __init__(self, url=None, version=2, conf=None, session=None):
+        self.conf = conf or {}
+
+        self.api_url = url
+        self.api_version = version
+        self.auth_opts = self.conf.get('auth_opts', {})
+        self.client_uuid = self.conf.get('client_uuid',
+                                         uuidutils.generate_uuid(dashed=False))
+        self.session = session
+
+        self._auth_backend = None
+        self._transport = None
+
+    @property
+    def auth_backend(self):
+        if self._auth_backend is None:
+            self._auth_backend = auth.get_backend(**self.auth_opts)
+        return self._auth_backend
+
+    async def _request_and_transport(self):
+        # NOTE: Authenticating blocks, it's done in the
+        # default executor rather than on the loop.
+        loop = asyncio.get_event_loop()
+        req = await loop.run_in_executor(None, functools.partial(
+            request.prepare_request, self.auth_opts,
+            auth_backend=self.auth_backend,
+            endpoint=self.api_url,
+            api=self.api_version,
+            session=self.session))
+
+        req.headers['Client-ID'] = self.client_uuid
+
+        if self._transport is None:
+            self._transport = transport.get_transport_for(
+                req, version=2, options=self.conf, namespace=NAMESPACE)
+        return req, self._transport
+
+    async def _call(self, operation, params=None, content=None, ref=None):
+        req, trans = await self._request_and_transport()
+        req.operation = operation
+        req.ref = ref or req.ref
+        req.params.update(params or {})
+        if content is not None:
+            req.content = trans.codec.dumps(content)
+
+        resp = await trans.send(req)
+        return resp.deserialized_content
+
+    def queue(self, ref):
+        """Returns a queue instance
+
+        Unlike the blocking client, the queue is not created
+        on the server. Await `AsyncQueue.ensure_exists` for that.
+
+        :param ref: Queue's reference id.
+        :type ref: `six.text_type`
+
+        :rtype: `AsyncQueue`
+        """
+        return AsyncQueue(self, ref)
+
+    def queues(self, **params):
+        """Gets an async iterator over the queues
+
+        :param params: Filters to use for getting queues
+        :type params: **kwargs dict.
+
+        :rtype: `_AsyncIterator`
+        """
+        return _AsyncIterator(self, 'queues',
+                              lambda: self._call('queue_list', params=params),
+                              lambda args: AsyncQueue(self, args['name']))
+
+    async def follow(self, ref):
+        """Follows ref. See `zaqarclient.queues.v1.client.Client.follow`"""
+        return await self._call(None, ref=ref)
+
+    async def ping(self):
+        """Gets the health status of Zaqar server."""
+        try:
+            await self._call('ping')
+            return True
+        except Exception:
+            return False
+
+    async def close(self):
+        """Closes the transport and the auth backend."""
+        trans, self._transport = self._transport, None
+        if trans is not None:
+            await trans.close()
+        if self._auth_backend is not None:
+            self._auth_backend.cleanup()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class AsyncQueue(object):
+
+    def __init__(self, client, name):
+        if not queues_v1.QUEUE_NAME_REGEX.match(str(name)):
+            raise ValueError(_('The queue name may only contain ASCII '
+                               'letters, digits, underscores and dashes.'))
+        self.client = client
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+    def _call(self, operation, params=None, content=None):
+        params = dict(params or {}, queue_name=self._name)
+        return self.client._call(operation, params=params, content=content)
+
+    async def ensure_exists(self):
+        """Creates the queue if it doesn't exist."""
+        await self._call('queue_create')
+
+    async def delete(self):
+        await self._call('queue_delete')
+
+    async def stats(self):
+        return await self._call('queue_get_stats')
+
+    async def post(self, messages):
+        """Posts one or more messages to this queue
+
+        :param messages: One or more messages to post
+        :type messages: `list` or `dict`
+
+        :returns: A dict with the result of this operation.
+        :rtype: `dict`
+        """
+        if not isinstance(messages, list):
+            messages = [messages]
+        return await self._call('message_post',
+                                content={'messages': messages})
+
+    async def message(self, message_id):
+        """Gets a message by id
+
+        :rtype: `AsyncMessage`
+        """
+        msg = await self._call('message_get',
+                               params={'message_id': message_id})
+        return AsyncMessage(self, **msg)
+
+    def messages(self, *messages, **params):
+        """Gets an async iterator over messages
+
+        The `messages` and `params` params are mutually exclusive
+        and the former has the priority.
+
+        :param messages: List of messages' ids to retrieve.
+        :type messages: *args of `six.string_type`
+        :param params: Filters to use for getting messages
+        :type params: **kwargs dict.
+
+        :rtype: `_AsyncIterator`
+        """
+        if messages:
+            def listing():
+                return self._call('message_get_many',
+                                  params={'ids': messages})
+        else:
+            def listing():
+                return self._call('message_list', params=params)
+        return _AsyncIterator(self.client, 'messages', listing,
+                              lambda args: AsyncMessage(self, **args))
+
+    async def delete_messages(self, *messages):
+        """Deletes a set of messages from the server
+
+        :param messages: List of messages' ids to delete.
+        :type messages: *args of `six.string_type`
+        """
+        await self._call('message_delete_many',
+                         params={'ids': set(messages)})
+
+    async def claim(self, ttl=None, grace=None, limit=None):
+        """Claims messages from this queue
+
+        :rtype: `AsyncClaim`
+        """
+        claim = AsyncClaim(self, ttl=ttl, grace=grace, limit=limit)
+        await claim._create()
+        return claim
+
+
+class AsyncClaim(object):
+
+    def __init__(self, queue, id=None, ttl=None, grace=None, limit=None):
+        self._queue = queue
+        self.id = id
+        self.ttl = ttl
+        self.grace = grace
+        self._limit = limit
+        self.messages = []
+
+    def __repr__(self):
+        return '<AsyncClaim id:{id} ttl:{ttl}>'.format(id=self.id,
+                                                       ttl=self.ttl)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def _load(self, msgs):
+        self.messages = [AsyncMessage(self._queue, **args)
+                         for args in msgs or []]
+
+    async def _create(self):
+        content = {}
+        if self.ttl is not None:
+            content['ttl'] = self.ttl
+        if self.grace is not None:
+            content['grace'] = self.grace
+        params = {}
+        if self._limit is not None:
+            params['limit'] = self._limit
+
+        res = await self._queue._call('claim_create', params=params,
+                                      content=content)
+
+        # NOTE: Nothing to claim, the server returns 204.
+        if res:
+            msgs = res['messages']
+            self.id = msgs[0]['href'].split('=')[-1]
+            self._load(msgs)
+
+    async def get(self):
+        """Reloads the claim and its messages from the server."""
+        res = await self._queue._call('claim_get',
+                                      params={'claim_id': self.id})
+        self.ttl = res['ttl']
+        self.grace = res.get('grace')
+        self._load(res.get('messages'))
+
+    async def update(self, ttl=None, grace=None):
+        content = {}
+        if ttl is not None:
+            content['ttl'] = ttl
+        if grace is not None:
+            content['grace'] = grace
+        res = await self._queue._call('claim_update',
+                                      params={'claim_id': self.id},
+                                      content=content)
+        self.ttl = content.get('ttl', self.ttl)
+        self.grace = content.get('grace', self.grace)
+        return res
+
+    async def delete(self):
+        await self._queue._call('claim_delete', params={'claim_id': self.id})
+
+
+class AsyncMessage(message.Message):
+
+    async def delete(self):
+        params = {'message_id': self.id}
+        if self.claim_id:
+            params['claim_id'] = self.claim_id
+        await self.queue._call('message_delete', params=params)
+
+
+class _AsyncIterator(object):
+    """Async counterpart of `zaqarclient.queues.v1.iterator._Iterator`
+
+    :param client: The client instance used to follow links.
+    :type client: `AsyncClient`
+    :param iter_key: Key of the listing holding the objects.
+    :param listing: Callable returning an awaitable on the first page.
+    :param create_function: Turns each listed item into an object.
+    """
+
+    def __init__(self, client, iter_key, listing, create_function):
+        self._client = client
+        self._iter_key = iter_key
+        self._pending = listing
+        self._create_function = create_function
+
+        self._links = []
+        self._stream = False
+        self._listing_response = []
+
+    def stream(self, enabled=True):
+        """Follow `next` links once the current page is consumed."""
+        self._stream = enabled
+        return self
+
+    def _load(self, iterables):
+        # NOTE: Like the blocking iterator, message
+        # get_many returns a plain list.
+        if isinstance(iterables, dict):
+            self._links = iterables.get('links', [])
+            self._listing_response = iterables.get(self._iter_key, [])
+        else:
+            self._listing_response = iterables or []
+
+    async def _next_page(self):
+        for link in self._links:
+            if link['rel'] == 'next':
+                iterables = await self._client.follow(link['href'])
+                if iterables:
+                    self._load(iterables)
+                    return True
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._load(await pending())
+
+        while not self._listing_response:
+            if not self._stream or not await self._next_page():
+                raise StopAsyncIteration
+
+        return self._create_function(self._listing_response.pop(0))
@@ -13,7 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from oslo_utils import uuidutils
 from zaqarclient.common import decorators
 from zaqarclient.queues.v1 import client
 from zaqarclient.queues.v1 import iterator
@@ -25,8 +24,9 @@ from zaqarclient.queues.v2 import subscription
 class Client(client.Client):
     """Client base class
 
-    :param url: Zaqar's instance base url.
-    :type url: `six.text_type`
+    :param url: Zaqar's instance base url or a list of urls
+        of Zaqar's instances to spread the requests across.
+    :type url: `six.text_type` or `list`
     :param version: API Version pointing to.
     :type version: `int`
     :param options: Extra options:
@@ -35,20 +35,22 @@ class Client(client.Client):
         - auth_opts: Authentication options:
             - backend
             - options
+        - pool_connections, pool_maxsize, pool_block: Tune
+        the HTTP connection pool.
+        - connect_timeout, read_timeout: HTTP timeouts, in seconds.
+        - keepalive_timeout: Seconds an idle HTTP connection
+        is kept for reuse.
+        - See `zaqarclient.queues.v1.client.Client` for the
+        options tuning the executor, the retries, the rate
+        limiting, the circuit breakers and the load balancing.
     :type options: `dict`
     """
 
     queues_module = queues
 
     def __init__(self, url=None, version=2, conf=None, session=None):
-        self.conf = conf or {}
-
-        self.api_url = url
-        self.api_version = version
-        self.auth_opts = self.conf.get('auth_opts', {})
-        self.client_uuid = self.conf.get('client_uuid',
-                                         uuidutils.generate_uuid(dashed=False))
-        self.session = session
+        super(Client, self).__init__(url=url, version=version, conf=conf,
+                                     session=session)
 
     def queue(self, ref, **kwargs):
         """Returns a queue instance
@@ -93,11 +95,36 @@ class Client(client.Client):
                                   'subscriptions',
                                   subscription.create_object(self))
 
+    def subscribe_ws(self, queue_name, ttl=3600):
+        """Listens to the messages posted to a queue
+
+        The client must use a websocket endpoint. Notifications are
+        pushed by the server, there's no need to poll the queue::
+
+            with cli.subscribe_ws('my_queue') as notifications:
+                for notification in notifications:
+                    print(notification['body'])
+
+        :param queue_name: The queue to listen to.
+        :type queue_name: `six.text_type`
+        :param ttl: Seconds the subscription lasts.
+        :type ttl: int
+
+        :returns: The notifications, as dicts.
+        :rtype: `zaqarclient.transport.ws.Listener`
+        """
+        req, trans = self._request_and_transport()
+        return core.subscription_listen(trans, req, queue_name, ttl=ttl)
+
     def ping(self):
         """Gets the health status of Zaqar server."""
         req, trans = self._request_and_transport()
         return core.ping(trans, req)
 
+    def _probe(self, endpoint):
+        req, trans = self._request_and_transport(endpoint)
+        return core.ping(trans, req)
+
     @decorators.version(min_version=1.1)
     def health(self):
         """Gets the detailed health status of Zaqar server."""
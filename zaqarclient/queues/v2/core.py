@@ -28,10 +28,11 @@ Functions present in this module assume that:
 """
 
 import datetime
-import json
 
 from oslo_utils import timeutils
 
+from zaqarclient.common import decorators
+from zaqarclient import errors
 from zaqarclient.queues.v1 import core
 
 queue_create = core.queue_create
@@ -45,6 +46,7 @@ queue_list = core.queue_list
 message_get = core.message_get
 message_list = core.message_list
 message_post = core.message_post
+message_post_raw = core.message_post_raw
 message_delete = core.message_delete
 message_delete_many = core.message_delete_many
 pool_get = core.pool_get
@@ -63,6 +65,7 @@ claim_update = core.claim_update
 claim_delete = core.claim_delete
 
 
+@decorators.asynchronous
 def queue_update(transport, request, name, metadata, callback=None):
     """Updates a queue's metadata using PATCH for API v2
 
@@ -75,14 +78,15 @@ def queue_update(transport, request, name, metadata, callback=None):
     :param metadata: Queue's metadata object.
     :type metadata: `list`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
     request.operation = 'queue_update'
     request.params['queue_name'] = name
-    request.content = json.dumps(metadata)
+    request.content = transport.codec.dumps(metadata)
 
     resp = transport.send(request)
     return resp.deserialized_content
@@ -103,7 +107,8 @@ def queue_purge(transport, request, name, resource_types=None):
     request.operation = 'queue_purge'
     request.params['queue_name'] = name
     if resource_types:
-        request.content = json.dumps({'resource_types': resource_types})
+        request.content = transport.codec.dumps(
+            {'resource_types': resource_types})
 
     resp = transport.send(request)
     return resp.deserialized_content
@@ -146,7 +151,7 @@ def signed_url_create(transport, request, queue_name, paths=None,
     if methods is not None:
         body['methods'] = methods
 
-    request.content = json.dumps(body)
+    request.content = transport.codec.dumps(body)
 
     resp = transport.send(request)
     return resp.deserialized_content
@@ -169,7 +174,7 @@ def subscription_create(transport, request, queue_name, subscription_data):
 
     request.operation = 'subscription_create'
     request.params['queue_name'] = queue_name
-    request.content = json.dumps(subscription_data)
+    request.content = transport.codec.dumps(subscription_data)
     resp = transport.send(request)
 
     return resp.deserialized_content
@@ -217,7 +222,7 @@ def subscription_update(transport, request, queue_name, subscription_id,
     request.operation = 'subscription_update'
     request.params['queue_name'] = queue_name
     request.params['subscription_id'] = subscription_id
-    request.content = json.dumps(subscription_data)
+    request.content = transport.codec.dumps(subscription_data)
 
     resp = transport.send(request)
     return resp.deserialized_content
@@ -268,6 +273,33 @@ def subscription_list(transport, request, queue_name, **kwargs):
     return resp.deserialized_content
 
 
+def subscription_listen(transport, request, queue_name, ttl=3600):
+    """Subscribes the transport's connection to `queue_name`
+
+    Only transports receiving notifications pushed by the
+    server, like the websocket one, support it.
+
+    :param transport: Transport instance to use
+    :type transport: `transport.base.Transport`
+    :param request: Request instance ready to be sent.
+    :type request: `transport.request.Request`
+    :param queue_name: Queue reference name.
+    :type queue_name: `six.text_type`
+    :param ttl: Seconds the subscription lasts.
+    :type ttl: int
+
+    :returns: An iterator over the notifications.
+    :raises: `errors.InvalidOperation` if the transport
+        can't receive notifications.
+    """
+    subscribe = getattr(transport, 'subscribe', None)
+    if subscribe is None:
+        raise errors.InvalidOperation(
+            'Listening to a queue requires a websocket transport.')
+    return subscribe(request, queue_name, ttl=ttl)
+
+
+@decorators.asynchronous
 def ping(transport, request, callback=None):
     """Check the health of web head for load balancing
 
@@ -276,8 +308,9 @@ def ping(transport, request, callback=None):
     :param request: Request instance ready to be sent.
     :type request: `transport.request.Request`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
@@ -289,6 +322,7 @@ def ping(transport, request, callback=None):
         return False
 
 
+@decorators.asynchronous
 def health(transport, request, callback=None):
     """Get detailed health status of Zaqar server
 
@@ -297,8 +331,9 @@ def health(transport, request, callback=None):
     :param request: Request instance ready to be sent.
     :type request: `transport.request.Request`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
@@ -307,6 +342,7 @@ def health(transport, request, callback=None):
     return resp.deserialized_content
 
 
+@decorators.asynchronous
 def homedoc(transport, request, callback=None):
     """Get the detailed resource doc of Zaqar server
 
@@ -315,8 +351,9 @@ def homedoc(transport, request, callback=None):
     :param request: Request instance ready to be sent.
     :type request: `transport.request.Request`
     :param callback: Optional callable to use as callback.
-        If specified, this request will be sent asynchronously.
-        (IGNORED UNTIL ASYNC SUPPORT IS COMPLETE)
+        If specified, this request will be sent asynchronously
+        and a `Future` will be returned. The callback will be
+        called with the result or with the raised exception.
     :type callback: Callable object.
     """
 
@@ -33,6 +33,13 @@ class Queue(queues.Queue):
                                          marker=marker,
                                          limit=limit)
 
+    def listen(self, ttl=3600):
+        """Listens to the messages posted to this queue
+
+        See `Client.subscribe_ws`.
+        """
+        return self.client.subscribe_ws(self._name, ttl=ttl)
+
     def metadata(self, new_meta=None, force_reload=False):
         """Get metadata and return it
 
@@ -51,37 +58,38 @@ class Queue(queues.Queue):
         """
         req, trans = self.client._request_and_transport()
 
-        # TODO(flaper87): Cache with timeout
-        if new_meta is None and self._metadata and not force_reload:
+        with self._lock:
+            # TODO(flaper87): Cache with timeout
+            if new_meta is None and self._metadata and not force_reload:
+                return self._metadata
+            else:
+                self._metadata = core.queue_get(trans, req, self._name)
+
+            if new_meta is not None:
+                temp_metadata = self._metadata.copy()
+                changes = []
+                for key, value in new_meta.items():
+                    # If key exists, replace it's value.
+                    if self._metadata.get(key, None):
+                        changes.append({'op': 'replace',
+                                        'path': '/metadata/%s' % key,
+                                        'value': value})
+                        temp_metadata.pop(key)
+                    # If not, add the new key.
+                    else:
+                        changes.append({'op': 'add',
+                                        'path': '/metadata/%s' % key,
+                                        'value': value})
+                # For the keys which are not included in the new metadata,
+                # remove them.
+                for key, value in temp_metadata.items():
+                    changes.append({'op': 'remove',
+                                    'path': '/metadata/%s' % key})
+
+                self._metadata = core.queue_update(trans, req, self._name,
+                                                   metadata=changes)
+
             return self._metadata
-        else:
-            self._metadata = core.queue_get(trans, req, self._name)
-
-        if new_meta is not None:
-            temp_metadata = self._metadata.copy()
-            changes = []
-            for key, value in new_meta.items():
-                # If key exists, replace it's value.
-                if self._metadata.get(key, None):
-                    changes.append({'op': 'replace',
-                                    'path': '/metadata/%s' % key,
-                                    'value': value})
-                    temp_metadata.pop(key)
-                # If not, add the new key.
-                else:
-                    changes.append({'op': 'add',
-                                    'path': '/metadata/%s' % key,
-                                    'value': value})
-            # For the keys which are not included in the new metadata, remove
-            # them.
-            for key, value in temp_metadata.items():
-                changes.append({'op': 'remove',
-                                'path': '/metadata/%s' % key})
-
-            self._metadata = core.queue_update(trans, req, self._name,
-                                               metadata=changes)
-
-        return self._metadata
 
     def purge(self, resource_types=None):
         req, trans = self.client._request_and_transport()
@@ -118,6 +118,32 @@ class QueueV1ClaimUnitTest(base.QueuesTestBase):
             # just checking our way down to the transport
             # doesn't crash.
 
+    def test_claim_update_async(self):
+        self.addCleanup(self.client.close)
+
+        with mock.patch.object(self.transport, 'send',
+                               autospec=True) as send_method:
+
+            resp = response.Response(None, None)
+            send_method.return_value = resp
+
+            claim = self.queue.claim(id='5245432')
+            claim.update_async(ttl=444, grace=987).result()
+            self.assertEqual(444, claim.ttl)
+
+    def test_claim_delete_async(self):
+        self.addCleanup(self.client.close)
+
+        with mock.patch.object(self.transport, 'send',
+                               autospec=True) as send_method:
+
+            resp = response.Response(None, None)
+            send_method.return_value = resp
+
+            self.queue.claim(id='4225').delete_async().result()
+            req = send_method.call_args[0][0]
+            self.assertEqual('claim_delete', req.operation)
+
 
 class QueuesV1ClaimFunctionalTest(base.QueuesTestBase):
 
@@ -150,6 +150,79 @@ class QueuesV1QueueUnitTest(base.QueuesTestBase):
             posted = self.queue.post(messages)
             self.assertEqual(result, posted)
 
+    def test_message_post_raw(self):
+        result = {
+            "resources": [
+                "/v1/queues/fizbit/messages/50b68a50d6f5b8c8a7c62b01"
+            ],
+            "partial": False
+        }
+
+        with mock.patch.object(self.transport, 'send',
+                               autospec=True) as send_method:
+
+            resp = response.Response(None, json.dumps(result))
+            send_method.return_value = resp
+
+            raw = b'[{"ttl": 30, "body": "Post It!"}]'
+            posted = self.queue.post_raw(raw)
+            self.assertEqual(result, posted)
+
+            req = send_method.call_args[0][0]
+            self.assertEqual('message_post', req.operation)
+            self.assertIsInstance(req.content, bytes)
+            messages = [{'ttl': 30, 'body': 'Post It!'}]
+            if self.client.api_version >= 1.1:
+                messages = {'messages': messages}
+            self.assertEqual(messages,
+                             json.loads(req.content.decode('utf-8')))
+
+    def test_message_post_raw_bodies(self):
+        with mock.patch.object(self.transport, 'send',
+                               autospec=True) as send_method:
+            send_method.return_value = response.Response(None, '{}')
+
+            self.queue.post_raw([b'{"a": [1, 2]}', '"text"'], ttl=30)
+
+            req = send_method.call_args[0][0]
+            messages = [{'ttl': 30, 'body': {'a': [1, 2]}},
+                        {'ttl': 30, 'body': 'text'}]
+            if self.client.api_version >= 1.1:
+                messages = {'messages': messages}
+            self.assertEqual(messages,
+                             json.loads(req.content.decode('utf-8')))
+
+    def test_message_post_async(self):
+        messages = [{'ttl': 30, 'body': 'Post It!'}]
+        result = {
+            "resources": [
+                "/v1/queues/fizbit/messages/50b68a50d6f5b8c8a7c62b01"
+            ],
+            "partial": False
+        }
+        self.addCleanup(self.client.close)
+
+        with mock.patch.object(self.transport, 'send',
+                               autospec=True) as send_method:
+
+            resp = response.Response(None, json.dumps(result))
+            send_method.return_value = resp
+
+            future = self.queue.post_async(messages)
+            self.assertEqual(result, future.result())
+
+    def test_message_delete_many_async(self):
+        self.addCleanup(self.client.close)
+
+        with mock.patch.object(self.transport, 'send',
+                               autospec=True) as send_method:
+            send_method.return_value = response.Response(None, None)
+
+            future = self.queue.delete_messages_async('50b68a50d6f5b8c8a7c')
+            future.result()
+            req = send_method.call_args[0][0]
+            self.assertEqual('message_delete_many', req.operation)
+
     def test_message_list(self):
         returned = {
             'links': [{
@@ -0,0 +1,75 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from oslo_utils import importutils
+import six
+from six.moves import queue
+
+msgpack = importutils.try_import('msgpack')
+
+
+class FakeWebsocket(object):
+    """In-memory websocket replying like Zaqar's server
+
+    `handler` is called with each message sent and returns the
+    reply, or None to send none. Replies echo the request, the
+    way Zaqar does, in the format of the request. The replies
+    to `authenticate` don't, like Zaqar's.
+    """
+
+    def __init__(self, handler=None):
+        self.sent = []
+        self.handler = handler or (lambda msg: {'headers': {'status': 200}})
+        self._frames = queue.Queue()
+
+    def send(self, data):
+        if isinstance(data, six.binary_type):
+            data = data.decode('utf-8')
+        self._reply(json.loads(data))
+
+    def send_binary(self, data):
+        self._reply(msgpack.unpackb(data, raw=False), binary=True)
+
+    def _reply(self, msg, binary=False):
+        self.sent.append(msg)
+        reply = self.handler(msg)
+        if reply is not None:
+            if msg['action'] == 'authenticate':
+                reply.setdefault('request', {'action': 'authenticate',
+                                             'body': {}, 'api': 'v2',
+                                             'headers': {}})
+            reply.setdefault('request', msg)
+            self.push(reply, binary=binary)
+
+    def push(self, frame, binary=False):
+        """Sends `frame` to the client"""
+        if binary:
+            self._frames.put(msgpack.packb(frame, use_bin_type=True))
+        else:
+            self._frames.put(json.dumps(frame))
+
+    def recv(self):
+        frame = self._frames.get()
+        if frame is None:
+            raise IOError('Connection closed')
+        return frame
+
+    def close(self):
+        self._frames.put(None)
+
+    def actions(self):
+        return [msg['action'] for msg in self.sent]
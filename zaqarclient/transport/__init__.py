@@ -13,14 +13,58 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+
 import six
 from six.moves.urllib import parse
 from stevedore import driver
 
 from zaqarclient import errors as _errors
 
+# NOTE: Scanning the entry points is expensive, it
+# happens once per (namespace, name) for the whole process.
+_DRIVERS = {}
+_DRIVERS_LOCK = threading.Lock()
+
+
+def get_driver(namespace, name):
+    """Loads the plugin registered as `name` in `namespace`
+
+    Plugins are resolved once and cached for the lifetime
+    of the process. See `invalidate_drivers`.
+
+    :param namespace: Entry point namespace.
+    :type namespace: `six.string_types`
+    :param name: Entry point name.
+    :type name: `six.string_types`
+
+    :returns: The plugin, not instantiated.
+    :raises: `errors.DriverLoadFailure` if it can't be loaded.
+    """
+    key = (namespace, name)
+    try:
+        return _DRIVERS[key]
+    except KeyError:
+        pass
 
-def get_transport(transport='http', version=1, options=None):
+    with _DRIVERS_LOCK:
+        if key not in _DRIVERS:
+            try:
+                mgr = driver.DriverManager(namespace, name)
+            except RuntimeError as ex:
+                raise _errors.DriverLoadFailure(name, ex)
+            _DRIVERS[key] = mgr.driver
+    return _DRIVERS[key]
+
+
+def invalidate_drivers():
+    """Drops the plugins cached by `get_driver`."""
+    with _DRIVERS_LOCK:
+        _DRIVERS.clear()
+
+
+def get_transport(transport='http', version=1, options=None,
+                  namespace='zaqarclient.transport'):
     """Gets a transport and returns it.
 
     :param transport: Transport name.
@@ -29,26 +73,22 @@ def get_transport(transport='http', version=1, options=None):
     :param version: Version of the target transport.
         Default: 1
     :type version: int
+    :param namespace: Entry point namespace of the transport,
+        `zaqarclient.transport.async` holds the asyncio ones.
+        Default: zaqarclient.transport
+    :type namespace: `six.string_types`
 
     :returns: A `Transport` instance.
     :rtype: `zaqarclient.transport.Transport`
     """
 
     entry_point = '{0}.v{1}'.format(transport, version)
-
-    try:
-        namespace = 'zaqarclient.transport'
-        mgr = driver.DriverManager(namespace,
-                                   entry_point,
-                                   invoke_on_load=True,
-                                   invoke_args=[options])
-    except RuntimeError as ex:
-        raise _errors.DriverLoadFailure(entry_point, ex)
-
-    return mgr.driver
+    transport_cls = get_driver(namespace, entry_point)
+    return transport_cls(options)
 
 
-def get_transport_for(url_or_request, version=1, options=None):
+def get_transport_for(url_or_request, version=1, options=None,
+                      namespace='zaqarclient.transport'):
     """Gets a transport for a given url.
 
     An example transport URL might be::
@@ -60,6 +100,8 @@ def get_transport_for(url_or_request, version=1, options=None):
         `zaqarclient.transport.request.Request`
     :param version: Version of the target transport.
     :type version: int
+    :param namespace: Entry point namespace of the transport.
+    :type namespace: `six.string_types`
 
     :returns: A `Transport` instance.
     :rtype: `zaqarclient.transport.Transport`
@@ -70,4 +112,4 @@ def get_transport_for(url_or_request, version=1, options=None):
         url = url_or_request.endpoint
 
     parsed = parse.urlparse(url)
-    return get_transport(parsed.scheme, version, options)
+    return get_transport(parsed.scheme, version, options, namespace)
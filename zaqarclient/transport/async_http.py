@@ -0,0 +1,128 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""asyncio HTTP transport. Requires Python 3.5+ and aiohttp."""
+
+import asyncio
+
+from oslo_utils import importutils
+
+from zaqarclient.transport import base
+from zaqarclient.transport import errors
+from zaqarclient.transport import http
+from zaqarclient.transport import response
+
+aiohttp = importutils.try_import('aiohttp')
+
+
+class AsyncHttpTransport(base.Transport):
+    """HTTP transport whose `send` is a coroutine
+
+    The aiohttp session, and its connection pool, is created
+    on first use and lives until `close` is awaited. It
+    honours the same pool and timeout options as
+    `zaqarclient.transport.http.HttpTransport`.
+    """
+
+    # NOTE: The request building and the error
+    # handling are shared with the blocking transport.
+    _prepare = http.HttpTransport._prepare
+    _headers = http.HttpTransport._headers
+    _retry_after = http.HttpTransport._retry_after
+    _raise_for_status = http.HttpTransport._raise_for_status
+
+    def __init__(self, options):
+        super(AsyncHttpTransport, self).__init__(options)
+        if aiohttp is None:
+            raise RuntimeError('The asyncio transport requires aiohttp.')
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            options = self.options or {}
+            connector = aiohttp.TCPConnector(
+                limit=options.get('pool_maxsize', 100),
+                keepalive_timeout=options.get('keepalive_timeout', 15))
+            timeout = aiohttp.ClientTimeout(
+                connect=options.get('connect_timeout'),
+                sock_read=options.get('read_timeout'))
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=timeout)
+        return self._session
+
+    @staticmethod
+    def _params(params):
+        # NOTE: Unlike requests, aiohttp only takes
+        # strings and numbers as query values. Zaqar parses
+        # sequences encoded as '1,2,3,4'.
+        query = {}
+        for key, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = str(value).lower()
+            elif isinstance(value, (list, tuple, set)):
+                value = ','.join(value)
+            query[key] = value
+        return query
+
+    async def _send(self, url, method, request):
+        session = self._get_session()
+        resp = await session.request(method, url,
+                                     params=self._params(request.params),
+                                     headers=self._headers(request),
+                                     data=request.content,
+                                     ssl=None if request.verify else False)
+        async with resp:
+            body = await resp.read()
+        if resp.status in self.http_to_zaqar:
+            self._raise_for_status(resp.status,
+                                   body.decode('utf-8', 'replace'),
+                                   resp.headers)
+        return resp, body
+
+    async def send(self, request):
+        url, method, request = self._prepare(request)
+
+        try:
+            resp, body = await self._send(url, method, request)
+        except errors.UnauthorizedError:
+            auth_backend = request.auth_backend
+            if auth_backend is None or not auth_backend.invalidate():
+                raise
+
+            # NOTE: Getting a new token blocks,
+            # keep it out of the event loop.
+            loop = asyncio.get_event_loop()
+            request = await loop.run_in_executor(
+                None, auth_backend.authenticate, request.api, request)
+            resp, body = await self._send(url, method, request)
+
+        return response.Response(request, body,
+                                 headers=resp.headers,
+                                 status_code=resp.status,
+                                 codec=self.codec)
+
+    async def close(self):
+        """Closes the aiohttp session and its connections."""
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,171 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import random
+import threading
+
+from oslo_log import log as logging
+import requests
+
+LOG = logging.getLogger(__name__)
+
+LEAST_OUTSTANDING = 'least_outstanding'
+POWER_OF_TWO = 'power_of_two'
+
+
+class Balancer(object):
+    """Spreads requests across several endpoints
+
+    The endpoint with the fewest outstanding requests is chosen,
+    either among all the healthy endpoints or, with the
+    `power_of_two` strategy, among two of them picked at random.
+
+    Endpoints failing to accept connections are evicted until
+    `mark_up` is called for them, usually by a `HealthProber`. If
+    every endpoint is down, all of them are used.
+
+    :param endpoints: Base urls of Zaqar's instances.
+    :type endpoints: `list`
+    :param strategy: `least_outstanding` or `power_of_two`.
+    :type strategy: `six.text_type`
+    """
+
+    def __init__(self, endpoints, strategy=LEAST_OUTSTANDING):
+        if strategy not in (LEAST_OUTSTANDING, POWER_OF_TWO):
+            raise ValueError('Unknown balancing strategy: %s' % strategy)
+
+        self.endpoints = list(endpoints)
+        self.strategy = strategy
+
+        self._outstanding = dict((e, 0) for e in self.endpoints)
+        self._down = set()
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self):
+        """The endpoints requests are sent to"""
+        with self._lock:
+            return [e for e in self.endpoints if e not in self._down]
+
+    def choose(self, exclude=None):
+        """Returns the endpoint to send the next request to
+
+        :param exclude: Endpoint to avoid, if there are others.
+        :type exclude: `six.text_type`
+        """
+        candidates = self.healthy or self.endpoints
+        if exclude in candidates and len(candidates) > 1:
+            candidates = [e for e in candidates if e != exclude]
+        if self.strategy == POWER_OF_TWO and len(candidates) > 2:
+            candidates = random.sample(candidates, 2)
+        else:
+            # NOTE: Ties are broken randomly,
+            # otherwise the first endpoint would take
+            # most of the load.
+            candidates = random.sample(candidates, len(candidates))
+        return min(candidates, key=self._outstanding.get)
+
+    def mark_down(self, endpoint):
+        with self._lock:
+            if endpoint in self._outstanding and endpoint not in self._down:
+                LOG.warning('Endpoint %s is down.', endpoint)
+                self._down.add(endpoint)
+
+    def mark_up(self, endpoint):
+        with self._lock:
+            if endpoint in self._down:
+                LOG.info('Endpoint %s is back up.', endpoint)
+                self._down.discard(endpoint)
+
+    def reset_after_fork(self):
+        """Drops the state inherited from a parent process
+
+        The requests the parent had in flight aren't outstanding
+        in the child. The endpoints down are kept.
+        """
+        self._lock = threading.Lock()
+        self._outstanding = dict((e, 0) for e in self.endpoints)
+
+    @contextlib.contextmanager
+    def track(self, endpoint):
+        """Counts a request to `endpoint` as outstanding while it runs
+
+        The endpoint is evicted if the connection fails.
+        """
+        if endpoint not in self._outstanding:
+            yield
+            return
+
+        with self._lock:
+            self._outstanding[endpoint] += 1
+        try:
+            yield
+        except requests.exceptions.ConnectionError:
+            self.mark_down(endpoint)
+            raise
+        finally:
+            with self._lock:
+                self._outstanding[endpoint] -= 1
+
+
+class HealthProber(object):
+    """Checks the health of the balanced endpoints
+
+    The prober runs in a daemon thread. Every `interval` seconds
+    it calls `check` with each endpoint and marks it up or down
+    depending on the result.
+
+    :param balancer: The balancer to update.
+    :type balancer: `Balancer`
+    :param check: Callable taking an endpoint and returning
+        whether it's healthy.
+    :type check: Callable object.
+    :param interval: Seconds between two rounds of checks.
+    :type interval: float
+    """
+
+    def __init__(self, balancer, check, interval=10):
+        self._balancer = balancer
+        self._check = check
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        name='zaqarclient-health-prober')
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def probe(self):
+        for endpoint in self._balancer.endpoints:
+            try:
+                healthy = self._check(endpoint)
+            except Exception:
+                LOG.debug('Health check of %s failed.', endpoint,
+                          exc_info=True)
+                healthy = False
+
+            if healthy:
+                self._balancer.mark_up(endpoint)
+            else:
+                self._balancer.mark_down(endpoint)
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            self.probe()
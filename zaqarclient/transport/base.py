@@ -17,6 +17,7 @@ import abc
 
 import six
 
+from zaqarclient.common import codec
 from zaqarclient.transport import errors
 
 
@@ -30,6 +31,7 @@ class Transport(object):
         403: errors.ForbiddenError,
         404: errors.ResourceNotFound,
         409: errors.ConflictError,
+        429: errors.TooManyRequests,
         500: errors.InternalServerError,
         503: errors.ServiceUnavailableError
     }
@@ -37,6 +39,19 @@ class Transport(object):
     def __init__(self, options):
         self.options = options
 
+        # NOTE: Serializes the requests' content
+        # and deserializes the responses'.
+        self.codec = codec.get_codec((options or {}).get('json_codec'))
+
+        # NOTE: Used by the lower level API to send
+        # requests asynchronously. Set by the client owning
+        # this transport.
+        self.executor = None
+
+        # NOTE: Keeps track of the requests sent to
+        # each endpoint, when the client has several of them.
+        self.balancer = None
+
     @abc.abstractmethod
     def send(self, request):
         """Returns the response.
@@ -44,3 +59,18 @@ class Transport(object):
         :returns: The final response
         :rtype: `zaqarclient.transport.response.Response`
         """
+
+    def cleanup(self):
+        """Releases the resources held by this transport.
+
+        Transports are long-lived and may keep connections
+        open between requests. This method closes them.
+        """
+
+    def __enter__(self):
+        """Return self to allow usage as a context manager"""
+        return self
+
+    def __exit__(self, *exc):
+        """Call cleanup when exiting the context manager"""
+        self.cleanup()
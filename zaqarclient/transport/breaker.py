@@ -0,0 +1,157 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from oslo_log import log as logging
+import requests
+from six.moves.urllib import parse
+
+from zaqarclient import errors
+from zaqarclient.transport import errors as transport_errors
+
+LOG = logging.getLogger(__name__)
+
+_now = getattr(time, 'monotonic', time.time)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# NOTE: Errors telling the endpoint is unhealthy.
+# Client errors, like 404s, say nothing about it.
+FAILURES = (transport_errors.InternalServerError,
+            transport_errors.ServiceUnavailableError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout)
+
+
+class CircuitBreaker(object):
+    """Circuit breaker for a single endpoint
+
+    The circuit opens after `failure_threshold` consecutive
+    failures. While open, requests fail right away with
+    `CircuitOpenError`. After `reset_timeout` seconds it becomes
+    half-open and lets `half_open_requests` requests through: it
+    closes again if they succeed and re-opens if any fails.
+
+    :param endpoint: Endpoint guarded by this breaker.
+    :type endpoint: `six.text_type`
+    :param failure_threshold: Consecutive failures opening the circuit.
+    :type failure_threshold: int
+    :param reset_timeout: Seconds the circuit stays open.
+    :type reset_timeout: float
+    :param half_open_requests: Requests let through while half-open.
+    :type half_open_requests: int
+    """
+
+    def __init__(self, endpoint, failure_threshold=5, reset_timeout=30,
+                 half_open_requests=1):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_requests = half_open_requests
+
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trials = 0
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Raises `CircuitOpenError` if the request must not be sent"""
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - _now()
+                if remaining > 0:
+                    raise errors.CircuitOpenError(self.endpoint, remaining)
+                self.state = HALF_OPEN
+                self._trials = 0
+
+            if self.state == HALF_OPEN:
+                if self._trials >= self.half_open_requests:
+                    raise errors.CircuitOpenError(self.endpoint, 0)
+                self._trials += 1
+
+    def success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                LOG.info('Circuit to %s closed.', self.endpoint)
+            self.state = CLOSED
+            self._failures = 0
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+            if (self.state == HALF_OPEN or
+                    self._failures >= self.failure_threshold):
+                if self.state != OPEN:
+                    LOG.warning('Circuit to %s opened after %d failures.',
+                                self.endpoint, self._failures)
+                self.state = OPEN
+                self._opened_at = _now()
+
+    def call(self, func, *args, **kwargs):
+        """Calls `func` if the circuit allows it, recording the outcome"""
+        self.before_request()
+        try:
+            result = func(*args, **kwargs)
+        except FAILURES:
+            self.failure()
+            raise
+        except Exception:
+            # NOTE: The endpoint answered.
+            self.success()
+            raise
+        self.success()
+        return result
+
+
+class CircuitBreakers(object):
+    """Circuit breakers, one per endpoint
+
+    :param kwargs: Passed to every `CircuitBreaker`.
+    """
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_options(cls, options):
+        """Builds the breakers from the client's conf
+
+        :returns: The breakers or None if they're disabled.
+        """
+        threshold = options.get('breaker_failure_threshold')
+        if not threshold:
+            return None
+        return cls(failure_threshold=threshold,
+                   reset_timeout=options.get('breaker_reset_timeout', 30),
+                   half_open_requests=options.get(
+                       'breaker_half_open_requests', 1))
+
+    def get(self, url):
+        """Returns the breaker of the endpoint `url` belongs to"""
+        parts = parse.urlparse(url)
+        endpoint = '{0}://{1}'.format(parts.scheme, parts.netloc)
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    endpoint, CircuitBreaker(endpoint, **self._kwargs))
+        return breaker
@@ -0,0 +1,119 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Deadlines bound the time spent by a call, retries and page
+fetches included::
+
+    from zaqarclient.transport import deadline
+
+    with deadline.scope(5):
+        for msg in queue.messages().stream():
+            ...
+
+Requests prepared within the scope carry its deadline. Their socket
+timeouts are capped by the time left, they aren't retried past it and
+`zaqarclient.errors.DeadlineExceeded` is raised once it's spent.
+"""
+
+import contextlib
+import threading
+import time
+
+from zaqarclient import errors
+
+_now = getattr(time, 'monotonic', time.time)
+
+_local = threading.local()
+
+
+class Deadline(object):
+    """Point in time by which a call must complete
+
+    :param seconds: Seconds from now.
+    :type seconds: float
+    """
+
+    def __init__(self, seconds):
+        self.expires_at = _now() + seconds
+
+    def remaining(self):
+        """Seconds left, never negative"""
+        return max(0, self.expires_at - _now())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        """Raises `DeadlineExceeded` if the deadline has passed"""
+        if self.expired():
+            raise errors.DeadlineExceeded('The deadline was exceeded.')
+
+    def timeout(self, timeout=None):
+        """Caps a `requests` timeout with the time left
+
+        :param timeout: A timeout, or a (connect, read) tuple.
+        :returns: A (connect, read) tuple.
+        """
+        remaining = self.remaining()
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        return tuple(remaining if t is None else min(t, remaining)
+                     for t in timeout)
+
+
+def current():
+    """Returns the deadline of the innermost scope, if any"""
+    return getattr(_local, 'deadline', None)
+
+
+def bind(fn):
+    """Returns `fn` bound to the current deadline, if any
+
+    Threads don't share scopes, calls handed to another
+    thread keep their deadline this way.
+    """
+    bound = current()
+    if bound is None:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        with scope(deadline=bound):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+@contextlib.contextmanager
+def scope(seconds=None, deadline=None):
+    """Sets the deadline of the calls made within this scope
+
+    Nested scopes can only shorten the deadline.
+
+    :param seconds: Seconds from now.
+    :type seconds: float
+    :param deadline: Deadline to use instead of `seconds`.
+    :type deadline: `Deadline`
+    """
+    previous = current()
+    if deadline is None:
+        deadline = Deadline(seconds)
+    if previous is not None and previous.expires_at < deadline.expires_at:
+        deadline = previous
+
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = previous
@@ -24,7 +24,7 @@ from zaqarclient import errors
 
 __all__ = ['TransportError', 'ResourceNotFound', 'MalformedRequest',
            'UnauthorizedError', 'ForbiddenError', 'ServiceUnavailableError',
-           'InternalServerError', 'ConflictError']
+           'InternalServerError', 'ConflictError', 'TooManyRequests']
 
 
 class TransportError(errors.ZaqarError):
@@ -32,6 +32,10 @@ class TransportError(errors.ZaqarError):
 
     code = None
 
+    # NOTE: Seconds to wait before retrying, as
+    # sent by the server in the Retry-After header.
+    retry_after = None
+
     def __init__(self, title=None, description=None, text=None):
         msg = 'Error response from Zaqar. Code: {0}.'.format(self.code)
         if title:
@@ -104,3 +108,15 @@ class ConflictError(TransportError):
     """
 
     code = 409
+
+
+class TooManyRequests(TransportError):
+    """Indicates that the client is being rate limited
+
+    The `retry_after` attribute holds the number of seconds to
+    wait before sending another request, if the server sent it.
+
+    This error maps to HTTP's 429
+    """
+
+    code = 429
@@ -0,0 +1,146 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+from concurrent import futures
+import threading
+import time
+
+_now = getattr(time, 'monotonic', time.time)
+
+
+class Hedger(object):
+    """Sends a second copy of slow requests
+
+    If a request hasn't completed after the `percentile`th
+    percentile of the latencies observed so far, a duplicate is
+    sent and the first response wins. Until `min_samples`
+    latencies are known, `delay` is used instead.
+
+    Only operations flagged as `safe` in the API schema should
+    be hedged.
+
+    :param percentile: Percentile of the latencies to wait for.
+    :type percentile: float
+    :param delay: Seconds to wait for while the latencies are unknown.
+    :type delay: float
+    :param window: Number of latencies kept.
+    :type window: int
+    :param min_samples: Latencies needed to use the percentile.
+    :type min_samples: int
+    :param max_workers: Threads sending the hedged requests.
+    :type max_workers: int
+    """
+
+    def __init__(self, percentile=95, delay=0.1, window=100,
+                 min_samples=10, max_workers=10):
+        self.percentile = percentile
+        self.default_delay = delay
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+
+        self.hedged = 0
+        self.hedges_won = 0
+
+        self._latencies = collections.deque(maxlen=window)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_options(cls, options):
+        """Builds a hedger from the client's conf
+
+        :returns: The hedger or None if hedging is disabled.
+        """
+        percentile = options.get('hedge_percentile')
+        if not percentile:
+            return None
+        return cls(percentile=percentile,
+                   delay=options.get('hedge_delay', 0.1),
+                   max_workers=options.get('hedge_max_workers', 10))
+
+    @property
+    def delay(self):
+        """Seconds to wait for before hedging a request"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < self.min_samples:
+            return self.default_delay
+        index = int(round(self.percentile / 100.0 * (len(latencies) - 1)))
+        return latencies[index]
+
+    def record(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = futures.ThreadPoolExecutor(
+                        self.max_workers)
+        return self._executor
+
+    def call(self, primary, hedge):
+        """Calls `primary` and, if it's slow, `hedge` too
+
+        :param primary: Callable sending the request.
+        :param hedge: Callable sending the duplicate.
+
+        :returns: The result of the first call to succeed.
+        """
+        executor = self._get_executor()
+        start = _now()
+
+        def record(future):
+            if not future.cancelled() and future.exception() is None:
+                self.record(_now() - start)
+
+        first = executor.submit(primary)
+        first.add_done_callback(record)
+
+        done, pending = futures.wait([first], timeout=self.delay)
+        if done:
+            return first.result()
+
+        with self._lock:
+            self.hedged += 1
+        second = executor.submit(hedge)
+
+        # NOTE: Fail only if both calls do,
+        # with the error of the last one.
+        pending = set([first, second])
+        while True:
+            done, pending = futures.wait(
+                pending, return_when=futures.FIRST_COMPLETED)
+            succeeded = [f for f in done if f.exception() is None]
+            if not succeeded and pending:
+                continue
+
+            # NOTE: The loser can't be interrupted once
+            # it's been sent, its response is ignored.
+            for loser in pending:
+                loser.cancel()
+
+            winner = (succeeded or list(done))[0]
+            if winner is second:
+                with self._lock:
+                    self.hedges_won += 1
+            return winner.result()
+
+    def shutdown(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
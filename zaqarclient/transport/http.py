@@ -13,14 +13,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import calendar
 from distutils import version
+from email import utils as email_utils
 import json
+import time
 
 from oslo_utils import importutils
+import requests
 
 from zaqarclient.common import http
+from zaqarclient import errors as zaqar_errors
 from zaqarclient.transport import base
+from zaqarclient.transport import breaker
+from zaqarclient.transport import errors
+from zaqarclient.transport import hedging
+from zaqarclient.transport import ratelimit
 from zaqarclient.transport import response
+from zaqarclient.transport import retry
 
 osprofiler_web = importutils.try_import("osprofiler.web")
 
@@ -29,7 +39,14 @@ class HttpTransport(base.Transport):
 
     def __init__(self, options):
         super(HttpTransport, self).__init__(options)
-        self.client = http.Client()
+        options = options or {}
+        self.client = http.Client(**dict((k, options[k])
+                                         for k in http.OPTIONS
+                                         if k in options))
+        self.retry_policy = retry.RetryPolicy.from_options(options)
+        self.rate_limiter = ratelimit.RateLimiter.from_options(options)
+        self.breakers = breaker.CircuitBreakers.from_options(options)
+        self.hedger = hedging.Hedger.from_options(options)
 
     def _prepare(self, request):
         if not request.api:
@@ -72,9 +89,12 @@ class HttpTransport(base.Transport):
                                    ref.format(**ref_params))
         return url, schema.get('method', 'GET'), request
 
-    def send(self, request):
-        url, method, request = self._prepare(request)
+    def cleanup(self):
+        self.client.close()
+        if self.hedger is not None:
+            self.hedger.shutdown()
 
+    def _headers(self, request):
         # NOTE(flape87): Do not modify
         # request's headers directly.
         headers = request.headers.copy()
@@ -88,19 +108,26 @@ class HttpTransport(base.Transport):
 
         if osprofiler_web:
             headers.update(osprofiler_web.get_trace_id_headers())
+        return headers
 
-        resp = self.client.request(method,
-                                   url=url,
-                                   params=request.params,
-                                   headers=headers,
-                                   data=request.content,
-                                   verify=request.verify,
-                                   cert=request.cert)
+    @staticmethod
+    def _retry_after(headers):
+        value = (headers or {}).get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0, int(value))
+        except ValueError:
+            date = email_utils.parsedate(value)
+            if date is None:
+                return None
+            return max(0, calendar.timegm(date) - int(time.time()))
 
-        if resp.status_code in self.http_to_zaqar:
+    def _raise_for_status(self, status_code, text, headers=None):
+        if status_code in self.http_to_zaqar:
             kwargs = {}
             try:
-                error_body = json.loads(resp.text)
+                error_body = json.loads(text)
                 kwargs['title'] = error_body['title']
                 kwargs['description'] = error_body['description']
             except Exception:
@@ -110,11 +137,127 @@ class HttpTransport(base.Transport):
                 # Note(Eva-i): most of the error responses from Zaqar have
                 # dict with title and description in their bodies. If it's not
                 # the case, let's just show body text.
-                kwargs['text'] = resp.text
-            raise self.http_to_zaqar[resp.status_code](**kwargs)
+                kwargs['text'] = text
+            error = self.http_to_zaqar[status_code](**kwargs)
+            error.retry_after = self._retry_after(headers)
+            raise error
+
+    def _send(self, url, method, request, queue_name=None):
+        if self.breakers is not None:
+            # NOTE: Fail fast, without waiting for the
+            # rate limiter, while the endpoint is unavailable.
+            return self.breakers.get(url).call(self._send_request, url,
+                                               method, request, queue_name)
+        return self._send_request(url, method, request, queue_name)
+
+    def _send_request(self, url, method, request, queue_name=None):
+        deadline = request.deadline
+        if deadline is not None:
+            deadline.check()
+
+        limiter = self.rate_limiter
+        if limiter is not None:
+            limiter.acquire(queue_name, deadline)
+
+        kwargs = {}
+        if deadline is not None:
+            kwargs['timeout'] = deadline.timeout(self.client.timeout)
+
+        try:
+            resp = self.client.request(method,
+                                       url=url,
+                                       params=request.params,
+                                       headers=self._headers(request),
+                                       data=request.content,
+                                       verify=request.verify,
+                                       cert=request.cert,
+                                       **kwargs)
+        except requests.exceptions.Timeout:
+            if deadline is not None and deadline.expired():
+                raise zaqar_errors.DeadlineExceeded(
+                    'The deadline was exceeded waiting for %s.' % url)
+            raise
+        if resp.status_code in self.http_to_zaqar:
+            try:
+                self._raise_for_status(resp.status_code, resp.text,
+                                       resp.headers)
+            except errors.TooManyRequests as ex:
+                if limiter is not None:
+                    limiter.throttled(queue_name, ex.retry_after)
+                raise
+
+        if limiter is not None:
+            limiter.succeeded(queue_name)
+        return resp
+
+    def send(self, request):
+        if self.balancer is None:
+            return self._send_with_retries(request)
+
+        with self.balancer.track(request.endpoint):
+            return self._send_with_retries(request)
+
+    def _send_with_retries(self, request):
+        # NOTE: The queue name is consumed by
+        # _prepare when it's part of the URL.
+        queue_name = request.params.get('queue_name')
+        url, method, request = self._prepare(request)
+
+        send = self._send_once
+        if self.hedger is not None and self._is_safe(request):
+            send = self._send_hedged
+
+        try:
+            resp = send(url, method, request, queue_name)
+        except errors.UnauthorizedError:
+            # NOTE: The token may have been revoked or
+            # expired earlier than expected. Get a new one, if the
+            # auth backend can, and give it another try.
+            auth_backend = request.auth_backend
+            if auth_backend is None or not auth_backend.invalidate():
+                raise
+            request = auth_backend.authenticate(request.api, request)
+            resp = send(url, method, request, queue_name)
 
         # NOTE(flaper87): This reads the whole content
-        # and will consume any attempt of streaming.
-        return response.Response(request, resp.text,
+        # and will consume any attempt of streaming. The
+        # bytes are kept as is, decoding them is left to
+        # the response if it's ever needed.
+        return response.Response(request, resp.content,
                                  headers=resp.headers,
-                                 status_code=resp.status_code)
+                                 status_code=resp.status_code,
+                                 codec=self.codec)
+
+    @staticmethod
+    def _is_safe(request):
+        if not request.api or not request.operation:
+            return False
+        return request.api.get_schema(request.operation).get('safe', False)
+
+    def _send_once(self, url, method, request, queue_name=None):
+        return self.retry_policy.call(method, self._send,
+                                      url, method, request, queue_name,
+                                      deadline=request.deadline)
+
+    def _send_hedged(self, url, method, request, queue_name=None):
+        endpoint = request.endpoint.rstrip('/')
+        hedge_endpoint = endpoint
+        if self.balancer is not None:
+            hedge_endpoint = self.balancer.choose(
+                exclude=request.endpoint).rstrip('/')
+
+        def primary():
+            return self._send_once(url, method, request, queue_name)
+
+        def hedge():
+            # NOTE: With a single endpoint, the duplicate
+            # goes to the same one over another pooled connection.
+            hedge_url = hedge_endpoint + url[len(endpoint):]
+            if self.balancer is None:
+                return self._send_once(hedge_url, method, request,
+                                       queue_name)
+            with self.balancer.track(hedge_endpoint):
+                return self._send_once(hedge_url, method, request,
+                                       queue_name)
+
+        return self.hedger.call(primary, hedge)
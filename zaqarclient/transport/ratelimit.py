@@ -0,0 +1,171 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from zaqarclient import errors
+
+# NOTE: Not affected by changes of the system clock,
+# when available.
+_now = getattr(time, 'monotonic', time.time)
+
+
+class TokenBucket(object):
+    """Paces calls to `rate` per second, with bursts of `burst`
+
+    The rate adapts to the server: it's halved whenever a
+    request is throttled and grows back, step by step, as
+    requests succeed.
+
+    :param rate: Calls allowed per second.
+    :type rate: float
+    :param burst: Calls that may be made at once. Default: `rate`
+    :type burst: float
+    """
+
+    # NOTE: The rate is never decreased below this
+    # ratio of the configured one.
+    min_ratio = 0.05
+
+    def __init__(self, rate, burst=None):
+        self.max_rate = float(rate)
+        self.rate = self.max_rate
+        self.burst = float(burst or max(1, rate))
+
+        self._tokens = self.burst
+        self._last = _now()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = _now()
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self):
+        """Takes a token and returns the seconds to wait before using it"""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def release(self):
+        """Gives back a token reserved but not used"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def throttled(self, retry_after=None):
+        """Lowers the rate after the server throttled a request
+
+        :param retry_after: Seconds to wait before the next call.
+        :type retry_after: float
+        """
+        with self._lock:
+            self._refill()
+            self.rate = max(self.max_rate * self.min_ratio, self.rate / 2)
+            if retry_after:
+                self._tokens = min(self._tokens, -retry_after * self.rate)
+
+    def succeeded(self):
+        """Raises the rate back after a successful request"""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate,
+                                self.rate + self.max_rate * self.min_ratio)
+
+
+class RateLimiter(object):
+    """Client side rate limiting
+
+    Requests are paced by a bucket shared by all of them and,
+    for the requests addressed to a queue, by the bucket of
+    that queue.
+
+    :param rate: Requests per second allowed for the client.
+    :type rate: float
+    :param burst: Burst allowed for the client.
+    :type burst: float
+    :param queue_rate: Requests per second allowed for each queue.
+    :type queue_rate: float
+    :param queue_rates: Requests per second allowed for specific
+        queues, by name. Takes precedence over `queue_rate`.
+    :type queue_rates: `dict`
+    """
+
+    def __init__(self, rate=None, burst=None, queue_rate=None,
+                 queue_rates=None):
+        self._bucket = rate and TokenBucket(rate, burst)
+        self._queue_rate = queue_rate
+        self._queue_rates = queue_rates or {}
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_options(cls, options):
+        """Builds a limiter from the client's conf
+
+        :returns: The limiter or None if no limit is set.
+        """
+        limiter = cls(options.get('rate_limit'),
+                      options.get('rate_limit_burst'),
+                      options.get('queue_rate_limit'),
+                      options.get('queue_rate_limits'))
+        if limiter._bucket or limiter._queue_rate or limiter._queue_rates:
+            return limiter
+        return None
+
+    def _buckets(self, queue_name):
+        buckets = []
+        if self._bucket:
+            buckets.append(self._bucket)
+
+        rate = self._queue_rates.get(queue_name, self._queue_rate)
+        if queue_name is not None and rate:
+            bucket = self._queues.get(queue_name)
+            if bucket is None:
+                with self._lock:
+                    bucket = self._queues.setdefault(queue_name,
+                                                     TokenBucket(rate))
+            buckets.append(bucket)
+        return buckets
+
+    def acquire(self, queue_name=None, deadline=None):
+        """Blocks until a request to `queue_name` may be sent
+
+        :param deadline: The deadline of the request, it's never
+            waited past.
+        :type deadline: `zaqarclient.transport.deadline.Deadline`
+        """
+        buckets = self._buckets(queue_name)
+        delay = max([bucket.reserve() for bucket in buckets] or [0])
+        if deadline is not None and delay > deadline.remaining():
+            for bucket in buckets:
+                bucket.release()
+            raise errors.DeadlineExceeded(
+                'The deadline would be exceeded waiting for the '
+                'rate limiter.')
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttled(self, queue_name=None, retry_after=None):
+        for bucket in self._buckets(queue_name):
+            bucket.throttled(retry_after)
+
+    def succeeded(self, queue_name=None):
+        for bucket in self._buckets(queue_name):
+            bucket.succeeded()
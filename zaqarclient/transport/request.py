@@ -15,13 +15,14 @@
 # limitations under the License.
 
 import json
-from stevedore import driver
 
 from zaqarclient import auth
-from zaqarclient import errors
+from zaqarclient import transport
+from zaqarclient.transport import deadline
 
 
-def prepare_request(auth_opts=None, data=None, **kwargs):
+def prepare_request(auth_opts=None, data=None, auth_backend=None,
+                    **kwargs):
     """Prepares a request
 
     This method takes care of authentication
@@ -35,6 +36,10 @@ def prepare_request(auth_opts=None, data=None, **kwargs):
     :param data: Optional data to send along with the
         request. If data is not None, it'll be serialized.
     :type data: Any primitive type that is json-serializable.
+    :param auth_backend: Auth backend to use. If not passed, a new one
+        will be loaded from `auth_opts`. Reusing the same backend lets
+        it cache the authentication state across requests.
+    :type auth_backend: `zaqarclient.auth.base.AuthBackend`
     :param kwargs: Anything accepted by `Request`
 
     :returns: A `Request` instance ready to be sent.
@@ -42,8 +47,11 @@ def prepare_request(auth_opts=None, data=None, **kwargs):
     """
 
     req = Request(**kwargs)
-    auth_backend = auth.get_backend(**(auth_opts or {}))
+    if auth_backend is None:
+        auth_backend = auth.get_backend(**(auth_opts or {}))
     req = auth_backend.authenticate(kwargs.get('api'), req)
+    req.auth_backend = auth_backend
+    req.deadline = deadline.current()
 
     option = auth_opts.get('options', {})
     # TODO(wangxiyuan): To keep backwards compatibility, we leave
@@ -117,17 +125,20 @@ class Request(object):
         self.cert = cert
         self.session = session
 
+        # NOTE: Set by `prepare_request`. Transports use
+        # it to re-authenticate the request if the credentials were
+        # rejected by the server.
+        self.auth_backend = None
+
+        # NOTE: The `zaqarclient.transport.deadline.Deadline`
+        # this request must complete by, if any.
+        self.deadline = None
+
     @property
     def api(self):
         if not self._api and self._api_mod:
-            try:
-                namespace = 'zaqarclient.api'
-                mgr = driver.DriverManager(namespace,
-                                           self._api_mod,
-                                           invoke_on_load=True)
-                self._api = mgr.driver
-            except RuntimeError as ex:
-                raise errors.DriverLoadFailure(self._api_mod, ex)
+            api_cls = transport.get_driver('zaqarclient.api', self._api_mod)
+            self._api = api_cls()
         return self._api
 
     def validate(self):
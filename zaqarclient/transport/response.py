@@ -13,7 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
+import six
+
+from zaqarclient.common import codec as json_codec
 
 
 class Response(object):
@@ -23,32 +25,75 @@ class Response(object):
     will return this to the higher level API which will then build
     an object out of it.
 
+    The content may be given as bytes, as read from the wire. It's
+    deserialized straight from them and only decoded to text if
+    `content` is used.
+
     :param request: The request sent to the server.
     :type: `zaqarclient.transport.request.Request`
     :param content: Response's content
-    :type: `six.string_types`
+    :type: `six.string_types` or `six.binary_type`
     :param headers: Optional headers returned in the response.
     :type: dict
     :param status_code: Optional status_code returned in the response.
     :type: `int`
+    :param deserialized: The content, already deserialized by the
+        transport. `content` is then only serialized if it's used.
+    :type: Any json-serializable type.
+    :param codec: Codec deserializing the content. Default: The
+        fastest one installed.
+    :type: `zaqarclient.common.codec.JSONCodec`
     """
 
-    __slots__ = ('request', 'content', 'headers', 'status_code',
-                 '_deserialized')
+    __slots__ = ('request', '_raw', '_content', 'headers', 'status_code',
+                 '_deserialized', '_codec')
 
-    def __init__(self, request, content, headers=None, status_code=None):
+    def __init__(self, request, content, headers=None, status_code=None,
+                 deserialized=None, codec=None):
         self.request = request
-        self.content = content
         self.headers = headers or {}
         self.status_code = status_code
 
+        self._raw = None
+        self._content = content
+        if isinstance(content, six.binary_type):
+            self._raw = content
+            self._content = None
+
+        self._deserialized = deserialized
+        self._codec = codec or json_codec.get_codec()
+
+    @property
+    def raw(self):
+        """The content as bytes"""
+        if self._raw is None:
+            content = self.content
+            if content is not None:
+                self._raw = content.encode('utf-8')
+        return self._raw
+
+    @property
+    def content(self):
+        """The content as text"""
+        if self._content is None:
+            if self._raw is not None:
+                self._content = self._raw.decode('utf-8')
+            elif self._deserialized is not None:
+                self._content = self._codec.dumps(self._deserialized)
+        return self._content
+
+    @content.setter
+    def content(self, content):
+        self._raw = None
+        self._content = content
         self._deserialized = None
 
     @property
     def deserialized_content(self):
         try:
-            if not self._deserialized and self.content:
-                self._deserialized = json.loads(self.content)
+            data = self._raw if self._raw is not None else self._content
+            if not self._deserialized and data:
+                self._deserialized = self._codec.loads(data)
             return self._deserialized
         except ValueError as ex:
             print("Response is not a JSON object.", ex)
@@ -0,0 +1,202 @@
+# Copyright (c) 2013 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import random
+import threading
+import time
+
+from oslo_log import log as logging
+import requests
+from requests.packages.urllib3 import exceptions as urllib3_exc
+
+from zaqarclient.transport import errors
+
+LOG = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+
+class RetryBudget(object):
+    """Token bucket bounding retries to a ratio of the requests
+
+    Every request deposits `ratio` tokens, up to `burst`, and every
+    retry withdraws one. Once the bucket is empty no more retries
+    are attempted, so an outage doesn't multiply the load sent to
+    the server.
+
+    :param ratio: Retries allowed per request.
+    :type ratio: float
+    :param burst: Maximum number of tokens in the bucket. It
+        starts full.
+    :type burst: float
+    """
+
+    def __init__(self, ratio=0.2, burst=10):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = float(burst)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def withdraw(self):
+        """Takes a token, if any. Returns whether it succeeded."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy(object):
+    """Retries failed requests with backoff
+
+    Server errors - 500 and 503 -, throttled requests - 429 -
+    and connection errors are retried. Requests whose method is
+    not idempotent are only retried when they are known not to
+    have been processed by the server, that is, when they were
+    throttled or the connection couldn't be established, unless
+    `attempts_non_idempotent` says otherwise.
+
+    Delays between attempts follow the "decorrelated jitter"
+    backoff, capped by `max_delay`. A `Retry-After` sent by the
+    server takes precedence.
+
+    :param attempts: Maximum attempts for idempotent requests.
+    :type attempts: int
+    :param attempts_non_idempotent: Maximum attempts for the
+        other requests, i.e. POST and PATCH.
+    :type attempts_non_idempotent: int
+    :param base_delay: Minimum delay between attempts, in seconds.
+    :type base_delay: float
+    :param max_delay: Maximum delay between attempts, in seconds.
+    :type max_delay: float
+    :param budget: Budget shared by all the retries.
+    :type budget: `RetryBudget`
+    """
+
+    retriable_errors = (errors.InternalServerError,
+                        errors.ServiceUnavailableError,
+                        errors.TooManyRequests,
+                        requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout)
+
+    def __init__(self, attempts=3, attempts_non_idempotent=1,
+                 base_delay=0.1, max_delay=10, budget=None):
+        self.attempts = attempts
+        self.attempts_non_idempotent = attempts_non_idempotent
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+
+        self._metrics = collections.defaultdict(int)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_options(cls, options):
+        """Builds a policy from the client's conf"""
+        budget = RetryBudget(options.get('retry_budget_ratio', 0.2),
+                             options.get('retry_budget_burst', 10))
+        return cls(attempts=options.get('retry_attempts', 1),
+                   attempts_non_idempotent=options.get(
+                       'retry_attempts_non_idempotent', 1),
+                   base_delay=options.get('retry_base_delay', 0.1),
+                   max_delay=options.get('retry_max_delay', 10),
+                   budget=budget)
+
+    @property
+    def metrics(self):
+        """Counters of this policy
+
+        - requests: Requests sent, without the retries.
+        - retries: Retries sent.
+        - failures: Requests that failed after all the retries.
+        - budget_exhausted: Retries given up on because of the budget.
+        - deadline_exceeded: Retries given up on because of the deadline.
+        - retries.<error>: Retries per error class.
+        """
+        with self._lock:
+            return dict(self._metrics)
+
+    def _count(self, key):
+        with self._lock:
+            self._metrics[key] += 1
+
+    @staticmethod
+    def _not_sent(ex):
+        # NOTE: Only throttled requests and failures to
+        # connect guarantee the request wasn't processed.
+        if isinstance(ex, (errors.TooManyRequests,
+                           requests.exceptions.ConnectTimeout)):
+            return True
+        reason = getattr(ex.args[0] if ex.args else None, 'reason', None)
+        return isinstance(reason, urllib3_exc.NewConnectionError)
+
+    def _max_attempts(self, method, ex):
+        if method.upper() in IDEMPOTENT_METHODS or self._not_sent(ex):
+            return self.attempts
+        return self.attempts_non_idempotent
+
+    def _delay(self, previous, ex):
+        retry_after = getattr(ex, 'retry_after', None)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+
+        return min(self.max_delay,
+                   random.uniform(self.base_delay, previous * 3))
+
+    def call(self, method, func, *args, **kwargs):
+        """Calls `func` retrying it as this policy says
+
+        :param method: HTTP method of the request sent by `func`.
+        :type method: `six.text_type`
+        :param deadline: No retry is attempted if it would
+            start after this deadline.
+        :type deadline: `zaqarclient.transport.deadline.Deadline`
+        """
+        deadline = kwargs.pop('deadline', None)
+        self._count('requests')
+        self.budget.deposit()
+
+        attempt = 1
+        delay = self.base_delay
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except self.retriable_errors as ex:
+                if attempt >= self._max_attempts(method, ex):
+                    self._count('failures')
+                    raise
+
+                if not self.budget.withdraw():
+                    self._count('budget_exhausted')
+                    self._count('failures')
+                    raise
+
+                delay = self._delay(delay, ex)
+                if deadline is not None and delay >= deadline.remaining():
+                    self._count('deadline_exceeded')
+                    self._count('failures')
+                    raise
+
+                LOG.debug('Retrying request in %.2fs after %d attempt(s) '
+                          'failed: %s', delay, attempt, ex)
+                self._count('retries')
+                self._count('retries.%s' % type(ex).__name__)
+                time.sleep(delay)
+                attempt += 1
@@ -12,30 +12,222 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
+from concurrent import futures
+import copy
 import json
+import random
+import socket
+import threading
+import time
 
 from oslo_log import log as logging
 from oslo_utils import importutils
 from oslo_utils import uuidutils
+import six
+from six.moves import queue
 
+from zaqarclient.common import codec
+from zaqarclient import errors
 from zaqarclient.transport import base
+from zaqarclient.transport import errors as transport_errors
 from zaqarclient.transport import request
 from zaqarclient.transport import response
+from zaqarclient.transport import retry
 
+asyncio = importutils.try_import('asyncio')
 websocket = importutils.try_import('websocket')
 
 LOG = logging.getLogger(__name__)
 
+# NOTE: Py2K support, async iteration is Python 3 only.
+StopAsyncIteration = getattr(six.moves.builtins, 'StopAsyncIteration',
+                             StopIteration)
+
+# NOTE: Zaqar echoes the request, headers included,
+# in its replies. This header pairs them.
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+# NOTE: The reply to `authenticate` doesn't echo the
+# request headers, Zaqar builds it from a new request.
+# Authentications are paired by their action instead.
+AUTHENTICATE = 'authenticate'
+
+# NOTE: Zaqar's websocket API names a few actions
+# and parameters differently from its HTTP API.
+ACTIONS = {
+    'health': 'check_node_health',
+    'homedoc': 'get_home_doc',
+    'ping': 'ping_node',
+    'queue_exists': 'queue_get',
+}
+
+PARAMS = {
+    'ids': 'message_ids',
+}
+
+# NOTE: Operations whose content is sent as a field
+# of the body rather than merged with the parameters.
+CONTENT_FIELDS = {
+    'queue_create': 'metadata',
+    'queue_set_metadata': 'metadata',
+}
+
+_CLOSED = object()
+
+# NOTE: The errors meaning the connection was lost.
+CONNECTION_ERRORS = (socket.error, IOError, OSError)
+if websocket is not None:
+    CONNECTION_ERRORS += (websocket.WebSocketException,)
+
+
+class _Connection(object):
+    """A websocket and the requests waiting for a reply on it"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.error = None
+        self.closed = False
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+    def register(self, request_id):
+        """Returns the future of the reply to `request_id`"""
+        future = futures.Future()
+        with self._lock:
+            if self.error is not None:
+                raise self.error
+            self._pending[request_id] = future
+        return future
+
+    def unregister(self, request_id):
+        with self._lock:
+            self._pending.pop(request_id, None)
+
+    def resolve(self, request_id, frame):
+        """Hands `frame` to the request it replies to, if any"""
+        with self._lock:
+            future = self._pending.pop(request_id, None)
+        if future is None:
+            return False
+        future.set_result(frame)
+        return True
+
+    def fail(self, error):
+        """Fails the pending requests, the connection is unusable"""
+        with self._lock:
+            self.error = error
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(error)
+
+    def send(self, frame, binary=False):
+        # NOTE: Frames written concurrently
+        # would be interleaved.
+        with self._send_lock:
+            if binary:
+                self.ws.send_binary(frame)
+            else:
+                self.ws.send(frame)
+
+    def close(self):
+        self.closed = True
+        self.ws.close()
+
+
+class Listener(object):
+    """Notifications pushed by the server for a queue
+
+    Iterating over a listener blocks until the next notification
+    arrives, `async for` can be used in coroutines. Iteration stops
+    once the listener is closed.
+
+    The subscription is created again whenever the transport
+    reconnects.
+
+    :param transport: The transport the notifications come from.
+    :type transport: `WebsocketTransport`
+    :param request: The `subscription_create` request.
+    :type request: `zaqarclient.transport.request.Request`
+    :param queue_name: The queue listened to.
+    :type queue_name: `six.text_type`
+    """
+
+    def __init__(self, transport, request, queue_name):
+        self.queue_name = queue_name
+        self.subscription_id = None
+        self.closed = False
+
+        self._transport = transport
+        self._request = request
+        self._notifications = queue.Queue()
+
+    def get(self, timeout=None):
+        """Returns the next notification
+
+        :param timeout: Seconds to wait for it. Default: forever
+        :type timeout: float
+
+        :raises: `StopIteration` once the listener is closed,
+            `six.moves.queue.Empty` after `timeout` seconds.
+        """
+        notification = self._notifications.get(timeout=timeout)
+        if notification is _CLOSED:
+            # NOTE: Let other consumers stop too.
+            self._notifications.put(_CLOSED)
+            raise StopIteration
+        if isinstance(notification, Exception):
+            raise notification
+        return notification
+
+    def push(self, notification):
+        self._notifications.put(notification)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.get()
+
+    # NOTE: Py2K support
+    next = __next__
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(None, self._anext)
+
+    def _anext(self):
+        try:
+            return self.get()
+        except StopIteration:
+            raise StopAsyncIteration
+
+    def close(self):
+        """Deletes the subscription and stops the iteration"""
+        if self.closed:
+            return
+        self.closed = True
+        self._transport._unsubscribe(self)
+        self.push(_CLOSED)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 class WebsocketTransport(base.Transport):
 
     """Zaqar websocket transport.
 
-    *NOTE:* Zaqar's websocket interface does not yet appear to work
-    well with parameters. Until it does the websocket transport may not
-    integrate with all of zaqarclients higherlevel request. Even so...
-    websockets today is still quite usable and use of the transport
-    via lower level API's in zaqarclient work quite nicely. Example:
+    The parameters of the requests are sent as fields of the action
+    body, as Zaqar's websocket API expects them, which lets the
+    higher level client run over a single persistent connection::
 
        conf = {
             'auth_opts': {
@@ -47,6 +239,11 @@ class WebsocketTransport(base.Transport):
             }
         }
 
+        cli = client.Client('ws://172.19.0.3:9000', version=2, conf=conf)
+        cli.queue('foo').post({'body': 'hello', 'ttl': 60})
+
+    The transport can also be used directly::
+
         endpoint = 'ws://172.19.0.3:9000'
 
         with transport.get_transport_for(endpoint, options=conf) as ws:
@@ -54,6 +251,26 @@ class WebsocketTransport(base.Transport):
                                   content=json.dumps({'queue_name': 'foo'}))
             resp = ws.send(req)
 
+    Requests are tagged with an id and many of them can be in
+    flight on the connection. A reader thread hands the replies
+    to the requests waiting for them. Notifications go to the
+    `Listener` of their queue, see `subscribe`. The other frames
+    are returned by `recv`.
+
+    Lost connections are opened again, with a jittered backoff,
+    and authenticated with a fresh token from the auth backend.
+    The idempotent requests in flight are sent again, the others
+    fail right away. Options:
+
+        - ws_reconnect_attempts: Attempts to reconnect. Default: 5
+        - ws_reconnect_delay: Seconds to wait for before the first
+        attempt. Default: 0.5
+        - ws_reconnect_max_delay: Max seconds between two attempts.
+        Default: 30
+
+    Frames are JSON text unless the `ws_codec` option is set to
+    `msgpack`, which sends binary MessagePack frames instead. JSON
+    is used if msgpack isn't installed.
     """
     def __init__(self, options):
         super(WebsocketTransport, self).__init__(options)
@@ -62,9 +279,29 @@ class WebsocketTransport(base.Transport):
         # "os_project_id" here. Remove it in the next release.
         self._project_id = option.get('os_project_id',
                                       option.get('project_id'))
-        self._token = options['auth_opts']['options']['os_auth_token']
+        self._token = option.get('os_auth_token')
         self._websocket_client_id = None
-        self._ws = None
+        self._frame_codec = codec.get_frame_codec(options.get('ws_codec'),
+                                                  self.codec)
+
+        self._reconnect_attempts = options.get('ws_reconnect_attempts', 5)
+        self._reconnect_delay = options.get('ws_reconnect_delay', 0.5)
+        self._reconnect_max_delay = options.get('ws_reconnect_max_delay',
+                                                30)
+
+        # NOTE: Set from the requests sent. Gives
+        # a fresh token when reconnecting.
+        self._auth_backend = None
+        self._endpoint = None
+        self._conn = None
+        self._inbox = queue.Queue()
+        self._lock = threading.Lock()
+
+        # NOTE: Listeners by queue name. Guarded by its
+        # own lock, the reader dispatches notifications while
+        # `_lock` is held to connect.
+        self._listeners = {}
+        self._listeners_lock = threading.Lock()
 
     def _init_client(self, endpoint):
         """Initialize a websocket transport client.
@@ -76,38 +313,162 @@ class WebsocketTransport(base.Transport):
         self._websocket_client_id = uuidutils.generate_uuid()
 
         LOG.debug('Instantiating messaging websocket client: %s', endpoint)
-        self._ws = self._create_connection(endpoint)
+        conn = _Connection(self._create_connection(endpoint))
+
+        reader = threading.Thread(target=self._read, args=(conn,),
+                                  name='zaqarclient-ws-reader')
+        reader.daemon = True
+        reader.start()
 
-        auth_req = request.Request(endpoint, 'authenticate',
-                                   headers={'X-Auth-Token': self._token})
-        self.send(auth_req)
+        auth_req = request.Request(endpoint, AUTHENTICATE,
+                                   headers={'X-Auth-Token':
+                                            self._refresh_token(endpoint)})
+        try:
+            self._call(conn, auth_req)
+        except transport_errors.UnauthorizedError:
+            conn.close()
+            if self._auth_backend is not None:
+                self._auth_backend.invalidate()
+            raise
+        except Exception:
+            conn.close()
+            raise
+        self._endpoint = endpoint
+        self._conn = conn
+
+        for listener in self._all_listeners():
+            try:
+                self._subscribe(conn, listener)
+            except Exception:
+                LOG.warning('Could not subscribe again to %s.',
+                            listener.queue_name, exc_info=True)
 
     def _create_connection(self, endpoint):
         return websocket.create_connection(endpoint)
 
+    def _refresh_token(self, endpoint):
+        """Returns the token to authenticate the connection with"""
+        backend = self._auth_backend
+        if backend is None:
+            return self._token
+
+        req = request.Request(endpoint)
+        try:
+            backend.authenticate(None, req)
+        except Exception:
+            LOG.warning('Could not refresh the token, reusing it.',
+                        exc_info=True)
+        else:
+            self._token = req.headers.get('X-Auth-Token', self._token)
+        return self._token
+
+    def _get_connection(self, endpoint):
+        # NOTE: Held while connecting, requests
+        # wait for the connection to be authenticated.
+        with self._lock:
+            conn = self._conn
+            if conn is None or conn.error is not None:
+                self._connect(endpoint, reconnect=conn is not None)
+            return self._conn
+
+    def _connect(self, endpoint, reconnect=False):
+        """Connects, retrying with backoff if it's a reconnection"""
+        attempts = self._reconnect_attempts if reconnect else 1
+        delay = self._reconnect_delay
+        for attempt in range(1, attempts + 1):
+            try:
+                self._init_client(endpoint)
+                return
+            except Exception as ex:
+                if attempt >= attempts:
+                    raise
+
+                # NOTE: Decorrelated jitter, reconnecting
+                # clients don't hit the server all at once.
+                delay = min(self._reconnect_max_delay,
+                            random.uniform(self._reconnect_delay,
+                                           delay * 3))
+                LOG.warning('Could not reconnect to %(endpoint)s: %(ex)s. '
+                            'Retrying in %(delay).2f seconds.',
+                            {'endpoint': endpoint, 'ex': ex,
+                             'delay': delay})
+                time.sleep(delay)
+
     def send(self, request):
-        if not self._ws:
-            self._init_client(request.endpoint)
-
-        headers = request.headers.copy()
-        headers.update({
-            'Client-ID': self._websocket_client_id,
-            'X-Project-ID': self._project_id
-        })
-
-        msg = {'action': request.operation, 'headers': headers}
-        if request.content:
-            msg['body'] = json.loads(request.content)
-        # NOTE(dprince): Zaqar websockets do not yet seem to support params?!
-        # Users of this protocol will need to send everything in the body.
-        if request.params:
-            LOG.warning('Websocket transport does not yet support params.')
-        self._ws.send(json.dumps(msg))
-        ret = self.recv()
-
-        resp = response.Response(request, json.dumps(ret.get('body', '')),
+        if request.auth_backend is not None:
+            self._auth_backend = request.auth_backend
+        conn = self._get_connection(request.endpoint)
+        return self._call(conn, request)
+
+    @staticmethod
+    def _is_idempotent(request):
+        api = request.api
+        if api is None or not api.is_supported(request.operation):
+            return False
+        method = api.get_schema(request.operation).get('method')
+        return method in retry.IDEMPOTENT_METHODS
+
+    def _call(self, conn, request):
+        """Sends `request` on `conn` and waits for the reply
+
+        If the connection is lost, idempotent requests are sent
+        again once reconnected. The others fail right away.
+        """
+        resend = self._is_idempotent(request)
+        attempt = 0
+        while True:
+            request_id = uuidutils.generate_uuid()
+            if request.operation == AUTHENTICATE:
+                request_id = AUTHENTICATE
+
+            headers = request.headers.copy()
+            headers.update({
+                'Client-ID': self._websocket_client_id,
+                'X-Project-ID': self._project_id,
+                REQUEST_ID_HEADER: request_id,
+            })
+            if attempt and 'X-Auth-Token' in headers:
+                headers['X-Auth-Token'] = self._token
+
+            action = ACTIONS.get(request.operation, request.operation)
+            msg = {'action': action, 'headers': headers}
+
+            frame = self._frame(msg, self._body(request))
+
+            timeout = None
+            if request.deadline is not None:
+                request.deadline.check()
+                timeout = request.deadline.remaining()
+
+            try:
+                future = conn.register(request_id)
+                try:
+                    conn.send(frame, binary=self._frame_codec.binary)
+                    ret = future.result(timeout=timeout)
+                finally:
+                    conn.unregister(request_id)
+                break
+            except futures.TimeoutError:
+                raise errors.DeadlineExceeded(
+                    'The deadline was exceeded waiting for %s.' %
+                    request.operation)
+            except CONNECTION_ERRORS as ex:
+                attempt += 1
+                if (not resend or conn.closed or
+                        attempt > self._reconnect_attempts):
+                    raise
+                LOG.debug('Connection lost, sending %s again.',
+                          request.operation)
+                conn.fail(ex)
+                conn = self._get_connection(request.endpoint)
+
+        # NOTE: The body is already deserialized, it's
+        # only serialized again if the response content is used.
+        resp = response.Response(request, None,
                                  headers=ret['headers'],
-                                 status_code=int(ret['headers']['status']))
+                                 status_code=int(ret['headers']['status']),
+                                 deserialized=ret.get('body', ''),
+                                 codec=self.codec)
 
         if resp.status_code in self.http_to_zaqar:
             kwargs = {}
@@ -121,18 +482,229 @@ class WebsocketTransport(base.Transport):
 
         return resp
 
-    def recv(self):
-        return json.loads(self._ws.recv())
+    def _fields(self, request):
+        """Maps the request params to fields of the action body"""
+        fields = {}
+        for name, value in request.params.items():
+            if value is None:
+                continue
+            # NOTE: Ids may be given as any iterable, JSON
+            # only knows of arrays.
+            if isinstance(value, (set, frozenset, tuple)):
+                value = list(value)
+            fields[PARAMS.get(name, name)] = value
+        return fields
 
-    def cleanup(self):
-        if self._ws:
-            self._ws.close()
-            self._ws = None
+    def _body(self, request):
+        """Serializes the action body of `request`
 
-    def __enter__(self):
-        """Return self to allow usage as a context manager"""
-        return self
+        The fields mapped from the params are merged with the
+        content, which is spliced in without being deserialized.
+        """
+        content = request.content
+        fields = self._fields(request)
+        if not fields:
+            return content
 
-    def __exit__(self, *exc):
-        """Call cleanup when exiting the context manager"""
-        self.cleanup()
+        prefix = self.codec.dumps(fields)[:-1]
+        if not content:
+            return prefix + '}'
+
+        field = CONTENT_FIELDS.get(request.operation)
+        stripped = content.lstrip()
+        # NOTE: The v1 API posts the messages
+        # as a bare array.
+        if field is None and stripped[:1] in ('[', b'['):
+            field = 'messages'
+        if field is not None:
+            return codec.join([prefix, ', "%s": ' % field, content, '}'])
+
+        members = stripped[1:]
+        if members.lstrip()[:1] in ('}', b'}'):
+            return prefix + '}'
+        return codec.join([prefix, ', ', members])
+
+    def _frame(self, msg, content=None):
+        """Serializes `msg` with `content`, already serialized, as body
+
+        The content is spliced into the frame rather than
+        deserialized and serialized again, unless frames are
+        binary.
+        """
+        if self._frame_codec.binary:
+            if content:
+                msg['body'] = self.codec.loads(content)
+            return self._frame_codec.dumps(msg)
+
+        frame = self.codec.dumps(msg)
+        if not content:
+            return frame
+        if isinstance(content, six.binary_type):
+            return frame[:-1].encode('utf-8') + b', "body": ' + content + b'}'
+        return '%s, "body": %s}' % (frame[:-1], content)
+
+    @staticmethod
+    def _request_id(frame):
+        try:
+            req = frame['request']
+            if req['action'] == AUTHENTICATE:
+                return AUTHENTICATE
+            return req['headers'][REQUEST_ID_HEADER]
+        except (KeyError, TypeError):
+            return None
+
+    def _read(self, conn):
+        while True:
+            try:
+                data = conn.ws.recv()
+            except Exception as ex:
+                LOG.debug('Websocket connection closed: %s', ex)
+                conn.fail(ex)
+                if not conn.closed and self._all_listeners():
+                    self._restore()
+                return
+
+            try:
+                frame = self._decode(data)
+            except ValueError:
+                LOG.warning('Ignoring a malformed websocket frame.')
+                continue
+
+            request_id = self._request_id(frame)
+            if request_id is None:
+                self._dispatch(frame)
+            elif not conn.resolve(request_id, frame):
+                # NOTE: The request gave up waiting, e.g.
+                # its deadline was exceeded.
+                LOG.debug('Ignoring the late reply to %s.', request_id)
+
+    def _decode(self, data):
+        # NOTE: The server replies to binary frames
+        # with binary frames, the others are JSON text.
+        if self._frame_codec.binary and isinstance(data, six.binary_type):
+            try:
+                return self._frame_codec.loads(data)
+            except ValueError:
+                pass
+        return self.codec.loads(data)
+
+    @staticmethod
+    def _queue_name(frame):
+        if not isinstance(frame, dict):
+            return None
+        body = frame.get('body')
+        if isinstance(body, dict) and 'queue_name' in body:
+            return body['queue_name']
+        return frame.get('queue_name')
+
+    def _dispatch(self, frame):
+        with self._listeners_lock:
+            listeners = list(self._listeners.get(self._queue_name(frame), []))
+
+        if not listeners:
+            self._inbox.put(frame)
+        for listener in listeners:
+            listener.push(frame)
+
+    def _all_listeners(self):
+        with self._listeners_lock:
+            return [listener for listeners in self._listeners.values()
+                    for listener in listeners]
+
+    def _restore(self):
+        """Reconnects, which subscribes the listeners again"""
+        try:
+            self._get_connection(self._endpoint)
+        except Exception as ex:
+            LOG.warning('Could not reconnect to %s: %s', self._endpoint, ex)
+            for listener in self._all_listeners():
+                listener.push(ex)
+
+    def subscribe(self, request, queue_name, ttl=3600):
+        """Subscribes this connection to `queue_name`
+
+        :param request: Request instance ready to be sent.
+        :type request: `zaqarclient.transport.request.Request`
+        :param queue_name: The queue to listen to.
+        :type queue_name: `six.text_type`
+        :param ttl: Seconds the subscription lasts.
+        :type ttl: int
+
+        :returns: The notifications pushed for the queue.
+        :rtype: `Listener`
+        """
+        request.operation = 'subscription_create'
+        request.params['queue_name'] = queue_name
+        request.content = self.codec.dumps({'ttl': ttl})
+
+        conn = self._get_connection(request.endpoint)
+        listener = Listener(self, request, queue_name)
+        with self._listeners_lock:
+            self._listeners.setdefault(queue_name, []).append(listener)
+
+        try:
+            self._subscribe(conn, listener)
+        except Exception:
+            self._remove(listener)
+            raise
+
+        # NOTE: Subscribing again, after reconnecting,
+        # isn't bound by the caller's deadline.
+        request.deadline = None
+        return listener
+
+    def _subscribe(self, conn, listener):
+        resp = self._call(conn, listener._request)
+        body = resp.deserialized_content
+        if isinstance(body, dict):
+            listener.subscription_id = body.get('subscription_id')
+
+    def _remove(self, listener):
+        with self._listeners_lock:
+            listeners = self._listeners.get(listener.queue_name, [])
+            if listener in listeners:
+                listeners.remove(listener)
+            if not listeners:
+                self._listeners.pop(listener.queue_name, None)
+
+    def _unsubscribe(self, listener):
+        self._remove(listener)
+
+        conn = self._conn
+        if listener.subscription_id is None or conn is None:
+            return
+
+        req = copy.copy(listener._request)
+        req.operation = 'subscription_delete'
+        req.params = {'queue_name': listener.queue_name,
+                      'subscription_id': listener.subscription_id}
+        req.content = None
+        try:
+            self._call(conn, req)
+        except Exception:
+            LOG.debug('Could not delete the subscription %s.',
+                      listener.subscription_id, exc_info=True)
+
+    def recv(self, timeout=None):
+        """Returns the next frame that doesn't reply to a request
+
+        :param timeout: Seconds to wait for a frame. Default: forever
+        :type timeout: float
+
+        :raises: `six.moves.queue.Empty` after `timeout` seconds.
+        """
+        return self._inbox.get(timeout=timeout)
+
+    def cleanup(self):
+        with self._listeners_lock:
+            listeners = [listener for listeners in self._listeners.values()
+                         for listener in listeners]
+            self._listeners = {}
+        for listener in listeners:
+            listener.closed = True
+            listener.push(_CLOSED)
+
+        with self._lock:
+            conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()